@@ -2,7 +2,7 @@ from flask import Flask, redirect, url_for
 from flask_login import LoginManager
 from flask_socketio import SocketIO
 from config import Config
-from database import db
+from database import db, configure_sqlite, upgrade_sqlite_schema
 
 # Import models so SQLAlchemy can create tables
 from models import (
@@ -14,12 +14,20 @@ from models import (
     ActivityLog,
     DamageReport,
     BoardRating,
+    Cart,
+    IdempotencyKey,
+    Job,
 )
 from routes.auth_routes import auth_routes
 from routes.user_routes import user_routes
 from routes.admin_routes import admin_routes
 from routes.api_routes import api_routes
 from routes.cart_routes import cart_routes
+from services.occupancy_index import occupancy_index
+from services.location_registry import location_registry
+from services.background_executor import background_executor
+from services.job_queue import job_worker
+from commands import jobs_cli
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -51,9 +59,10 @@ def create_app():
     import os
 
     basedir = os.path.abspath(os.path.dirname(__file__))
-    app.config["SQLALCHEMY_DATABASE_URI"] = (
-        f"sqlite:///{os.path.join(basedir, 'surfboard_checkout.db')}"
-    )
+    if not app.config.get("SQLALCHEMY_DATABASE_URI"):
+        app.config["SQLALCHEMY_DATABASE_URI"] = (
+            f"sqlite:///{os.path.join(basedir, 'surfboard_checkout.db')}"
+        )
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 
     # Initialize extensions
@@ -66,11 +75,24 @@ def create_app():
     )
     # Store socketio in app extensions for access from routes
     app.extensions["socketio"] = socketio
+    # Worker threads for post-commit side effects (emails, socket events)
+    background_executor.init_app(app)
+    # Persistent jobs (run in-process and/or by `flask jobs worker`)
+    job_worker.init_app(app)
+    app.cli.add_command(jobs_cli)
 
     # Create all tables (must be after db.init_app and model imports)
     with app.app_context():
+        # Pragmas for every SQLite connection (WAL, busy timeout, foreign keys)
+        configure_sqlite(db.engine, app.config)
         db.create_all()
+        # Existing SQLite files get new columns/indexes (create_all skips existing tables)
+        if 'boards.rating_count' in upgrade_sqlite_schema(db.engine, db.metadata):
+            BoardRating.backfill_board_totals()
         logger.info("✓ Database initialized (SQLite)")
+        # Load booked hours so availability checks skip the database
+        occupancy_index.rebuild()
+        location_registry.load()
 
     # Register blueprints
     app.register_blueprint(auth_routes)
@@ -156,4 +178,6 @@ def handle_subscribe_location(data):
 
 if __name__ == "__main__":
     app = create_app()
+    # Pick up jobs left queued by a previous run
+    job_worker.wake()
     socketio.run(app, debug=True, host="0.0.0.0", port=5000, allow_unsafe_werkzeug=True)
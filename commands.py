@@ -0,0 +1,27 @@
+"""CLI commands - `flask jobs ...` for running background job workers"""
+import click
+from flask.cli import AppGroup
+from utils.constants import JOB_POLL_SECONDS
+
+jobs_cli = AppGroup('jobs', help='Background job commands')
+
+
+@jobs_cli.command('worker')
+@click.option('--concurrency', '-c', default=None, type=int, help='Worker threads (default: JOB_WORKERS)')
+@click.option('--poll', default=JOB_POLL_SECONDS, type=float, show_default=True,
+              help='Seconds between checks for due jobs when idle')
+@click.option('--once', is_flag=True, help='Run the jobs that are due now, then exit')
+def worker(concurrency, poll, once):
+    """Run background jobs from the jobs table until interrupted"""
+    from services.job_queue import job_worker
+    if once:
+        click.echo(f"Ran {job_worker.run_pending()} jobs")
+        return
+
+    job_worker.start(concurrency=concurrency, poll_seconds=poll)
+    click.echo(f"Job worker running with {job_worker.concurrency} threads (Ctrl+C to stop)")
+    try:
+        job_worker.join()
+    except KeyboardInterrupt:
+        click.echo("Stopping job worker...")
+        job_worker.stop()
@@ -7,6 +7,20 @@ class Config:
     """Application configuration"""
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
     
+    # SQLAlchemy database URI (create_app defaults to the local SQLite file)
+    SQLALCHEMY_DATABASE_URI = os.environ.get('SQLALCHEMY_DATABASE_URI')
+    
+    # SQLite engine profile, applied to every new connection (ignored for other
+    # databases). SQLITE_TUNING=false keeps SQLite's defaults.
+    SQLITE_TUNING = os.environ.get('SQLITE_TUNING', 'True').lower() in ['true', 'on', '1']
+    SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE') or 'WAL'
+    SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS') or 'NORMAL'
+    SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS') or 5000)
+    SQLITE_CACHE_SIZE_KB = int(os.environ.get('SQLITE_CACHE_SIZE_KB') or 64 * 1024)
+    SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE') or 256 * 1024 * 1024)
+    SQLITE_TEMP_STORE = os.environ.get('SQLITE_TEMP_STORE') or 'MEMORY'
+    SQLITE_FOREIGN_KEYS = os.environ.get('SQLITE_FOREIGN_KEYS', 'True').lower() in ['true', 'on', '1']
+    
     # Database connection - support both DATABASE_URL and individual parameters
     DATABASE_URL = os.environ.get('DATABASE_URL')
     
@@ -26,6 +40,18 @@ class Config:
     MAIL_PASSWORD = os.environ.get('MAIL_PASSWORD')
     MAIL_DEFAULT_SENDER = os.environ.get('MAIL_DEFAULT_SENDER') or MAIL_USERNAME
     
+    # Server-side cart store: 'database' (carts table) or 'memory' (single process only)
+    CART_STORE = os.environ.get('CART_STORE', 'database')
+    
+    # Background executor for post-commit side effects (emails, socket events)
+    BACKGROUND_WORKERS = int(os.environ.get('BACKGROUND_WORKERS') or 2)
+    BACKGROUND_QUEUE_SIZE = int(os.environ.get('BACKGROUND_QUEUE_SIZE') or 1000)
+    
+    # Background jobs: run due jobs in the web process too (turn off when
+    # dedicated `flask jobs worker` processes are running)
+    JOBS_RUN_IN_PROCESS = os.environ.get('JOBS_RUN_IN_PROCESS', 'True').lower() in ['true', 'on', '1']
+    JOB_WORKERS = int(os.environ.get('JOB_WORKERS') or 1)
+    
     # Application settings
     SOCKETIO_CORS_ALLOWED_ORIGINS = os.environ.get('SOCKETIO_CORS_ALLOWED_ORIGINS', '*').split(',')
     
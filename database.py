@@ -2,7 +2,199 @@
 Database setup following Flask-SQLAlchemy official documentation
 https://flask-sqlalchemy.readthedocs.io/en/stable/quickstart/
 """
+from contextlib import contextmanager
+from functools import wraps
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.orm.exc import StaleDataError
+from utils.constants import (
+    CONFLICT_RETRY_ATTEMPTS, ERROR_CONCURRENT_UPDATE, ERROR_INVALID_SQLITE_SETTING,
+    ERROR_SQLITE_UPGRADE_NEEDS_DEFAULT,
+    SQLITE_JOURNAL_MODES, SQLITE_SYNCHRONOUS_MODES, SQLITE_TEMP_STORES
+)
+import logging
+
+logger = logging.getLogger(__name__)
 
 # Create the db object
 db = SQLAlchemy()
+
+# Keys in db.session.info used to track the current unit of work
+UOW_DEPTH_KEY = 'unit_of_work_depth'
+UOW_CALLBACKS_KEY = 'unit_of_work_callbacks'
+
+
+def in_unit_of_work():
+    """Check if the current session is inside a unit of work"""
+    return db.session.info.get(UOW_DEPTH_KEY, 0) > 0
+
+
+def commit_changes():
+    """
+    Commit the session, or only flush it when inside a unit of work
+    (the unit of work commits everything once at the end).
+    Model helpers call this instead of db.session.commit().
+    """
+    if in_unit_of_work():
+        db.session.flush()
+    else:
+        db.session.commit()
+
+
+def after_commit(callback):
+    """
+    Run a callback once the current unit of work has committed
+    (right away if there is no unit of work). Callbacks are dropped
+    if the unit of work rolls back.
+    """
+    if in_unit_of_work():
+        db.session.info.setdefault(UOW_CALLBACKS_KEY, []).append(callback)
+    else:
+        callback()
+
+
+@contextmanager
+def unit_of_work():
+    """
+    Run a business operation as one transaction.
+    Model helpers inside the block stage their changes; the outermost block
+    commits once on success and rolls back if an exception escapes.
+    Nested blocks join the outer transaction.
+    """
+    info = db.session.info
+    depth = info.get(UOW_DEPTH_KEY, 0)
+    info[UOW_DEPTH_KEY] = depth + 1
+    try:
+        yield db.session
+        if depth == 0:
+            # Leave the unit of work before committing so callbacks see a normal session
+            info[UOW_DEPTH_KEY] = 0
+            db.session.commit()
+            callbacks = info.pop(UOW_CALLBACKS_KEY, [])
+            for callback in callbacks:
+                try:
+                    callback()
+                except Exception as e:
+                    logger.error(f"Error running after-commit callback: {e}")
+    except Exception:
+        if depth == 0:
+            info.pop(UOW_CALLBACKS_KEY, None)
+            db.session.rollback()
+        raise
+    finally:
+        info[UOW_DEPTH_KEY] = depth
+
+
+def retry_on_conflict(f):
+    """
+    Decorator to retry an operation that runs its own unit of work when a
+    version conflict (StaleDataError) shows another request changed the same
+    row first. The failed unit of work has rolled back, so the next attempt
+    reloads fresh rows and re-runs its checks against them.
+    Inside an outer unit of work the conflict is left for the outer caller.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if in_unit_of_work():
+            return f(*args, **kwargs)
+        for attempt in range(1, CONFLICT_RETRY_ATTEMPTS + 1):
+            try:
+                return f(*args, **kwargs)
+            except StaleDataError as e:
+                logger.info(f"Version conflict in {f.__name__} (attempt {attempt}): {e}")
+        raise Exception(ERROR_CONCURRENT_UPDATE)
+    return decorated_function
+
+
+def _sqlite_choice(config, key, allowed):
+    """Read a SQLite mode setting, checked against the allowed values"""
+    value = str(config[key]).upper()
+    if value not in allowed:
+        raise Exception(f"{ERROR_INVALID_SQLITE_SETTING}: {key}={config[key]}")
+    return value
+
+
+def sqlite_pragmas(config):
+    """
+    Build the PRAGMA statements for the SQLite profile in the app config
+    Returns: List of SQL statements (empty when SQLITE_TUNING is off)
+    """
+    if not config.get('SQLITE_TUNING', True):
+        return []
+    return [
+        # WAL lets readers keep reading while one connection writes
+        f"PRAGMA journal_mode={_sqlite_choice(config, 'SQLITE_JOURNAL_MODE', SQLITE_JOURNAL_MODES)}",
+        # NORMAL is durable against app crashes in WAL mode; only a power loss can drop the last commits
+        f"PRAGMA synchronous={_sqlite_choice(config, 'SQLITE_SYNCHRONOUS', SQLITE_SYNCHRONOUS_MODES)}",
+        # Wait for a lock instead of failing with "database is locked"
+        f"PRAGMA busy_timeout={int(config['SQLITE_BUSY_TIMEOUT_MS'])}",
+        # Negative cache_size is in KiB rather than pages
+        f"PRAGMA cache_size={-int(config['SQLITE_CACHE_SIZE_KB'])}",
+        f"PRAGMA mmap_size={int(config['SQLITE_MMAP_SIZE'])}",
+        f"PRAGMA temp_store={_sqlite_choice(config, 'SQLITE_TEMP_STORE', SQLITE_TEMP_STORES)}",
+        f"PRAGMA foreign_keys={'ON' if config.get('SQLITE_FOREIGN_KEYS', True) else 'OFF'}",
+    ]
+
+
+def configure_sqlite(engine, config):
+    """
+    Apply the SQLite profile to every new connection of an engine (via the
+    connect event). Does nothing for other databases.
+    Call before the engine opens its first connection.
+    """
+    if engine.dialect.name != 'sqlite':
+        return
+    pragmas = sqlite_pragmas(config)
+    if not pragmas:
+        return
+
+    @event.listens_for(engine, 'connect')
+    def apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+    logger.info(f"SQLite profile: {'; '.join(pragma.replace('PRAGMA ', '') for pragma in pragmas)}")
+
+
+def upgrade_sqlite_schema(engine, metadata):
+    """
+    Add the columns and indexes the models have but an existing SQLite
+    database lacks - db.create_all only creates missing tables (Postgres
+    databases use migrations/ instead). Does nothing for other databases.
+    Returns: List of 'table.column' names added
+    """
+    if engine.dialect.name != 'sqlite':
+        return []
+    from sqlalchemy import inspect
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    added = []
+    with engine.begin() as connection:
+        for table in metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            columns = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in columns:
+                    continue
+                ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(engine.dialect)}"
+                if column.server_default is not None:
+                    ddl += f" DEFAULT '{column.server_default.arg}'"
+                elif not column.nullable:
+                    # SQLite can't add a NOT NULL column without a default
+                    raise Exception(f"{ERROR_SQLITE_UPGRADE_NEEDS_DEFAULT}: {table.name}.{column.name}")
+                if not column.nullable:
+                    ddl += " NOT NULL"
+                connection.exec_driver_sql(ddl)
+                added.append(f"{table.name}.{column.name}")
+            indexes = {index['name'] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in indexes:
+                    index.create(connection)
+    if added:
+        logger.info(f"Added columns to the SQLite database: {', '.join(added)}")
+    return added
@@ -0,0 +1,12 @@
+-- nCino Surfboard Checkout System - Board rating running totals
+-- Adds denormalized rating totals to boards so listings don't need a
+-- per-board aggregate query. New ratings update them in the same
+-- transaction that inserts the board_ratings row.
+
+ALTER TABLE boards ADD COLUMN IF NOT EXISTS rating_sum INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE boards ADD COLUMN IF NOT EXISTS rating_count INTEGER NOT NULL DEFAULT 0;
+
+-- Backfill from existing ratings
+UPDATE boards SET
+    rating_sum = COALESCE((SELECT SUM(br.rating) FROM board_ratings br WHERE br.board_id = boards.id), 0),
+    rating_count = (SELECT COUNT(*) FROM board_ratings br WHERE br.board_id = boards.id);
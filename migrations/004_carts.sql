@@ -0,0 +1,14 @@
+-- nCino Surfboard Checkout System - Server-side carts
+-- Carts used to live in the signed session cookie. They are now stored
+-- here, keyed by a random token; the cookie only carries the token.
+
+CREATE TABLE IF NOT EXISTS carts (
+    token VARCHAR(64) PRIMARY KEY,
+    user_id UUID REFERENCES users(id) ON DELETE CASCADE,
+    items JSONB NOT NULL DEFAULT '[]'::jsonb,
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_carts_expires_at ON carts(expires_at);
@@ -0,0 +1,9 @@
+-- nCino Surfboard Checkout System - Optimistic concurrency versions
+-- Boards, checkouts and reservations get a version number that every
+-- UPDATE bumps and checks (UPDATE ... WHERE id = ? AND version = ?), so
+-- concurrent writers detect each other instead of the last one silently
+-- winning.
+
+ALTER TABLE boards ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;
+ALTER TABLE checkouts ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;
+ALTER TABLE reservations ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 1;
@@ -0,0 +1,17 @@
+-- nCino Surfboard Checkout System - Idempotency keys
+-- Responses to write API requests sent with an Idempotency-Key header, so a
+-- retried request replays the stored response instead of repeating the work.
+
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    key VARCHAR(255) NOT NULL,
+    request_path VARCHAR(500) NOT NULL,
+    status_code INTEGER,
+    response_body TEXT,
+    mimetype VARCHAR(100),
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, key)
+);
+
+CREATE INDEX IF NOT EXISTS idx_idempotency_keys_expires_at ON idempotency_keys(expires_at);
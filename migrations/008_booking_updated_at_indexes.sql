@@ -0,0 +1,7 @@
+-- nCino Surfboard Checkout System - Booking change indexes
+-- The in-memory occupancy index checks max(updated_at) on checkouts and
+-- reservations before answering, and reloads rows changed since its last
+-- check, so other processes' bookings are never missed.
+
+CREATE INDEX IF NOT EXISTS idx_checkouts_updated_at ON checkouts(updated_at);
+CREATE INDEX IF NOT EXISTS idx_reservations_updated_at ON reservations(updated_at);
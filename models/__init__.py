@@ -9,5 +9,8 @@ from .reservation import Reservation
 from .activity_log import ActivityLog
 from .damage_report import DamageReport
 from .board_rating import BoardRating
+from .cart import Cart
+from .idempotency_key import IdempotencyKey
+from .job import Job
 
-__all__ = ["Location", "User", "Board", "Checkout", "Reservation", "ActivityLog", "DamageReport", "BoardRating"]
+__all__ = ["Location", "User", "Board", "Checkout", "Reservation", "ActivityLog", "DamageReport", "BoardRating", "Cart", "IdempotencyKey", "Job"]
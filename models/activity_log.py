@@ -1,7 +1,7 @@
 """Activity log model - Represents system activity using SQLAlchemy"""
 import uuid
 from datetime import datetime
-from database import db
+from database import db, commit_changes
 import json
 from utils.constants import (
     ACTION_CHECKOUT, ACTION_RETURN, ACTION_RESERVATION, ACTION_DAMAGE_REPORT,
@@ -84,7 +84,7 @@ class ActivityLog(db.Model):
     def save(self):
         """Save activity log to database"""
         db.session.add(self)
-        db.session.commit()
+        commit_changes()
         return self
     
     @classmethod
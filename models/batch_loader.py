@@ -0,0 +1,95 @@
+"""Batch loader - Request-scoped identity cache for model finders"""
+from flask import g, has_app_context
+from database import db
+
+# Keep IN (...) lists under SQLite's bound parameter limit
+BATCH_SIZE = 500
+
+
+class ModelLoader:
+    """
+    Collects IDs for one model and loads them with a single IN (...) query.
+    Loaded instances are cached for the rest of the request, so repeated
+    find_by_id calls for the same ID (e.g. the same location for every
+    row) do not go back to the database.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.cache = {}
+        self.pending = set()
+
+    def _is_usable(self, instance):
+        """Check that a cached instance is still attached to the session"""
+        return instance in db.session
+
+    def prime(self, ids):
+        """Queue IDs to be fetched together with the next load"""
+        for id in ids:
+            if id is None:
+                continue
+            instance = self.cache.get(id)
+            if instance is None or not self._is_usable(instance):
+                self.pending.add(id)
+
+    def dispatch(self):
+        """Fetch all queued IDs (one query per BATCH_SIZE IDs)"""
+        pending = list(self.pending)
+        self.pending.clear()
+        for i in range(0, len(pending), BATCH_SIZE):
+            chunk = pending[i:i + BATCH_SIZE]
+            for instance in self.model.query.filter(self.model.id.in_(chunk)).all():
+                self.cache[instance.id] = instance
+
+    def load(self, id):
+        """
+        Load one instance, fetching any other queued IDs at the same time
+        Returns: Model instance or None
+        """
+        if id is None:
+            return None
+        self.prime([id])
+        if id in self.pending:
+            # Not loaded yet, or detached since - fetch it with the rest of the queue
+            self.cache.pop(id, None)
+            self.dispatch()
+        return self.cache.get(id)
+
+    def load_many(self, ids):
+        """
+        Load several instances with one query
+        Returns: List of model instances (None for IDs that do not exist)
+        """
+        ids = list(ids)
+        self.prime(ids)
+        self.dispatch()
+        return [self.cache.get(id) for id in ids]
+
+
+def enable_batch_loading():
+    """Turn on batch loading for the current request"""
+    if not hasattr(g, 'batch_loaders'):
+        g.batch_loaders = {}
+
+
+def get_loader(model):
+    """
+    Get the request's loader for a model
+    Returns: ModelLoader, or None if batch loading is not enabled for this request
+    """
+    if not has_app_context():
+        return None
+    loaders = g.get('batch_loaders')
+    if loaders is None:
+        return None
+    loader = loaders.get(model)
+    if loader is None:
+        loader = loaders[model] = ModelLoader(model)
+    return loader
+
+
+def prime(model, ids):
+    """Queue IDs so the next find_by_id for the model fetches them all at once"""
+    loader = get_loader(model)
+    if loader:
+        loader.prime(ids)
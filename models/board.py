@@ -1,7 +1,7 @@
 """Board model - Represents a surfboard using SQLAlchemy"""
 import uuid
 from datetime import datetime
-from database import db
+from database import db, commit_changes
 from utils.constants import (
     BOARD_STATUS_AVAILABLE, BOARD_STATUS_CHECKED_OUT, BOARD_STATUS_DAMAGED,
     BOARD_STATUS_IN_REPAIR, BOARD_STATUS_REPLACED,
@@ -31,8 +31,17 @@ class Board(db.Model):
     image_url = db.Column(db.String(500), nullable=True)  # URL to surfboard image
     status = db.Column(db.String(50), default=BOARD_STATUS_AVAILABLE, nullable=False)
     condition = db.Column(db.String(50), default=BOARD_CONDITION_GOOD, nullable=True)
+    # Running rating totals, updated in the same transaction as each BoardRating insert
+    rating_sum = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    rating_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    # Bumped on every UPDATE; a stale version makes the flush raise StaleDataError
+    version = db.Column(db.Integer, default=1, server_default='1', nullable=False)
+    
+    __mapper_args__ = {'version_id_col': version}
+    
+    location = db.relationship('Location')
     
     def __init__(self, id=None, location_id=None, name=None, brand=None, 
                  size=None, image_url=None, status=None, condition=None, created_at=None, updated_at=None):
@@ -45,6 +54,8 @@ class Board(db.Model):
         self.image_url = image_url
         self.status = status or self.STATUS_AVAILABLE
         self.condition = condition or self.CONDITION_GOOD
+        self.rating_sum = 0
+        self.rating_count = 0
         if created_at:
             self.created_at = created_at
         if updated_at:
@@ -52,7 +63,11 @@ class Board(db.Model):
     
     @classmethod
     def find_by_id(cls, board_id):
-        """Find a board by ID"""
+        """Find a board by ID (batched and cached when the request enables batch loading)"""
+        from models.batch_loader import get_loader
+        loader = get_loader(cls)
+        if loader:
+            return loader.load(board_id)
         return cls.query.get(board_id)
     
     @classmethod
@@ -75,11 +90,44 @@ class Board(db.Model):
         """Find all boards"""
         return cls.query.all()
     
+    @property
+    def avg_rating(self):
+        """Average rating from the running totals (0.0 if not rated yet)"""
+        if not self.rating_count:
+            return 0.0
+        return self.rating_sum / self.rating_count
+    
     def update_status(self, new_status):
         """Update board status"""
         self.status = new_status
         self.updated_at = datetime.utcnow()
-        db.session.commit()
+        commit_changes()
+    
+    def claim_status(self, expected_status, new_status):
+        """
+        Change the board's status only if it still has expected_status in the
+        database, as one conditional UPDATE. When two requests race for the same
+        board, exactly one of them gets a matching row.
+        Returns: True if this call changed the status, False if it lost the race
+        """
+        from sqlalchemy import update
+        from sqlalchemy.orm.attributes import set_committed_value
+        updated_at = datetime.utcnow()
+        version = db.session.execute(
+            update(Board)
+            .where(Board.id == self.id, Board.status == expected_status)
+            .values(status=new_status, updated_at=updated_at, version=Board.version + 1)
+            .returning(Board.version)
+            .execution_options(synchronize_session=False)
+        ).scalar()
+        if version is None:
+            return False
+        # Match the row without queueing a second UPDATE at flush time
+        set_committed_value(self, 'status', new_status)
+        set_committed_value(self, 'updated_at', updated_at)
+        set_committed_value(self, 'version', version)
+        commit_changes()
+        return True
     
     def is_available(self):
         """Check if board is available for checkout"""
@@ -91,52 +139,14 @@ class Board(db.Model):
         Checks both active/scheduled checkouts and reservations for time overlap
         Returns: (is_available, reason)
         """
-        from models.checkout import Checkout
-        from models.reservation import Reservation
-        from datetime import timedelta
-        
-        # Convert checkout_datetime to naive UTC for comparison (strip timezone info)
-        if checkout_datetime.tzinfo is not None:
-            checkout_start = checkout_datetime.replace(tzinfo=None)
-        else:
-            checkout_start = checkout_datetime
-        
-        checkout_end = checkout_start + timedelta(hours=duration_hours)
-        
-        # Check for active checkouts that overlap (STATUS_ACTIVE includes both scheduled and in-use)
-        active_checkouts = Checkout.query.filter_by(
-            board_id=self.id,
-            status=Checkout.STATUS_ACTIVE
-        ).all()
-        
-        for checkout in active_checkouts:
-            # Get checkout time range (database times are naive UTC)
-            existing_start = checkout.checkout_time
-            existing_end = checkout.expected_return_time or (existing_start + timedelta(hours=1))
-            
-            # Check for time overlap: new checkout overlaps if it starts before existing ends AND ends after existing starts
-            if checkout_start < existing_end and checkout_end > existing_start:
-                return False, "Reserved"
-        
-        # Check for pending/available reservations that overlap (by date for now)
-        reservations = Reservation.query.filter_by(
-            board_id=self.id
-        ).filter(
-            Reservation.status.in_([Reservation.STATUS_PENDING, Reservation.STATUS_AVAILABLE])
-        ).all()
-        
-        for reservation in reservations:
-            reservation_date = reservation.unlock_time.date()
-            # Only mark as reserved if dates overlap
-            if checkout_start.date() == reservation_date:
-                return False, "Reserved"
-        
-        return True, None
+        # Single source of truth for the overlap rules (also used in bulk)
+        from services.availability_service import AvailabilityService
+        return AvailabilityService().check_board(self.id, checkout_datetime, duration_hours)
     
     def save(self):
         """Save board to database"""
         db.session.add(self)
-        db.session.commit()
+        commit_changes()
         return self
     
     def to_dict(self):
@@ -151,6 +161,8 @@ class Board(db.Model):
             'status': self.status,
             'condition': self.condition,
             'is_available': self.is_available(),
+            'avg_rating': self.avg_rating,
+            'rating_count': self.rating_count,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
@@ -1,7 +1,7 @@
 """Board rating model - Represents a board rating and review using SQLAlchemy"""
 import uuid
 from datetime import datetime
-from database import db
+from database import db, commit_changes
 
 
 class BoardRating(db.Model):
@@ -69,11 +69,59 @@ class BoardRating(db.Model):
                 'count': result.count
             }
         return {'average': 0.0, 'count': 0}
+
+    @classmethod
+    def get_average_ratings(cls, board_ids):
+        """
+        Get live average ratings for several boards with one grouped query
+        Returns: Dict of board_id -> (average, count) (every requested board included)
+        """
+        from sqlalchemy import func
+        board_ids = list(board_ids)
+        ratings = {board_id: (0.0, 0) for board_id in board_ids}
+        if not board_ids:
+            return ratings
+
+        results = db.session.query(
+            cls.board_id,
+            func.avg(cls.rating).label('avg_rating'),
+            func.count(cls.id).label('count')
+        ).filter(cls.board_id.in_(board_ids)).group_by(cls.board_id).all()
+
+        for result in results:
+            ratings[result.board_id] = (float(result.avg_rating or 0.0), result.count)
+        return ratings
+
+    @classmethod
+    def backfill_board_totals(cls):
+        """Recompute every board's rating_sum / rating_count from its ratings (one UPDATE)"""
+        from sqlalchemy import update, select, func
+        from models.board import Board
+        db.session.execute(
+            update(Board).values(
+                rating_sum=select(func.coalesce(func.sum(cls.rating), 0))
+                .where(cls.board_id == Board.id).scalar_subquery(),
+                rating_count=select(func.count(cls.id))
+                .where(cls.board_id == Board.id).scalar_subquery()
+            )
+        )
+        db.session.commit()
     
     def save(self):
-        """Save rating to database"""
+        """Save rating to database, updating the board's running totals in the same transaction"""
+        from sqlalchemy import inspect, update
+        from models.board import Board
+        is_new = not inspect(self).persistent
         db.session.add(self)
-        db.session.commit()
+        if is_new:
+            # Increment in SQL so concurrent ratings for the same board don't lose updates
+            db.session.execute(
+                update(Board)
+                .where(Board.id == self.board_id)
+                .values(rating_sum=Board.rating_sum + self.rating,
+                        rating_count=Board.rating_count + 1)
+            )
+        commit_changes()
         return self
     
     def to_dict(self):
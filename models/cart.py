@@ -0,0 +1,38 @@
+"""Cart model - Represents a server-side shopping cart using SQLAlchemy"""
+from datetime import datetime
+from database import db
+
+
+class Cart(db.Model):
+    """Represents a shopping cart, looked up by the token in the user's session cookie"""
+    __tablename__ = 'carts'
+    
+    token = db.Column(db.String(64), primary_key=True)
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id', ondelete='CASCADE'), nullable=True)
+    items = db.Column(db.JSON, nullable=False, default=list)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    
+    def __init__(self, token=None, user_id=None, items=None, expires_at=None,
+                 created_at=None, updated_at=None):
+        self.token = token
+        self.user_id = user_id
+        self.items = items or []
+        self.expires_at = expires_at
+        if created_at:
+            self.created_at = created_at
+        if updated_at:
+            self.updated_at = updated_at
+    
+    @classmethod
+    def find_by_token(cls, token):
+        """Find a cart by token"""
+        return cls.query.get(token)
+    
+    def is_expired(self, now=None):
+        """Check if the cart has expired"""
+        return self.expires_at <= (now or datetime.utcnow())
+    
+    def __repr__(self):
+        return f'<Cart {self.token}>'
@@ -1,7 +1,7 @@
 """Checkout model - Represents a board checkout transaction using SQLAlchemy"""
 import uuid
 from datetime import datetime
-from database import db
+from database import db, commit_changes
 from utils.constants import (
     CHECKOUT_STATUS_ACTIVE, CHECKOUT_STATUS_RETURNED, CHECKOUT_STATUS_CANCELLED
 )
@@ -24,6 +24,18 @@ class Checkout(db.Model):
     status = db.Column(db.String(50), default=CHECKOUT_STATUS_ACTIVE, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    # Bumped on every UPDATE; a stale version makes the flush raise StaleDataError
+    version = db.Column(db.Integer, default=1, server_default='1', nullable=False)
+    
+    __mapper_args__ = {'version_id_col': version}
+    # status finds held bookings; updated_at lets the occupancy index catch up on changes
+    __table_args__ = (
+        db.Index('idx_checkouts_status', 'status'),
+        db.Index('idx_checkouts_updated_at', 'updated_at'),
+    )
+    
+    user = db.relationship('User')
+    board = db.relationship('Board')
     
     def __init__(self, id=None, user_id=None, board_id=None, checkout_time=None,
                  expected_return_time=None, actual_return_time=None, status=None,
@@ -43,13 +55,29 @@ class Checkout(db.Model):
     
     @classmethod
     def find_by_id(cls, checkout_id):
-        """Find a checkout by ID"""
+        """Find a checkout by ID (batched and cached when the request enables batch loading)"""
+        from models.batch_loader import get_loader
+        loader = get_loader(cls)
+        if loader:
+            return loader.load(checkout_id)
         return cls.query.get(checkout_id)
     
+    @property
+    def location(self):
+        """Location of the checked out board"""
+        return self.board.location if self.board else None
+    
     @classmethod
     def find_active_by_user(cls, user_id):
-        """Find active checkouts for a user"""
-        return cls.query.filter_by(user_id=user_id, status=cls.STATUS_ACTIVE).order_by(cls.checkout_time.desc()).all()
+        """Find active checkouts for a user (with board and location loaded)"""
+        from sqlalchemy.orm import joinedload
+        from models.board import Board
+        return (
+            cls.query.filter_by(user_id=user_id, status=cls.STATUS_ACTIVE)
+            .options(joinedload(cls.board).joinedload(Board.location))
+            .order_by(cls.checkout_time.desc())
+            .all()
+        )
     
     @classmethod
     def find_by_user(cls, user_id, limit=None):
@@ -66,9 +94,15 @@ class Checkout(db.Model):
     
     @classmethod
     def find_by_location(cls, location_id, limit=None):
-        """Find all checkouts at a location"""
+        """Find all checkouts at a location (with board and user loaded)"""
+        from sqlalchemy.orm import contains_eager, joinedload
         from models.board import Board
-        query = cls.query.join(Board).filter(Board.location_id == location_id).order_by(cls.checkout_time.desc())
+        query = (
+            cls.query.join(cls.board)
+            .filter(Board.location_id == location_id)
+            .options(contains_eager(cls.board), joinedload(cls.user))
+            .order_by(cls.checkout_time.desc())
+        )
         if limit:
             query = query.limit(limit)
         return query.all()
@@ -76,7 +110,7 @@ class Checkout(db.Model):
     def save(self):
         """Save checkout to database"""
         db.session.add(self)
-        db.session.commit()
+        commit_changes()
         return self
     
     def mark_returned(self, return_time=None):
@@ -86,13 +120,13 @@ class Checkout(db.Model):
         self.status = self.STATUS_RETURNED
         self.actual_return_time = return_time
         self.updated_at = datetime.utcnow()
-        db.session.commit()
+        commit_changes()
     
     def cancel(self):
         """Cancel a checkout"""
         self.status = self.STATUS_CANCELLED
         self.updated_at = datetime.utcnow()
-        db.session.commit()
+        commit_changes()
     
     def is_active(self):
         """Check if checkout is active"""
@@ -1,7 +1,7 @@
 """Damage report model - Represents a board damage report using SQLAlchemy"""
 import uuid
 from datetime import datetime
-from database import db
+from database import db, commit_changes
 from utils.constants import (
     DAMAGE_STATUS_NEW, DAMAGE_STATUS_IN_REPAIR, DAMAGE_STATUS_REPLACED,
     DAMAGE_SEVERITY_MINOR, DAMAGE_SEVERITY_MODERATE, DAMAGE_SEVERITY_SEVERE
@@ -31,6 +31,10 @@ class DamageReport(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
+    board = db.relationship('Board')
+    checkout = db.relationship('Checkout')
+    reporter = db.relationship('User')
+    
     def __init__(self, id=None, checkout_id=None, board_id=None, reported_by=None,
                  description=None, severity=None, status=None, admin_notes=None,
                  created_at=None, updated_at=None):
@@ -65,9 +69,14 @@ class DamageReport(db.Model):
     
     @classmethod
     def find_by_location(cls, location_id, status=None):
-        """Find damage reports at a location"""
+        """Find damage reports at a location (with board loaded)"""
+        from sqlalchemy.orm import contains_eager
         from models.board import Board
-        query = cls.query.join(Board).filter(Board.location_id == location_id)
+        query = (
+            cls.query.join(cls.board)
+            .filter(Board.location_id == location_id)
+            .options(contains_eager(cls.board))
+        )
         if status:
             query = query.filter(cls.status == status)
         return query.order_by(cls.created_at.desc()).all()
@@ -75,7 +84,7 @@ class DamageReport(db.Model):
     def save(self):
         """Save damage report to database"""
         db.session.add(self)
-        db.session.commit()
+        commit_changes()
         return self
     
     def update_status(self, new_status, admin_notes=None):
@@ -84,7 +93,7 @@ class DamageReport(db.Model):
         if admin_notes:
             self.admin_notes = admin_notes
         self.updated_at = datetime.utcnow()
-        db.session.commit()
+        commit_changes()
     
     def to_dict(self):
         """Convert to dictionary for JSON serialization"""
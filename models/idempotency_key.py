@@ -0,0 +1,47 @@
+"""Idempotency key model - Stores the response to a retried write request using SQLAlchemy"""
+from datetime import datetime, timedelta
+from database import db
+from utils.constants import IDEMPOTENCY_LOCK_TIMEOUT_SECONDS
+
+
+class IdempotencyKey(db.Model):
+    """Represents an Idempotency-Key sent by a user and the response it produced"""
+    __tablename__ = 'idempotency_keys'
+    
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    key = db.Column(db.String(255), primary_key=True)
+    request_path = db.Column(db.String(500), nullable=False)
+    # Null while the first request is still running
+    status_code = db.Column(db.Integer, nullable=True)
+    response_body = db.Column(db.Text, nullable=True)
+    mimetype = db.Column(db.String(100), nullable=True)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    
+    def __init__(self, user_id=None, key=None, request_path=None, status_code=None,
+                 response_body=None, mimetype=None, expires_at=None, created_at=None):
+        self.user_id = user_id
+        self.key = key
+        self.request_path = request_path
+        self.status_code = status_code
+        self.response_body = response_body
+        self.mimetype = mimetype
+        self.expires_at = expires_at
+        if created_at:
+            self.created_at = created_at
+    
+    def is_completed(self):
+        """Check if the first request has finished and its response is stored"""
+        return self.status_code is not None
+    
+    def is_expired(self, now=None):
+        """Check if the key has expired"""
+        return self.expires_at <= (now or datetime.utcnow())
+    
+    def is_abandoned(self, now=None):
+        """Check if the first request never finished within the lock timeout (e.g. its worker died)"""
+        return (not self.is_completed() and
+                self.created_at + timedelta(seconds=IDEMPOTENCY_LOCK_TIMEOUT_SECONDS) <= (now or datetime.utcnow()))
+    
+    def __repr__(self):
+        return f'<IdempotencyKey {self.key} for {self.user_id}>'
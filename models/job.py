@@ -0,0 +1,71 @@
+"""Job model - Represents a persistent background job using SQLAlchemy"""
+import uuid
+from datetime import datetime
+from database import db
+from utils.constants import (
+    JOB_STATUS_QUEUED, JOB_STATUS_RUNNING, JOB_STATUS_SUCCEEDED, JOB_STATUS_FAILED
+)
+
+
+class Job(db.Model):
+    """Represents a background job waiting to run, running, or finished"""
+    __tablename__ = 'jobs'
+    
+    STATUS_QUEUED = JOB_STATUS_QUEUED
+    STATUS_RUNNING = JOB_STATUS_RUNNING
+    STATUS_SUCCEEDED = JOB_STATUS_SUCCEEDED
+    STATUS_FAILED = JOB_STATUS_FAILED
+    
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    name = db.Column(db.String(100), nullable=False)
+    payload = db.Column(db.JSON, nullable=False, default=dict)
+    status = db.Column(db.String(50), default=JOB_STATUS_QUEUED, nullable=False)
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    max_attempts = db.Column(db.Integer, nullable=False)
+    run_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    locked_by = db.Column(db.String(255), nullable=True)
+    locked_at = db.Column(db.DateTime, nullable=True)
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    
+    # Workers look for queued jobs that are due
+    __table_args__ = (db.Index('idx_jobs_status_run_at', 'status', 'run_at'),)
+    
+    def __init__(self, id=None, name=None, payload=None, status=None,
+                 attempts=None, max_attempts=None, run_at=None, created_at=None, updated_at=None):
+        if id:
+            self.id = id
+        self.name = name
+        self.payload = payload or {}
+        self.status = status or self.STATUS_QUEUED
+        self.attempts = attempts or 0
+        self.max_attempts = max_attempts
+        self.run_at = run_at or datetime.utcnow()
+        if created_at:
+            self.created_at = created_at
+        if updated_at:
+            self.updated_at = updated_at
+    
+    @classmethod
+    def find_by_id(cls, job_id):
+        """Find a job by ID"""
+        return cls.query.get(job_id)
+    
+    def to_dict(self):
+        """Convert to dictionary for JSON serialization"""
+        return {
+            'id': self.id,
+            'name': self.name,
+            'payload': self.payload,
+            'status': self.status,
+            'attempts': self.attempts,
+            'max_attempts': self.max_attempts,
+            'run_at': self.run_at.isoformat() if self.run_at else None,
+            'last_error': self.last_error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+    
+    def __repr__(self):
+        return f'<Job {self.name} {self.id} - {self.status}>'
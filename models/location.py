@@ -1,7 +1,7 @@
 """Location model - Represents a physical location using SQLAlchemy"""
 import uuid
 from datetime import datetime
-from database import db
+from database import db, commit_changes, after_commit
 
 
 class Location(db.Model):
@@ -22,13 +22,20 @@ class Location(db.Model):
     
     @classmethod
     def find_by_id(cls, location_id):
-        """Find a location by ID"""
+        """Find a location by ID (batched and cached when the request enables batch loading)"""
+        from models.batch_loader import get_loader
+        loader = get_loader(cls)
+        if loader:
+            return loader.load(location_id)
         return cls.query.get(location_id)
     
     def save(self):
         """Save location to database"""
         db.session.add(self)
-        db.session.commit()
+        commit_changes()
+        # Make the location registry pick up the change once it is committed
+        from services.location_registry import location_registry
+        after_commit(location_registry.invalidate)
         return self
     
     def __repr__(self):
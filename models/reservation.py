@@ -1,7 +1,7 @@
 """Reservation model - Represents a board reservation using SQLAlchemy"""
 import uuid
 from datetime import datetime
-from database import db
+from database import db, commit_changes
 from utils.constants import (
     RESERVATION_STATUS_PENDING, RESERVATION_STATUS_AVAILABLE,
     RESERVATION_STATUS_FULFILLED, RESERVATION_STATUS_CANCELLED
@@ -27,6 +27,19 @@ class Reservation(db.Model):
     notification_sent = db.Column(db.Boolean, default=False, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    # Bumped on every UPDATE; a stale version makes the flush raise StaleDataError
+    version = db.Column(db.Integer, default=1, server_default='1', nullable=False)
+    
+    __mapper_args__ = {'version_id_col': version}
+    # status finds held bookings; updated_at lets the occupancy index catch up on changes
+    __table_args__ = (
+        db.Index('idx_reservations_status', 'status'),
+        db.Index('idx_reservations_updated_at', 'updated_at'),
+    )
+
+    user = db.relationship('User')
+    board = db.relationship('Board')
+    checkout = db.relationship('Checkout')
 
     def __init__(self, id=None, user_id=None, board_id=None, checkout_id=None,
                  reservation_time=None, unlock_time=None, status=None,
@@ -50,10 +63,22 @@ class Reservation(db.Model):
         """Find a reservation by ID"""
         return cls.query.get(reservation_id)
 
+    @property
+    def location(self):
+        """Location of the reserved board"""
+        return self.board.location if self.board else None
+
     @classmethod
     def find_by_user(cls, user_id):
-        """Find all reservations for a user"""
-        return cls.query.filter_by(user_id=user_id).order_by(cls.unlock_time.asc()).all()
+        """Find all reservations for a user (with board and location loaded)"""
+        from sqlalchemy.orm import joinedload
+        from models.board import Board
+        return (
+            cls.query.filter_by(user_id=user_id)
+            .options(joinedload(cls.board).joinedload(Board.location))
+            .order_by(cls.unlock_time.asc())
+            .all()
+        )
 
     @classmethod
     def find_pending_by_board(cls, board_id):
@@ -78,31 +103,31 @@ class Reservation(db.Model):
     def save(self):
         """Save reservation to database"""
         db.session.add(self)
-        db.session.commit()
+        commit_changes()
         return self
 
     def mark_available(self):
         """Mark reservation as available (unlock time has passed)"""
         self.status = self.STATUS_AVAILABLE
         self.updated_at = datetime.utcnow()
-        db.session.commit()
+        commit_changes()
 
     def mark_fulfilled(self):
         """Mark reservation as fulfilled"""
         self.status = self.STATUS_FULFILLED
         self.updated_at = datetime.utcnow()
-        db.session.commit()
+        commit_changes()
 
     def mark_notification_sent(self):
         """Mark notification as sent"""
         self.notification_sent = True
-        db.session.commit()
+        commit_changes()
 
     def cancel(self):
         """Cancel a reservation"""
         self.status = self.STATUS_CANCELLED
         self.updated_at = datetime.utcnow()
-        db.session.commit()
+        commit_changes()
 
     def is_pending(self):
         """Check if reservation is pending"""
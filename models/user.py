@@ -1,7 +1,7 @@
 """User model - Represents a system user using SQLAlchemy"""
 import uuid
 from datetime import datetime
-from database import db
+from database import db, commit_changes
 from flask_login import UserMixin
 
 
@@ -34,7 +34,11 @@ class User(db.Model, UserMixin):
     
     @classmethod
     def find_by_id(cls, user_id):
-        """Find a user by ID"""
+        """Find a user by ID (batched and cached when the request enables batch loading)"""
+        from models.batch_loader import get_loader
+        loader = get_loader(cls)
+        if loader:
+            return loader.load(user_id)
         return cls.query.get(user_id)
     
     @classmethod
@@ -58,7 +62,7 @@ class User(db.Model, UserMixin):
     def save(self):
         """Save user to database"""
         db.session.add(self)
-        db.session.commit()
+        commit_changes()
         return self
     
     def update(self, **kwargs):
@@ -67,13 +71,13 @@ class User(db.Model, UserMixin):
             if hasattr(self, key):
                 setattr(self, key, value)
         self.updated_at = datetime.utcnow()
-        db.session.commit()
+        commit_changes()
         return self
     
     def delete(self):
         """Delete user from database"""
         db.session.delete(self)
-        db.session.commit()
+        commit_changes()
     
     def to_dict(self):
         """Convert user to dictionary (excludes password_hash for security)"""
@@ -2,13 +2,19 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
 from flask_login import login_required, current_user
 from utils.decorators import admin_required, require_location_access
+from database import unit_of_work, retry_on_conflict
 from models.board import Board
-from models.checkout import Checkout
 from models.damage_report import DamageReport
 from models.activity_log import ActivityLog
 from models.location import Location
 from services.reporting_service import ReportingService
 from services.notification_service import NotificationService
+from services.schedule_service import ScheduleService
+from services.admin_stats_service import AdminStatsService
+from services.bulk_admin_service import BulkAdminService, DAMAGE_STATUSES
+from utils.constants import (
+    SCHEDULE_VIEW_WEEK, SCHEDULE_VIEW_MONTH, SCHEDULE_MAX_DAYS, ERROR_INVALID_DAMAGE_STATUS
+)
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,6 +22,9 @@ logger = logging.getLogger(__name__)
 admin_routes = Blueprint('admin_routes', __name__, url_prefix='/admin')
 reporting_service = ReportingService()
 notification_service = NotificationService()
+schedule_service = ScheduleService()
+admin_stats_service = AdminStatsService()
+bulk_admin_service = BulkAdminService()
 
 
 @admin_routes.route('/dashboard')
@@ -24,30 +33,15 @@ notification_service = NotificationService()
 @require_location_access
 def dashboard():
     """Admin dashboard"""
-    location_id = current_user.location_id
-    
-    # Get stats
-    available_boards = Board.find_available(location_id)
-    checked_out_boards = Board.find_by_status(location_id, Board.STATUS_CHECKED_OUT)
-    damaged_boards = Board.find_by_status(location_id, Board.STATUS_DAMAGED)
-    
-    # Get recent checkouts
-    recent_checkouts = Checkout.find_by_location(location_id, limit=10)
-    # Get user info for checkouts
-    from models.user import User
-    for checkout in recent_checkouts:
-        user = User.find_by_id(checkout.user_id)
-        checkout.user = user
-    
-    # Get new damage reports
-    new_damage = DamageReport.find_by_location(location_id, DamageReport.STATUS_NEW)
+    # Status counts, recent checkouts and new damage (cached for a few seconds)
+    stats = admin_stats_service.get_dashboard_stats(current_user.location_id)
     
     return render_template('admin/dashboard.html',
-                         available_count=len(available_boards),
-                         checked_out_count=len(checked_out_boards),
-                         damaged_count=len(damaged_boards),
-                         recent_checkouts=recent_checkouts,
-                         new_damage=new_damage)
+                         available_count=stats['available_count'],
+                         checked_out_count=stats['checked_out_count'],
+                         damaged_count=stats['damaged_count'],
+                         recent_checkouts=stats['recent_checkouts'],
+                         new_damage=stats['new_damage'])
 
 
 @admin_routes.route('/inventory')
@@ -60,31 +54,83 @@ def inventory():
     return render_template('admin/inventory.html', boards=boards_list)
 
 
+def get_schedule_start_date(location_id):
+    """Get the schedule start date from ?start=YYYY-MM-DD, defaulting to today at the location"""
+    from datetime import datetime
+    start = request.args.get('start')
+    if start:
+        try:
+            return datetime.strptime(start, '%Y-%m-%d').date()
+        except ValueError:
+            pass
+    return schedule_service.timezone_service.now_in_location(location_id).date()
+
+
 @admin_routes.route('/checkout-schedule')
 @login_required
 @admin_required
 @require_location_access
 def checkout_schedule():
-    """Checkout schedule/calendar view"""
-    from datetime import datetime
-    # Get all checkouts at location
-    checkouts = Checkout.find_by_location(current_user.location_id)
-    # Get board and user info for each checkout
-    from models.user import User
-    for checkout in checkouts:
-        board = Board.find_by_id(checkout.board_id)
-        user = User.find_by_id(checkout.user_id)
-        checkout.board = board
-        checkout.user = user
+    """Checkout schedule/calendar view for a week or month window"""
+    from datetime import datetime, timedelta
+    location_id = current_user.location_id
+    view = request.args.get('view', SCHEDULE_VIEW_WEEK)
+    if view not in (SCHEDULE_VIEW_WEEK, SCHEDULE_VIEW_MONTH):
+        view = SCHEDULE_VIEW_WEEK
+    board_id = request.args.get('board_id') or None
+    
+    # Only checkouts overlapping the window, with board and user names joined
+    first_date, day_count = schedule_service.get_window(get_schedule_start_date(location_id), view)
+    checkouts = schedule_service.get_checkouts(location_id, first_date, day_count, board_id)
     
     # Get all boards for filter
-    boards = Board.find_by_location(current_user.location_id)
+    boards = Board.find_by_location(location_id)
+    
+    if view == SCHEDULE_VIEW_MONTH:
+        previous_start = (first_date - timedelta(days=1)).replace(day=1)
+    else:
+        previous_start = first_date - timedelta(days=day_count)
     
     return render_template('admin/checkout_schedule.html',
                          checkouts=checkouts,
                          boards=boards,
-                         today=datetime.now().strftime('%Y-%m-%d'),
-                         now=datetime.now())
+                         view=view,
+                         board_id=board_id,
+                         start=first_date.isoformat(),
+                         end=(first_date + timedelta(days=day_count - 1)).isoformat(),
+                         previous_start=previous_start.isoformat(),
+                         next_start=(first_date + timedelta(days=day_count)).isoformat(),
+                         location_id=location_id,
+                         timezone_service=schedule_service.timezone_service,
+                         now=datetime.utcnow())
+
+
+@admin_routes.route('/api/checkout-schedule')
+@login_required
+@admin_required
+@require_location_access
+def checkout_schedule_buckets():
+    """
+    Per-day checkout buckets for the schedule calendar
+    Query: start=YYYY-MM-DD, days (1-SCHEDULE_MAX_DAYS, default 7), board_id (optional)
+    """
+    location_id = current_user.location_id
+    try:
+        days = int(request.args.get('days', 7))
+    except ValueError:
+        return jsonify({'success': False, 'error': 'days must be a number'}), 400
+    days = max(1, min(SCHEDULE_MAX_DAYS, days))
+    first_date = get_schedule_start_date(location_id)
+    
+    buckets = schedule_service.get_day_buckets(
+        location_id, first_date, days, request.args.get('board_id') or None
+    )
+    return jsonify({
+        'success': True,
+        'location_id': location_id,
+        'start': first_date.isoformat(),
+        'days': buckets
+    })
 
 
 @admin_routes.route('/damage-queue')
@@ -143,19 +189,34 @@ def reports():
 def update_damage_status(report_id):
     """API endpoint to update damage report status"""
     try:
-        damage = DamageReport.find_by_id(report_id)
-        if not damage:
-            return jsonify({'success': False, 'error': 'Damage report not found'}), 404
-        
         new_status = request.json.get('status')
         admin_notes = request.json.get('admin_notes')
+        if new_status not in DAMAGE_STATUSES:
+            return jsonify({'success': False, 'error': ERROR_INVALID_DAMAGE_STATUS}), 400
+        
+        # Each attempt re-reads the report and board, so a retry acts on current rows
+        @retry_on_conflict
+        def apply_status():
+            with unit_of_work():
+                damage = DamageReport.find_by_id(report_id)
+                if not damage:
+                    return None
+                damage.update_status(new_status, admin_notes)
+                
+                # If status is 'replaced', make the board available again - unless it
+                # is already available or has been checked out since it was read
+                if new_status == DamageReport.STATUS_REPLACED:
+                    board = Board.find_by_id(damage.board_id)
+                    if board and board.status not in (Board.STATUS_AVAILABLE, Board.STATUS_CHECKED_OUT):
+                        board.claim_status(board.status, Board.STATUS_AVAILABLE)
+                return damage
         
-        damage.update_status(new_status, admin_notes)
+        damage = apply_status()
+        if not damage:
+            return jsonify({'success': False, 'error': 'Damage report not found'}), 404
         
-        # If status is 'replaced', update board status
-        if new_status == DamageReport.STATUS_REPLACED:
-            board = Board.find_by_id(damage.board_id)
-            board.update_status(Board.STATUS_AVAILABLE)
+        # Show the change on this admin's next dashboard refresh
+        admin_stats_service.invalidate(current_user.location_id)
         
         return jsonify({
             'success': True,
@@ -164,3 +225,94 @@ def update_damage_status(report_id):
     except Exception as e:
         logger.error(f"Update damage status error: {e}")
         return jsonify({'success': False, 'error': str(e)}), 400
+
+
+def broadcast_bulk_update(location_id, action, boards=None, damage_reports=None):
+    """
+    Send one Socket.IO event for a whole bulk change at a location
+    boards is a dict of board_id -> new status, damage_reports a dict of
+    report_id -> new status
+    """
+    try:
+        from flask import current_app
+        socketio = current_app.extensions.get('socketio')
+        if socketio:
+            socketio.emit('bulk_admin_update', {
+                'location_id': location_id,
+                'action': action,
+                'boards': [{'board_id': board_id, 'status': status} for board_id, status in (boards or {}).items()],
+                'damage_reports': [{'id': report_id, 'status': status}
+                                   for report_id, status in (damage_reports or {}).items()]
+            }, room=f'location_{location_id}')
+    except Exception as e:
+        logger.error(f"Error emitting socket event: {e}")
+
+
+@admin_routes.route('/api/boards/bulk-status', methods=['POST'])
+@login_required
+@admin_required
+@require_location_access
+def bulk_update_board_status():
+    """API endpoint to set the status of many boards (JSON: board_ids, status)"""
+    try:
+        data = request.get_json(silent=True) or {}
+        new_status = data.get('status')
+        location_id = current_user.location_id
+        result = bulk_admin_service.set_board_status(
+            data.get('board_ids'), new_status, location_id, current_user.id, request.remote_addr
+        )
+        if result['updated']:
+            admin_stats_service.invalidate(location_id)
+            broadcast_bulk_update(location_id, 'board_status',
+                                  boards={board_id: new_status for board_id in result['updated']})
+        return jsonify({'success': True, **result}), 200
+    except Exception as e:
+        logger.error(f"Bulk board status error: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+
+@admin_routes.route('/api/boards/bulk-retire', methods=['POST'])
+@login_required
+@admin_required
+@require_location_access
+def bulk_retire_boards():
+    """API endpoint to take many boards out of service (JSON: board_ids)"""
+    try:
+        data = request.get_json(silent=True) or {}
+        location_id = current_user.location_id
+        result = bulk_admin_service.retire_boards(
+            data.get('board_ids'), location_id, current_user.id, request.remote_addr
+        )
+        if result['updated']:
+            admin_stats_service.invalidate(location_id)
+            broadcast_bulk_update(location_id, 'retire',
+                                  boards={board_id: Board.STATUS_REPLACED for board_id in result['updated']})
+        return jsonify({'success': True, **result}), 200
+    except Exception as e:
+        logger.error(f"Bulk retire error: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+
+@admin_routes.route('/api/damage/bulk-update-status', methods=['POST'])
+@login_required
+@admin_required
+@require_location_access
+def bulk_update_damage_status():
+    """API endpoint to move many damage reports to a status (JSON: report_ids, status, admin_notes)"""
+    try:
+        data = request.get_json(silent=True) or {}
+        new_status = data.get('status')
+        location_id = current_user.location_id
+        result = bulk_admin_service.transition_damage_reports(
+            data.get('report_ids'), new_status, location_id, current_user.id,
+            admin_notes=data.get('admin_notes'), ip_address=request.remote_addr
+        )
+        if result['updated']:
+            admin_stats_service.invalidate(location_id)
+            broadcast_bulk_update(location_id, 'damage_status', boards=result['boards'],
+                                  damage_reports={report_id: new_status for report_id in result['updated']})
+        result['boards'] = [{'board_id': board_id, 'status': status} for board_id, status in result['boards'].items()]
+        return jsonify({'success': True, **result}), 200
+    except Exception as e:
+        logger.error(f"Bulk damage status error: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 400
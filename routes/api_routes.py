@@ -3,13 +3,19 @@
 from flask import Blueprint, request, jsonify, session
 from flask_login import login_required, current_user
 from flask_socketio import emit
+from database import unit_of_work, retry_on_conflict
 from models.board import Board
 from models.checkout import Checkout
 from models.reservation import Reservation
-from models.location import Location
+from models.batch_loader import prime
+from services.location_registry import location_registry
 from services.checkout_service import CheckoutService
 from services.reservation_service import ReservationService
 from services.timezone_service import TimezoneService
+from services.availability_service import AvailabilityService
+from services.occupancy_index import occupancy_index
+from services.background_executor import background_executor
+from utils.decorators import idempotent, batch_loading
 from utils.constants import (
     MSG_CHECKOUT_SUCCESS,
     MSG_CHECKOUT_FAILED,
@@ -31,6 +37,7 @@ api_routes = Blueprint("api_routes", __name__, url_prefix="/api")
 checkout_service = CheckoutService()
 reservation_service = ReservationService()
 timezone_service = TimezoneService()
+availability_service = AvailabilityService(timezone_service=timezone_service)
 
 
 def get_selected_location_id():
@@ -39,9 +46,7 @@ def get_selected_location_id():
     if not location_id and current_user.is_authenticated:
         location_id = current_user.location_id
         if not location_id:
-            first_location = Location.find_all()
-            if first_location:
-                location_id = first_location[0].id
+            location_id = location_registry.get_first_id()
         # Always save to session so it persists
         if location_id:
             session["selected_location_id"] = location_id
@@ -51,6 +56,7 @@ def get_selected_location_id():
 
 @api_routes.route("/checkout/<board_id>", methods=["POST"])
 @login_required
+@idempotent
 def checkout_board(board_id):
     """API endpoint to checkout a board"""
     try:
@@ -107,8 +113,38 @@ def checkout_board(board_id):
         return jsonify({"success": False, "error": str(e)}), 400
 
 
+def broadcast_return(checkout_id, board_id, board_status, location_id):
+    """Send the Socket.IO events for a returned board (background task)"""
+    try:
+        from flask import current_app
+
+        socketio = current_app.extensions.get("socketio")
+        if socketio:
+            socketio.emit(
+                "board_status_changed",
+                {
+                    "board_id": board_id,
+                    "status": board_status,
+                    "location_id": location_id,
+                },
+                room=f"location_{location_id}",
+            )
+            socketio.emit(
+                "checkout_returned",
+                {
+                    "checkout_id": checkout_id,
+                    "board_id": board_id,
+                    "location_id": location_id,
+                },
+                room=f"location_{location_id}",
+            )
+    except Exception as e:
+        logger.error(f"Error emitting socket event: {e}")
+
+
 @api_routes.route("/return/<checkout_id>", methods=["POST"])
 @login_required
+@idempotent
 def return_board(checkout_id):
     """API endpoint to return a board"""
     try:
@@ -124,51 +160,34 @@ def return_board(checkout_id):
             }
 
         ip_address = request.remote_addr
-        checkout = checkout_service.return_board(
-            checkout_id, current_user.id, location_id, damage_report, ip_address
-        )
+        # Return and rating are committed together (and retried together on a conflict)
+        @retry_on_conflict
+        def return_and_rate():
+            with unit_of_work():
+                checkout = checkout_service.return_board(
+                    checkout_id, current_user.id, location_id, damage_report, ip_address
+                )
+                
+                # Handle rating if provided
+                if request.json and request.json.get("rating"):
+                    from models.board_rating import BoardRating
+                    rating = BoardRating(
+                        board_id=checkout.board_id,
+                        user_id=current_user.id,
+                        checkout_id=checkout_id,
+                        rating=int(request.json.get("rating")),
+                        review=request.json.get("review")
+                    )
+                    rating.save()
+                return checkout
         
-        # Handle rating if provided
-        if request.json and request.json.get("rating"):
-            from models.board_rating import BoardRating
-            rating = BoardRating(
-                board_id=checkout.board_id,
-                user_id=current_user.id,
-                checkout_id=checkout_id,
-                rating=int(request.json.get("rating")),
-                review=request.json.get("review")
-            )
-            rating.save()
-
-        # Emit real-time update
-        try:
-            from flask import current_app
+        checkout = return_and_rate()
 
-            socketio = current_app.extensions.get("socketio")
-            if socketio:
-                board_status = (
-                    BOARD_STATUS_DAMAGED if damage_report else BOARD_STATUS_AVAILABLE
-                )
-                socketio.emit(
-                    "board_status_changed",
-                    {
-                        "board_id": checkout.board_id,
-                        "status": board_status,
-                        "location_id": location_id,
-                    },
-                    room=f"location_{location_id}",
-                )
-                socketio.emit(
-                    "checkout_returned",
-                    {
-                        "checkout_id": checkout.id,
-                        "board_id": checkout.board_id,
-                        "location_id": location_id,
-                    },
-                    room=f"location_{location_id}",
-                )
-        except Exception as e:
-            logger.error(f"Error emitting socket event: {e}")
+        # Tell the location's clients once the return is committed, off the request path
+        board_status = BOARD_STATUS_DAMAGED if damage_report else BOARD_STATUS_AVAILABLE
+        background_executor.submit(
+            broadcast_return, checkout.id, checkout.board_id, board_status, location_id
+        )
 
         return jsonify({"success": True, "checkout": checkout.to_dict()}), 200
     except Exception as e:
@@ -199,6 +218,7 @@ def activate_checkout(checkout_id):
         # This means checkout_time <= now, which triggers "in use" display
         checkout.checkout_time = datetime.utcnow()
         db.session.commit()
+        occupancy_index.sync_checkout(checkout)
         
         logger.info(f"Checkout {checkout_id} activated by user {current_user.id}")
         return jsonify({"success": True, "checkout": checkout.to_dict()}), 200
@@ -300,6 +320,50 @@ def get_available_boards():
     )
 
 
+@api_routes.route("/availability", methods=["GET"])
+@login_required
+def get_availability():
+    """
+    API endpoint for the boards x hours availability matrix of a location and date
+    Each board gets a 24-character string, one '1'/'0' per local start hour
+    """
+    from datetime import datetime
+
+    location_id = request.args.get("location_id") or get_selected_location_id()
+    if not location_id:
+        return jsonify({"success": False, "error": "No location selected"}), 400
+
+    selected_date = request.args.get("date")
+    try:
+        local_date = datetime.strptime(selected_date, "%Y-%m-%d").date()
+        duration_hours = int(request.args.get("duration", 1))
+    except (ValueError, TypeError):
+        return jsonify({"success": False, "error": "Invalid date or duration"}), 400
+    duration_hours = max(1, min(24, duration_hours))
+
+    boards_list = Board.find_by_location(location_id)
+    matrix = availability_service.get_day_matrix(
+        location_id, local_date, duration_hours, boards=boards_list
+    )
+
+    return (
+        jsonify(
+            {
+                "success": True,
+                "location_id": location_id,
+                "date": local_date.isoformat(),
+                "duration_hours": duration_hours,
+                "boards": [{"id": board.id, "name": board.name} for board in boards_list],
+                "availability": [
+                    "".join("1" if free else "0" for free in matrix[board.id])
+                    for board in boards_list
+                ],
+            }
+        ),
+        200,
+    )
+
+
 @api_routes.route("/reservations/queue/<board_id>", methods=["GET"])
 @login_required
 def get_reservation_queue(board_id):
@@ -403,6 +467,7 @@ def debug_board(board_id):
 
 @api_routes.route("/debug/clear-my-checkouts", methods=["POST"])
 @login_required
+@batch_loading
 def clear_my_checkouts():
     """Clear all active checkouts for current user (for testing)"""
     from models.checkout import Checkout
@@ -415,6 +480,7 @@ def clear_my_checkouts():
             user_id=current_user.id,
             status=Checkout.STATUS_ACTIVE
         ).all()
+        prime(Board, [checkout.board_id for checkout in active_checkouts])
         
         count = 0
         for checkout in active_checkouts:
@@ -430,6 +496,8 @@ def clear_my_checkouts():
             count += 1
         
         db.session.commit()
+        for checkout in active_checkouts:
+            occupancy_index.remove_checkout(checkout)
         
         return jsonify({
             "success": True,
@@ -60,8 +60,8 @@ def register():
             logger.error(f"Registration failed for {email}: {e}")
     
     # Get locations for registration form
-    from models.location import Location
-    locations = Location.find_all()
+    from services.location_registry import location_registry
+    locations = location_registry.find_all()
     
     return render_template('auth/register.html', locations=locations)
 
@@ -1,14 +1,16 @@
 """Cart routes - Shopping cart functionality"""
-from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, session
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, session, g
 from flask_login import login_required, current_user
 from models.board import Board
-from models.checkout import Checkout
-from models.location import Location
-from models.activity_log import ActivityLog
 from services.checkout_service import CheckoutService
 from services.timezone_service import TimezoneService
-from database import db
-from datetime import datetime, timedelta
+from services.availability_service import AvailabilityService
+from services.cart_service import CartService
+from services.bulk_checkout_service import BulkCheckoutService
+from services.cart_store import get_cart_store, new_cart_token
+from services.location_registry import location_registry
+from utils.decorators import idempotent
+from datetime import datetime
 import logging
 import pytz
 
@@ -17,20 +19,69 @@ logger = logging.getLogger(__name__)
 cart_routes = Blueprint('cart_routes', __name__)
 checkout_service = CheckoutService()
 timezone_service = TimezoneService()
+availability_service = AvailabilityService()
+cart_service = CartService()
+bulk_checkout_service = BulkCheckoutService(availability_service=availability_service)
 
 
 def get_cart():
     """
-    Get cart from session.
+    Get cart from the server-side cart store (the session only holds its token).
     Cart is a list of dicts: [{board_id, location_id, checkout_date, checkout_hour, duration_hours}, ...]
     """
-    return session.get('cart', [])
+    if 'cart' in g:
+        return list(g.cart)
+    
+    token = session.get('cart_token')
+    cart = get_cart_store().get(token) if token else []
+    
+    # Move a cart left in the cookie by an older version into the store
+    legacy_cart = session.pop('cart', None)
+    if legacy_cart and not cart:
+        save_cart(legacy_cart)
+        cart = legacy_cart
+    
+    g.cart = cart
+    return list(cart)
 
 
 def save_cart(cart):
-    """Save cart to session"""
-    session['cart'] = cart
-    session.permanent = True
+    """Save cart to the server-side cart store"""
+    token = session.get('cart_token')
+    if not token:
+        token = new_cart_token()
+        session['cart_token'] = token
+        session.permanent = True
+    user_id = current_user.id if current_user.is_authenticated else None
+    get_cart_store().save(token, cart, user_id=user_id)
+    g.cart = list(cart)
+
+
+@cart_routes.app_context_processor
+def inject_cart():
+    """Give templates lazy access to the cart (only read if a template asks)"""
+    def cart_board_ids():
+        return [item.get('board_id') if isinstance(item, dict) else item for item in get_cart()]
+    return {'current_cart': get_cart, 'cart_board_ids': cart_board_ids}
+
+
+def get_cart_item_datetime(location_id, checkout_date, checkout_hour):
+    """
+    Convert a cart item's local date and hour to datetimes
+    Returns: (checkout_datetime_local, checkout_datetime_utc)
+    """
+    hour = int(checkout_hour)
+    checkout_datetime_str = f"{checkout_date} {hour:02d}:00"
+    checkout_datetime_local = datetime.strptime(checkout_datetime_str, '%Y-%m-%d %H:%M')
+    
+    tz = timezone_service.get_location_timezone(location_id)
+    checkout_datetime_local = tz.localize(checkout_datetime_local)
+    return checkout_datetime_local, checkout_datetime_local.astimezone(pytz.UTC)
+
+
+def clamp_duration_hours(duration_hours):
+    """Clamp a booking duration to the supported 1-24 hour range"""
+    return max(1, min(24, int(duration_hours)))
 
 
 def get_selected_location_id():
@@ -39,9 +90,7 @@ def get_selected_location_id():
     if not location_id and current_user.is_authenticated:
         location_id = current_user.location_id
         if not location_id:
-            first_location = Location.find_all()
-            if first_location:
-                location_id = first_location[0].id
+            location_id = location_registry.get_first_id()
         if location_id:
             session['selected_location_id'] = location_id
     return location_id
@@ -52,6 +101,10 @@ def get_selected_location_id():
 def view_cart():
     """View shopping cart"""
     cart = get_cart()
+    # Load every board in the cart with one query (locations come from the registry)
+    boards = cart_service.load_boards(
+        item.get('board_id') if isinstance(item, dict) else item for item in cart
+    )
     
     # Build cart items with full details
     cart_items = []
@@ -72,11 +125,11 @@ def view_cart():
             board_id = item.get('board_id')
             item_details = item
         
-        board = Board.find_by_id(board_id)
+        board = boards.get(board_id)
         if board:
             # Don't filter by availability here - let users see what's in their cart
             # Availability will be checked at checkout time
-            location = Location.find_by_id(item_details.get('location_id'))
+            location = location_registry.get(item_details.get('location_id'))
             
             # Format hour for display
             hour = int(item_details.get('checkout_hour', 8))
@@ -118,6 +171,17 @@ def add_to_cart(board_id):
     checkout_hour = session.get('checkout_hour', '8')
     duration_hours = session.get('checkout_duration', '1')
     
+    # The dashboard picker can switch hours on the client without reloading,
+    # so it sends the current selection along; remember it like the dashboard does
+    selection = request.get_json(silent=True) or {}
+    if selection.get('checkout_date') and selection.get('checkout_hour') is not None:
+        checkout_date = str(selection['checkout_date'])
+        checkout_hour = str(selection['checkout_hour'])
+        duration_hours = str(selection.get('duration_hours') or duration_hours)
+        session['checkout_date'] = checkout_date
+        session['checkout_hour'] = checkout_hour
+        session['checkout_duration'] = duration_hours
+    
     if not checkout_date:
         return jsonify({'success': False, 'error': 'Please select a checkout date on the dashboard first'}), 400
     
@@ -132,16 +196,10 @@ def add_to_cart(board_id):
     # Check availability at the selected datetime (same as dashboard display)
     # This checks for overlapping checkouts/reservations, not just board status
     try:
-        checkout_hour_int = int(checkout_hour)
         duration_int = int(duration_hours)
-        checkout_datetime_str = f"{checkout_date} {checkout_hour_int:02d}:00"
-        checkout_datetime_local = datetime.strptime(checkout_datetime_str, '%Y-%m-%d %H:%M')
+        _, checkout_datetime_utc = get_cart_item_datetime(location_id, checkout_date, checkout_hour)
         
-        tz = timezone_service.get_location_timezone(location_id)
-        checkout_datetime_local = tz.localize(checkout_datetime_local)
-        checkout_datetime_utc = checkout_datetime_local.astimezone(pytz.UTC)
-        
-        is_available, reason = board.is_available_at_datetime(checkout_datetime_utc, duration_int)
+        is_available, reason = availability_service.check_board(board.id, checkout_datetime_utc, duration_int)
         if not is_available:
             return jsonify({'success': False, 'error': f'Board is {reason} at this time. Choose a different date/time.'}), 400
     except Exception as e:
@@ -153,8 +211,6 @@ def add_to_cart(board_id):
             return jsonify({'success': False, 'error': f'Board status is {board.status}, not available'}), 400
     
     # Parse selected checkout date
-    from models.reservation import Reservation
-    
     selected_checkout_date = None
     if checkout_date:
         try:
@@ -169,32 +225,18 @@ def add_to_cart(board_id):
         if item_board_id == board_id:
             return jsonify({'success': False, 'error': 'Board is already in your cart'}), 400
     
-    # Check for date conflicts with existing scheduled checkouts from different locations
-    active_checkouts = Checkout.find_active_by_user(current_user.id)
-    for checkout in active_checkouts:
-        checkout_board = Board.find_by_id(checkout.board_id)
-        if checkout_board and checkout_board.location_id != board.location_id:
-            checkout_date_obj = checkout.checkout_time.date() if checkout.checkout_time else None
-            if selected_checkout_date and checkout_date_obj and selected_checkout_date == checkout_date_obj:
-                checkout_location = Location.find_by_id(checkout_board.location_id)
-                return jsonify({
-                    'success': False,
-                    'error': f'You already have a reservation at {checkout_location.name if checkout_location else "another location"} on {selected_checkout_date.strftime("%b %d, %Y")}. You cannot reserve boards from different locations on the same day.'
-                }), 400
-    
-    # Check for date conflicts with existing reservations from different locations
-    reservations = Reservation.find_by_user(current_user.id)
-    for reservation in reservations:
-        if reservation.status in ['pending', 'available']:
-            reservation_board = Board.find_by_id(reservation.board_id)
-            if reservation_board and reservation_board.location_id != board.location_id:
-                reservation_date = reservation.unlock_time.date() if reservation.unlock_time else None
-                if selected_checkout_date and reservation_date and selected_checkout_date == reservation_date:
-                    reservation_location = Location.find_by_id(reservation_board.location_id)
-                    return jsonify({
-                        'success': False,
-                        'error': f'You already have a reservation at {reservation_location.name if reservation_location else "another location"} on {selected_checkout_date.strftime("%b %d, %Y")}. You cannot reserve boards from different locations on the same day.'
-                    }), 400
+    # Check for date conflicts with existing checkouts/reservations from different locations
+    # (one query, however many bookings the user has)
+    if selected_checkout_date:
+        other_location_id = cart_service.find_other_location_booking(
+            current_user.id, board.location_id, selected_checkout_date
+        )
+        if other_location_id:
+            other_location = location_registry.get(other_location_id)
+            return jsonify({
+                'success': False,
+                'error': f'You already have a reservation at {other_location.name if other_location else "another location"} on {selected_checkout_date.strftime("%b %d, %Y")}. You cannot reserve boards from different locations on the same day.'
+            }), 400
     
     # Check for date conflicts with items already in cart from different locations
     for item in cart:
@@ -203,7 +245,7 @@ def add_to_cart(board_id):
             item_date = item.get('checkout_date')
             if item_location_id and item_location_id != location_id:
                 if item_date and checkout_date and item_date == checkout_date:
-                    item_location = Location.find_by_id(item_location_id)
+                    item_location = location_registry.get(item_location_id)
                     return jsonify({
                         'success': False,
                         'error': f'You have a board in your cart from {item_location.name if item_location else "another location"} on this same date. Different locations must be on different days.'
@@ -251,6 +293,7 @@ def remove_from_cart(board_id):
 
 @cart_routes.route('/cart/checkout', methods=['POST'])
 @login_required
+@idempotent
 def checkout_cart():
     """Checkout all items in cart - each item has its own date/time/location"""
     cart = get_cart()
@@ -260,112 +303,52 @@ def checkout_cart():
     
     checkouts = []
     errors = []
+    items = []
     
-    try:
-        for item in cart:
-            # Handle both old format (string) and new format (dict)
-            if isinstance(item, str):
-                # Old format - skip, shouldn't happen with new code
-                errors.append(f"Invalid cart item format")
-                continue
-            
-            board_id = item.get('board_id')
-            location_id = item.get('location_id')
-            checkout_date = item.get('checkout_date')
-            checkout_hour = item.get('checkout_hour', '8')
-            duration_hours = int(item.get('duration_hours', 1))
-            
-            if not all([board_id, location_id, checkout_date]):
-                errors.append(f"Missing checkout details for a board")
-                continue
-            
-            try:
-                # Verify board exists
-                board = Board.find_by_id(board_id)
-                if not board:
-                    errors.append(f"Board not found")
-                    continue
-                
-                # Parse datetime first so we can check availability at that time
-                hour = int(checkout_hour)
-                checkout_datetime_str = f"{checkout_date} {hour:02d}:00"
-                checkout_datetime_local = datetime.strptime(checkout_datetime_str, '%Y-%m-%d %H:%M')
-                
-                # Convert to UTC for storage
-                tz = timezone_service.get_location_timezone(location_id)
-                checkout_datetime_local = tz.localize(checkout_datetime_local)
-                checkout_datetime_utc = checkout_datetime_local.astimezone(pytz.UTC)
-                
-                # Check availability at the specific datetime (not just board status)
-                is_available, reason = board.is_available_at_datetime(checkout_datetime_utc, duration_hours)
-                if not is_available:
-                    errors.append(f"Board {board.name} is {reason} at that time")
-                    continue
-                
-                # Calculate return time
-                if duration_hours < 1:
-                    duration_hours = 1
-                elif duration_hours > 24:
-                    duration_hours = 24
-                
-                expected_return_time = checkout_datetime_utc + timedelta(hours=duration_hours)
-                
-                # Create checkout
-                checkout = Checkout(
-                    user_id=current_user.id,
-                    board_id=board_id,
-                    checkout_time=checkout_datetime_utc,
-                    expected_return_time=expected_return_time,
-                    status=Checkout.STATUS_ACTIVE
-                )
-                db.session.add(checkout)
-                
-                # Update board status
-                board.status = Board.STATUS_CHECKED_OUT
-                db.session.add(board)
-                
-                # Log activity
-                try:
-                    is_weekend = checkout_datetime_local.weekday() >= 5
-                    log = ActivityLog(
-                        user_id=current_user.id,
-                        board_id=board_id,
-                        action_type=ActivityLog.ACTION_CHECKOUT,
-                        action_details={
-                            'checkout_id': checkout.id,
-                            'expected_return_time': expected_return_time.isoformat(),
-                            'is_weekend': is_weekend,
-                            'location_id': location_id,
-                            'duration_hours': duration_hours
-                        },
-                        location_id=location_id,
-                        ip_address=request.remote_addr
-                    )
-                    db.session.add(log)
-                except Exception as log_error:
-                    logger.error(f"Error creating activity log: {log_error}")
-                
-                checkouts.append(checkout)
-                
-            except Exception as e:
-                logger.error(f"Error checking out board {board_id}: {e}")
-                import traceback
-                logger.error(traceback.format_exc())
-                errors.append(f"Error checking out board: {str(e)}")
+    for item in cart:
+        # Handle both old format (string) and new format (dict)
+        if isinstance(item, str):
+            # Old format - skip, shouldn't happen with new code
+            errors.append(f"Invalid cart item format")
+            continue
         
-        # Commit all checkouts at once
-        if checkouts:
-            db.session.commit()
-            for checkout in checkouts:
-                db.session.refresh(checkout)
-        else:
-            db.session.rollback()
-            
+        board_id = item.get('board_id')
+        location_id = item.get('location_id')
+        checkout_date = item.get('checkout_date')
+        checkout_hour = item.get('checkout_hour', '8')
+        
+        if not all([board_id, location_id, checkout_date]):
+            errors.append(f"Missing checkout details for a board")
+            continue
+        
+        try:
+            # Parse datetime so availability is checked at that time
+            # (converted to UTC for storage)
+            checkout_datetime_local, checkout_datetime_utc = get_cart_item_datetime(
+                location_id, checkout_date, checkout_hour
+            )
+            items.append({
+                'board_id': board_id,
+                'location_id': location_id,
+                'checkout_datetime_local': checkout_datetime_local,
+                'checkout_datetime_utc': checkout_datetime_utc,
+                'duration_hours': clamp_duration_hours(item.get('duration_hours', 1))
+            })
+        except Exception as e:
+            logger.error(f"Error reading cart item for board {board_id}: {e}")
+            errors.append(f"Error checking out board: {str(e)}")
+    
+    try:
+        # One prefetch, bulk inserts and a single commit for the whole cart
+        checkouts, item_errors = bulk_checkout_service.checkout_items(
+            current_user.id, items, ip_address=request.remote_addr
+        )
+        errors.extend(item_errors)
     except Exception as e:
         logger.error(f"Error during checkout transaction: {e}")
         import traceback
         logger.error(traceback.format_exc())
-        db.session.rollback()
+        checkouts = []
         if not errors:
             errors.append(f"Checkout failed: {str(e)}")
     
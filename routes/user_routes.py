@@ -2,12 +2,16 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, session
 from flask_login import login_required, current_user
 from models.board import Board
-from models.checkout import Checkout
 from models.reservation import Reservation
 from models.location import Location
+from models.batch_loader import prime
+from services.location_registry import location_registry
 from services.checkout_service import CheckoutService
 from services.reservation_service import ReservationService
 from services.timezone_service import TimezoneService
+from services.availability_service import AvailabilityService
+from services.timeline_service import TimelineService
+from utils.decorators import batch_loading
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,6 +20,8 @@ user_routes = Blueprint('user_routes', __name__)
 checkout_service = CheckoutService()
 reservation_service = ReservationService()
 timezone_service = TimezoneService()
+availability_service = AvailabilityService()
+timeline_service = TimelineService()
 
 
 def get_selected_location_id():
@@ -25,17 +31,44 @@ def get_selected_location_id():
         # Use user's default location if set, otherwise get first location
         location_id = current_user.location_id
         if not location_id:
-            first_location = Location.find_all()
-            if first_location:
-                location_id = first_location[0].id
+            location_id = location_registry.get_first_id()
         # Always save to session so it persists
         if location_id:
             session['selected_location_id'] = location_id
     return location_id
 
 
+def add_time_displays(items, default_location_id=None):
+    """
+    Format each item's times in its location's timezone, one batch per location
+    Sets checkout_time_display and expected_return_time_display on checkouts,
+    unlock_time_display on reservations. With batch loading on, the items'
+    locations load with one query.
+    """
+    by_location = {}
+    for item in items:
+        location_id = item.board.location_id if item.board else default_location_id
+        by_location.setdefault(location_id, []).append(item)
+    prime(Location, by_location.keys())
+    
+    for location_id, location_items in by_location.items():
+        location = Location.find_by_id(location_id)
+        fields = []
+        for item in location_items:
+            names = ['checkout_time', 'expected_return_time'] if item.is_checkout else ['unlock_time']
+            fields.extend((item, name) for name in names)
+        formatted = timezone_service.format_many(
+            [getattr(item, name) for item, name in fields],
+            location_id,
+            location.name if location else None
+        )
+        for (item, name), display in zip(fields, formatted):
+            setattr(item, f'{name}_display', display)
+
+
 @user_routes.route('/dashboard')
 @login_required
+@batch_loading
 def dashboard():
     """User dashboard"""
     from datetime import datetime, timedelta
@@ -46,13 +79,12 @@ def dashboard():
     
     # Ensure we always have a location selected
     if not location_id:
-        all_locations = Location.find_all()
-        if all_locations:
-            location_id = all_locations[0].id
+        location_id = location_registry.get_first_id()
+        if location_id:
             session['selected_location_id'] = location_id
     
     # Get all locations for the selector
-    all_locations = Location.find_all()
+    all_locations = location_registry.find_all()
     
     # Get selected date, hour, and duration from request (if provided)
     # Also check session for previously selected values
@@ -99,86 +131,46 @@ def dashboard():
     # Get duration as integer for availability check
     duration_hours = int(selected_duration) if selected_duration else 1
     
-    # Import BoardRating for getting ratings
-    from models.board_rating import BoardRating
+    # Check availability for all boards at selected datetime in one pass
+    availability = {}
+    if selected_datetime_utc and location_id:
+        availability = availability_service.check_location(
+            location_id, selected_datetime_utc, duration_hours, boards=all_boards
+        )
+    
+    # Suggest the next free slot for boards that are busy at the selected time
+    busy_board_ids = [board_id for board_id, (is_available, _) in availability.items() if not is_available]
+    next_free = availability_service.get_next_free(busy_board_ids, selected_datetime_utc, duration_hours) if busy_board_ids else {}
     
-    # Check availability for each board at selected datetime
     available_boards = []
     for board in all_boards:
         if selected_datetime_utc:
-            is_available, reason = board.is_available_at_datetime(selected_datetime_utc, duration_hours)
+            is_available, reason = availability.get(board.id, (True, None))
             board.availability_at_time = is_available
             board.availability_reason = reason if not is_available else None
+            board.next_available_time = next_free.get(board.id)
         else:
             # If no datetime selected, use current availability
             board.availability_at_time = board.is_available()
             board.availability_reason = None if board.is_available() else "Not available"
+            board.next_available_time = None
         
-        # Get board ratings
-        rating_data = BoardRating.get_average_rating(board.id)
-        board.avg_rating = rating_data['average']
-        board.rating_count = rating_data['count']
-        
+        # Ratings come from the board's running totals (avg_rating/rating_count)
         available_boards.append(board)
     
-    # Get all active checkouts (across all locations)
-    # Combine everything into reservations section:
-    # - Scheduled: checkout_time > now
-    # - In Use: checkout_time <= now
-    all_active_checkouts = Checkout.find_active_by_user(current_user.id)
+    # Get the first page of the user's checkouts and reservations:
+    # scheduled (checkout_time > now), then in use, then reservations
     now = datetime.utcnow()
-    
-    # Get actual reservations
-    reservations = Reservation.find_by_user(current_user.id)
-    
-    # Combine all checkouts and reservations into one list for display
-    all_items = []
-    
-    # Add checkouts (both scheduled and in use)
-    for checkout in all_active_checkouts:
-        board = Board.find_by_id(checkout.board_id)
-        checkout.board = board
-        # Get location for checkout
-        if board:
-            location = Location.find_by_id(board.location_id)
-            checkout.location = location
-        checkout.is_checkout = True
-        checkout.display_status = 'scheduled' if checkout.checkout_time > now else 'in_use'
-        all_items.append(checkout)
-    
-    # Add actual reservations (only pending/available, not cancelled)
-    for reservation in reservations:
-        # Skip cancelled reservations
-        if reservation.status == Reservation.STATUS_CANCELLED:
-            continue
-        board = Board.find_by_id(reservation.board_id)
-        reservation.board = board
-        # Get location from board
-        if board:
-            location = Location.find_by_id(board.location_id)
-            reservation.location = location
-        reservation.is_checkout = False
-        all_items.append(reservation)
-    
-    # Sort by date (scheduled first, then in use, then reservations)
-    def sort_key(x):
-        if hasattr(x, 'is_checkout') and x.is_checkout:
-            if x.checkout_time > now:
-                return (0, x.checkout_time)  # Scheduled first
-            else:
-                return (1, x.checkout_time)  # In use second
-        else:
-            unlock = x.unlock_time if hasattr(x, 'unlock_time') else datetime.min
-            return (2, unlock)  # Reservations third
-    
-    all_items.sort(key=sort_key)
+    all_items, next_cursor = timeline_service.get_page(current_user.id, now=now)
+    add_time_displays(all_items, location_id)
     
     # Get current location object
-    current_location = Location.find_by_id(location_id) if location_id else None
+    current_location = location_registry.get(location_id) if location_id else None
     
     return render_template('user/dashboard.html',
                          available_boards=available_boards,
                          all_items=all_items,
+                         next_cursor=next_cursor,
                          all_locations=all_locations,
                          current_location=current_location,
                          selected_location_id=location_id,
@@ -196,7 +188,7 @@ def switch_location():
     location_id = request.form.get('location_id') or request.json.get('location_id')
     if location_id:
         # Verify location exists
-        location = Location.find_by_id(location_id)
+        location = location_registry.get(location_id)
         if location:
             session['selected_location_id'] = location_id
         else:
@@ -215,8 +207,8 @@ def boards():
     """View all boards at location"""
     location_id = get_selected_location_id()
     boards_list = Board.find_by_location(location_id) if location_id else []
-    all_locations = Location.find_all()
-    current_location = Location.find_by_id(location_id) if location_id else None
+    all_locations = location_registry.find_all()
+    current_location = location_registry.get(location_id) if location_id else None
     
     return render_template('user/boards.html', 
                          boards=boards_list,
@@ -227,58 +219,16 @@ def boards():
 
 @user_routes.route('/my-checkouts')
 @login_required
+@batch_loading
 def my_checkouts():
     """View user's reservations - all checkouts and reservations combined"""
-    from models.board import Board
-    from models.location import Location
-    from datetime import datetime
-    
-    now = datetime.utcnow()
-    
-    # Get all active checkouts for user
-    all_active_checkouts = Checkout.find_active_by_user(current_user.id)
-    
-    # Get all reservations for user
-    reservations_list = Reservation.find_by_user(current_user.id)
-    
-    # Combine all checkouts and reservations into one list for display
-    all_items = []
-    
-    # Add checkouts (both scheduled and in use)
-    for checkout in all_active_checkouts:
-        if checkout.status == Checkout.STATUS_CANCELLED:
-            continue
-        board = Board.find_by_id(checkout.board_id)
-        checkout.board = board
-        if board:
-            location = Location.find_by_id(board.location_id)
-            checkout.location = location
-        checkout.is_checkout = True
-        checkout.display_status = 'scheduled' if checkout.checkout_time > now else 'in_use'
-        all_items.append(checkout)
-    
-    # Add actual reservations
-    for reservation in reservations_list:
-        if reservation.status == Reservation.STATUS_CANCELLED:
-            continue
-        board = Board.find_by_id(reservation.board_id)
-        reservation.board = board
-        if board:
-            location = Location.find_by_id(board.location_id)
-            reservation.location = location
-        reservation.is_checkout = False
-        all_items.append(reservation)
-    
-    # Sort by date
-    def sort_key(x):
-        if x.is_checkout:
-            return x.checkout_time
-        return x.unlock_time
-    
-    all_items.sort(key=sort_key)
+    # One page of the timeline; ?after=<cursor> continues from the previous page
+    all_items, next_cursor = timeline_service.get_page(current_user.id, cursor=request.args.get('after'))
+    add_time_displays(all_items)
     
     return render_template('user/my_checkouts.html', 
                           all_items=all_items,
+                          next_cursor=next_cursor,
                           timezone_service=timezone_service)
 
 
@@ -294,11 +244,10 @@ def reservations():
 @login_required
 def my_account():
     """View and edit user account settings"""
-    from models.location import Location
     from werkzeug.security import check_password_hash, generate_password_hash
     from database import db
     
-    all_locations = Location.find_all()
+    all_locations = location_registry.find_all()
     message = None
     error = None
     
@@ -0,0 +1,115 @@
+"""
+Benchmark checkout and return throughput
+Seeds a throwaway SQLite database with a set of boards, then checks every
+board out and returns it again through CheckoutService, timing each operation,
+counting the commits each makes and reporting p50/p99 latency.
+
+Usage:
+    python scripts/benchmark_checkout_throughput.py [--boards 200] [--rounds 3]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Use a throwaway database (must be set before the app config is imported)
+db_dir = tempfile.mkdtemp()
+os.environ['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(db_dir, 'benchmark.db')}"
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app import create_app
+from database import db
+from models import Location, User, Board
+from services.checkout_service import CheckoutService
+from services.background_executor import background_executor
+
+
+def seed(board_count):
+    """Add a location, a user and board_count boards"""
+    location = Location(name='Benchmark Beach', timezone='America/Chicago')
+    location.save()
+    user = User(email='benchmark@example.com', full_name='Benchmark User',
+                location_id=location.id, password_hash='x')
+    db.session.add(user)
+    boards = [Board(location_id=location.id, name=f'Board {i}') for i in range(board_count)]
+    db.session.add_all(boards)
+    db.session.commit()
+    return location.id, user.id, [board.id for board in boards]
+
+
+def run_pass(service, location_id, user_id, board_ids):
+    """
+    Check out and return every board once
+    Returns: (checkout latencies, return latencies) in seconds
+    """
+    checkout_times = []
+    checkout_ids = []
+    for board_id in board_ids:
+        start = time.perf_counter()
+        checkout_ids.append(service.checkout_board(user_id, board_id, location_id).id)
+        checkout_times.append(time.perf_counter() - start)
+    return_times = []
+    for checkout_id in checkout_ids:
+        start = time.perf_counter()
+        service.return_board(checkout_id, user_id, location_id)
+        return_times.append(time.perf_counter() - start)
+    return checkout_times, return_times
+
+
+def percentile(latencies, fraction):
+    """Latency at the given fraction (e.g. 0.99) of the sorted latencies"""
+    ordered = sorted(latencies)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def report(label, latencies):
+    """Print throughput and p50/p99 latency for one operation"""
+    print(f"  {label:<10}{len(latencies) / sum(latencies):8.1f} ops/sec"
+          f"   p50 {percentile(latencies, 0.5) * 1000:6.2f} ms"
+          f"   p99 {percentile(latencies, 0.99) * 1000:6.2f} ms")
+
+
+def main():
+    """Run the benchmark and print throughput and latency"""
+    parser = argparse.ArgumentParser(description='Benchmark checkout and return throughput')
+    parser.add_argument('--boards', type=int, default=200, help='Boards per pass')
+    parser.add_argument('--rounds', type=int, default=3, help='Number of passes')
+    args = parser.parse_args()
+
+    app = create_app()
+    commits = []
+
+    def count_commit(session):
+        commits.append(1)
+
+    with app.app_context():
+        location_id, user_id, board_ids = seed(args.boards)
+        service = CheckoutService()
+        event.listen(Session, 'after_commit', count_commit)
+        try:
+            checkout_times, return_times = [], []
+            for _ in range(args.rounds):
+                checkout_pass, return_pass = run_pass(service, location_id, user_id, board_ids)
+                checkout_times.extend(checkout_pass)
+                return_times.extend(return_pass)
+            # Let post-commit background work finish before counting commits
+            background_executor.wait_until_idle()
+        finally:
+            event.remove(Session, 'after_commit', count_commit)
+
+    operations = args.boards * args.rounds
+    print(f"{args.boards} boards x {args.rounds} rounds on SQLite")
+    report('checkouts:', checkout_times)
+    report('returns:', return_times)
+    print(f"  commits per operation: {len(commits) / (operations * 2):.2f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
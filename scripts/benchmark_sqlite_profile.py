@@ -0,0 +1,251 @@
+"""
+Benchmark the SQLite engine profile against SQLite's defaults
+Runs the same workload twice in fresh databases - once with SQLITE_TUNING off
+(rollback journal, synchronous=FULL) and once with the tuned profile (WAL,
+synchronous=NORMAL, busy_timeout, mmap, cache) - and compares them:
+- serial: one thread checking boards out and returning them
+- contended: threads in one process racing to check out the same board,
+  starting each round with an empty location registry (as after a
+  Location.save or the registry's TTL running out)
+- mixed: writer processes checking out and returning their own boards while
+  reader processes run dashboard-style queries, all at once for a fixed
+  time (separate processes, like web workers, so they contend for SQLite's
+  locks rather than the GIL)
+Exits with status 1 if the tuned profile has any "database is locked" errors.
+
+Usage:
+    python scripts/benchmark_sqlite_profile.py [--writers 4] [--readers 4] [--seconds 10] [--boards 200]
+                                               [--contenders 32] [--rounds 5]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+PROFILES = [('default', 'false'), ('tuned', 'true')]
+# Time for every worker process to import the app before the mixed phase starts
+STARTUP_SECONDS = 5
+
+
+def percentile(latencies, fraction):
+    """Latency at the given fraction (e.g. 0.99) of the sorted latencies"""
+    if not latencies:
+        return 0.0
+    ordered = sorted(latencies)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def run_role(args):
+    """Run one process of the benchmark and print its results as JSON"""
+    from sqlalchemy import select, func
+    from app import create_app
+    from database import db
+    from models import Location, User, Board, ActivityLog
+    from services.checkout_service import CheckoutService
+    from services.admin_stats_service import AdminStatsService
+    from services.background_executor import background_executor
+    from services.location_registry import location_registry
+    from utils.constants import ERROR_BOARD_NOT_AVAILABLE, ERROR_BOARD_ALREADY_CHECKED_OUT
+
+    app = create_app()
+    service = CheckoutService()
+
+    def checkout_and_return(user_id, board_id, location_id):
+        """One checkout and its return, each in its own app context like a request"""
+        with app.app_context():
+            checkout_id = service.checkout_board(user_id, board_id, location_id).id
+        with app.app_context():
+            service.return_board(checkout_id, user_id, location_id)
+
+    if args.role == 'seed':
+        # Seed the database, then time serial checkouts and returns on one connection
+        with app.app_context():
+            location = Location(name='Benchmark Beach', timezone='America/Chicago')
+            location.save()
+            users = [User(email=f'writer-{i}@example.com', full_name=f'Writer {i}',
+                          location_id=location.id, password_hash='x') for i in range(args.writers)]
+            boards = [Board(location_id=location.id, name=f'Board {i:05d}') for i in range(args.boards)]
+            db.session.add_all(users + boards)
+            db.session.commit()
+            location_id, user_id = location.id, users[0].id
+            board_ids = [board.id for board in boards]
+            contenders = [User(email=f'contender-{i}@example.com', full_name=f'Contender {i}',
+                               location_id=location_id, password_hash='x') for i in range(args.contenders)]
+            db.session.add_all(contenders)
+            db.session.commit()
+            contender_ids = [user.id for user in contenders]
+        started = time.perf_counter()
+        for board_id in board_ids:
+            checkout_and_return(user_id, board_id, location_id)
+        elapsed = time.perf_counter() - started
+        background_executor.wait_until_idle()
+        result = {'serial_ops': len(board_ids) * 2 / elapsed}
+
+        # Threads racing for one board; losing the race is expected, anything else is an error
+        lost_race_errors = {ERROR_BOARD_NOT_AVAILABLE, ERROR_BOARD_ALREADY_CHECKED_OUT}
+        result.update(contended_lock_errors=0, contended_other_errors=0)
+        lock = threading.Lock()
+
+        def attempt(contender_id, barrier, winners):
+            with app.app_context():
+                barrier.wait()
+                try:
+                    checkout = service.checkout_board(contender_id, board_ids[0], location_id)
+                    with lock:
+                        winners.append((checkout.id, contender_id))
+                except Exception as e:
+                    if str(e) not in lost_race_errors:
+                        with lock:
+                            result['contended_lock_errors' if 'locked' in str(e) else 'contended_other_errors'] += 1
+                finally:
+                    db.session.remove()
+
+        for _ in range(args.rounds):
+            location_registry.invalidate()
+            barrier = threading.Barrier(len(contender_ids))
+            winners = []
+            threads = [threading.Thread(target=attempt, args=(contender_id, barrier, winners))
+                       for contender_id in contender_ids]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            for checkout_id, contender_id in winners:
+                with app.app_context():
+                    service.return_board(checkout_id, contender_id, location_id)
+        background_executor.wait_until_idle()
+        print(json.dumps(result))
+        return
+
+    with app.app_context():
+        location_id = Location.query.filter_by(name='Benchmark Beach').one().id
+        user_id = User.query.filter_by(email=f'writer-{args.index}@example.com').one().id
+        board_ids = [board.id for board in Board.query.order_by(Board.name)][args.index::args.writers]
+    stats_service = AdminStatsService(ttl_seconds=0)
+    result = {'ops': 0, 'latencies': [], 'lock_errors': 0, 'other_errors': 0}
+
+    # All processes start together once they have loaded the app
+    time.sleep(max(0.0, args.start_at - time.time()))
+    end_at = args.start_at + args.seconds
+    n = 0
+    while time.time() < end_at:
+        start = time.perf_counter()
+        try:
+            if args.role == 'writer':
+                checkout_and_return(user_id, board_ids[n % len(board_ids)], location_id)
+            else:
+                with app.app_context():
+                    stats_service.get_status_counts(location_id)
+                    Board.find_by_location(location_id)
+                    db.session.execute(
+                        select(func.count(ActivityLog.id)).where(ActivityLog.location_id == location_id)
+                    ).scalar()
+            result['ops'] += 1
+            result['latencies'].append(time.perf_counter() - start)
+        except Exception as e:
+            result['lock_errors' if 'locked' in str(e) else 'other_errors'] += 1
+        n += 1
+    background_executor.wait_until_idle()
+    print(json.dumps(result))
+
+
+def run_profile(args, tuning):
+    """
+    Run the seed process, then all writer and reader processes together
+    Returns: Dict of results for one profile
+    """
+    db_dir = tempfile.mkdtemp()
+    env = dict(os.environ, SQLITE_TUNING=tuning,
+               SQLALCHEMY_DATABASE_URI=f"sqlite:///{os.path.join(db_dir, 'benchmark.db')}")
+    common = [sys.executable, __file__, '--writers', str(args.writers), '--boards', str(args.boards),
+              '--seconds', str(args.seconds), '--contenders', str(args.contenders), '--rounds', str(args.rounds)]
+
+    def last_json(output):
+        return json.loads(output.strip().splitlines()[-1])
+
+    seed = last_json(subprocess.run(common + ['--role', 'seed'], env=env, capture_output=True,
+                                    text=True, check=True).stdout)
+
+    start_at = str(time.time() + STARTUP_SECONDS)
+    processes = [
+        (role, subprocess.Popen(common + ['--role', role, '--index', str(i), '--start-at', start_at],
+                                env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True))
+        for role, count in (('writer', args.writers), ('reader', args.readers)) for i in range(count)
+    ]
+    totals = {role: {'ops': 0, 'latencies': []} for role in ('writer', 'reader')}
+    errors = {'lock_errors': 0, 'other_errors': 0}
+    for role, process in processes:
+        result = last_json(process.communicate()[0])
+        totals[role]['ops'] += result['ops']
+        totals[role]['latencies'].extend(result['latencies'])
+        for key in errors:
+            errors[key] += result[key]
+
+    return {
+        'serial_ops': seed['serial_ops'],
+        'contended_lock_errors': seed['contended_lock_errors'],
+        'contended_other_errors': seed['contended_other_errors'],
+        # Each writer op is a checkout plus a return
+        'write_ops': totals['writer']['ops'] * 2 / args.seconds,
+        'read_ops': totals['reader']['ops'] / args.seconds,
+        'write_p99_ms': percentile(totals['writer']['latencies'], 0.99) * 1000,
+        'read_p99_ms': percentile(totals['reader']['latencies'], 0.99) * 1000,
+        **errors
+    }
+
+
+def main():
+    """Run the workload under each profile and print a comparison"""
+    parser = argparse.ArgumentParser(description='Benchmark the SQLite profile against the defaults')
+    parser.add_argument('--writers', type=int, default=4, help='Writer processes in the mixed phase')
+    parser.add_argument('--readers', type=int, default=4, help='Reader processes in the mixed phase')
+    parser.add_argument('--seconds', type=float, default=10, help='Length of the mixed phase')
+    parser.add_argument('--boards', type=int, default=200, help='Boards to seed')
+    parser.add_argument('--contenders', type=int, default=32, help='Threads racing for one board')
+    parser.add_argument('--rounds', type=int, default=5, help='Rounds of the contended phase')
+    # Used when this script runs itself as a worker process
+    parser.add_argument('--role', choices=['seed', 'writer', 'reader'], help=argparse.SUPPRESS)
+    parser.add_argument('--index', type=int, default=0, help=argparse.SUPPRESS)
+    parser.add_argument('--start-at', type=float, default=0.0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.role:
+        run_role(args)
+        return 0
+
+    results = {name: run_profile(args, tuning) for name, tuning in PROFILES}
+
+    print(f"SQLite profile benchmark ({args.writers} writer and {args.readers} reader processes, "
+          f"{args.seconds:g}s mixed)")
+    print(f"  {'':<22}{'default':>12}{'tuned':>12}")
+    rows = [
+        ('serial ops/sec', 'serial_ops', '{:12.1f}'),
+        ('contended "locked"', 'contended_lock_errors', '{:12d}'),
+        ('contended other errors', 'contended_other_errors', '{:12d}'),
+        ('mixed writes/sec', 'write_ops', '{:12.1f}'),
+        ('mixed reads/sec', 'read_ops', '{:12.1f}'),
+        ('write p99 (ms)', 'write_p99_ms', '{:12.1f}'),
+        ('read p99 (ms)', 'read_p99_ms', '{:12.1f}'),
+        ('"database is locked"', 'lock_errors', '{:12d}'),
+        ('other errors', 'other_errors', '{:12d}'),
+    ]
+    for label, key, fmt in rows:
+        print(f"  {label:<22}" + ''.join(fmt.format(results[name][key]) for name, _ in PROFILES))
+
+    tuned = results['tuned']
+    if tuned['contended_lock_errors'] or tuned['lock_errors']:
+        print('  FAILED: the tuned profile hit "database is locked"')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
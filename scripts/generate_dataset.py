@@ -0,0 +1,453 @@
+"""
+Generate a large synthetic dataset for benchmarking
+Builds a realistic history - locations, boards, users, checkouts,
+reservations, ratings, damage reports and activity logs - with seasonal,
+weekly and hourly demand curves, and writes it with bulk inserts (one
+transaction per chunk) into SQLite or Postgres.
+
+The same --seed and --end-date always produce the same data (only the
+password hash salts differ). Every user's password is "password"
+(e.g. admin@location1.example.com).
+
+The defaults (5 locations x 200 boards, one year) give roughly 500k
+checkouts and 1.3M rows in total; use --locations 20 for millions.
+
+Writes to --database-uri, else SQLALCHEMY_DATABASE_URI, else a SQLite file
+in the system temp directory.
+
+Usage:
+    python scripts/generate_dataset.py [--locations 5] [--boards-per-location 200]
+        [--users-per-location 400] [--days 365] [--daily-rate 2.0] [--seed 42]
+        [--end-date 2026-01-01] [--database-uri sqlite:///...] [--drop]
+"""
+import argparse
+import bisect
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+DEFAULT_DATABASE_URI = f"sqlite:///{os.path.join(tempfile.gettempdir(), 'surfboard_synthetic.db')}"
+
+# Relative demand by month (Jan..Dec): busy summers, quiet winters
+SEASONAL_DEMAND = [0.30, 0.30, 0.45, 0.60, 0.85, 1.00, 1.00, 0.95, 0.75, 0.55, 0.40, 0.30]
+WEEKEND_DEMAND = 1.6
+# Relative demand by local start hour: morning and midday peaks
+HOURLY_DEMAND = {7: 3, 8: 6, 9: 9, 10: 12, 11: 13, 12: 11, 13: 10, 14: 9, 15: 8, 16: 7, 17: 5, 18: 3, 19: 1}
+DURATION_HOURS = [1, 2, 3, 4]
+DURATION_WEIGHTS = [35, 35, 20, 10]
+RATING_WEIGHTS = [3, 5, 15, 37, 40]  # 1..5 stars
+
+CANCEL_RATE = 0.05
+RATING_RATE = 0.30
+DAMAGE_RATE = 0.01
+RESERVATION_RATE = 0.04
+FUTURE_DAYS = 14  # days of upcoming bookings after --end-date
+
+LOCATION_PLACES = [
+    ('Lake Shore', 'America/Chicago'), ('San Diego', 'America/Los_Angeles'),
+    ('Miami', 'America/New_York'), ('Wrightsville Beach', 'America/New_York'),
+    ('Santa Cruz', 'America/Los_Angeles'), ('Outer Banks', 'America/New_York'),
+    ('North Shore', 'Pacific/Honolulu'), ('Galveston', 'America/Chicago'),
+    ('Huntington Beach', 'America/Los_Angeles'), ('Cocoa Beach', 'America/New_York'),
+]
+BRANDS = ['Beginner Friendly', 'West Coast', 'Island Style', 'Pro Series', 'Great Lakes', 'Beach Life']
+SIZES = ["7'6", "8'0", "8'6", "9'0", "9'6", "10'0"]
+FIRST_NAMES = ['Alex', 'Sam', 'Jordan', 'Taylor', 'Casey', 'Riley', 'Morgan', 'Jamie', 'Kai', 'Noa']
+LAST_NAMES = ['Rivera', 'Nguyen', 'Smith', 'Kahale', 'Garcia', 'Brown', 'Lee', 'Patel', 'Moore', 'Kim']
+
+
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description='Generate a large synthetic dataset')
+    parser.add_argument('--locations', type=int, default=5, help='Number of locations')
+    parser.add_argument('--boards-per-location', type=int, default=200, help='Boards at each location')
+    parser.add_argument('--users-per-location', type=int, default=400, help='Users at each location')
+    parser.add_argument('--days', type=int, default=365, help='Days of history before --end-date')
+    parser.add_argument('--daily-rate', type=float, default=2.0,
+                        help='Checkouts per board per day at peak season on a weekday')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    parser.add_argument('--end-date', type=date.fromisoformat, default=date.today(),
+                        help='"Now" for the history, YYYY-MM-DD (default: today)')
+    parser.add_argument('--chunk-size', type=int, default=10000, help='Rows per insert transaction')
+    parser.add_argument('--database-uri', help='Target database (default: SQLALCHEMY_DATABASE_URI, '
+                                               'else a SQLite file in the temp directory)')
+    parser.add_argument('--drop', action='store_true', help='Drop and recreate all tables first')
+    return parser.parse_args()
+
+
+args = parse_args()
+# Must be set before the app config is imported
+os.environ['SQLALCHEMY_DATABASE_URI'] = (
+    args.database_uri or os.environ.get('SQLALCHEMY_DATABASE_URI') or DEFAULT_DATABASE_URI
+)
+
+from sqlalchemy import insert, update, bindparam
+from werkzeug.security import generate_password_hash
+from app import create_app
+from database import db
+from models import (
+    Location, User, Board, Checkout, Reservation, ActivityLog, DamageReport, BoardRating
+)
+from utils.constants import (
+    DAMAGE_SEVERITY_MINOR, DAMAGE_SEVERITY_MODERATE, DAMAGE_SEVERITY_SEVERE,
+    BOARD_CONDITION_EXCELLENT, BOARD_CONDITION_GOOD, BOARD_CONDITION_FAIR
+)
+
+# Insert order within a flush (parents before children)
+HISTORY_TABLES = [Checkout, Reservation, BoardRating, DamageReport, ActivityLog]
+
+
+class DatasetGenerator:
+    """
+    Generates each board's history day by day and buffers the rows,
+    flushing them with executemany INSERTs every chunk_size rows.
+    Bookings on a board never overlap, as in the real app.
+    """
+
+    def __init__(self, options):
+        self.options = options
+        self.rng = random.Random(options.seed)
+        self.now = datetime.combine(options.end_date, datetime.min.time())
+        self.password_hash = generate_password_hash('password')
+        self.buffers = {model: [] for model in HISTORY_TABLES}
+        self.buffered = 0
+        self.counts = {model.__tablename__: 0 for model in [Location, User, Board] + HISTORY_TABLES}
+        self.hours = list(HOURLY_DEMAND)
+        self.hour_weights = list(HOURLY_DEMAND.values())
+
+    def new_id(self):
+        """Reproducible UUID from the seeded generator"""
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+    def poisson(self, rate):
+        """Number of events for a Poisson rate (Knuth's method; rates here are small)"""
+        limit = math.exp(-rate)
+        count, product = 0, self.rng.random()
+        while product > limit:
+            count += 1
+            product *= self.rng.random()
+        return count
+
+    def insert_now(self, model, rows):
+        """Insert rows in chunk_size transactions"""
+        for start in range(0, len(rows), self.options.chunk_size):
+            db.session.execute(insert(model.__table__), rows[start:start + self.options.chunk_size])
+            db.session.commit()
+        self.counts[model.__tablename__] += len(rows)
+
+    def add(self, model, row):
+        """Buffer a history row, flushing when the buffers are full"""
+        self.buffers[model].append(row)
+        self.buffered += 1
+        if self.buffered >= self.options.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """Write all buffered history rows in one transaction"""
+        for model in HISTORY_TABLES:
+            rows = self.buffers[model]
+            if rows:
+                db.session.execute(insert(model.__table__), rows)
+                self.counts[model.__tablename__] += len(rows)
+                self.buffers[model] = []
+        db.session.commit()
+        self.buffered = 0
+
+    def log(self, user_id, board_id, action_type, details, location_id, timestamp):
+        """Buffer an activity log row"""
+        self.add(ActivityLog, {
+            'id': self.new_id(),
+            'user_id': user_id,
+            'board_id': board_id,
+            'action_type': action_type,
+            'action_details': json.dumps(details),
+            'location_id': location_id,
+            'timestamp': timestamp,
+            'ip_address': f'10.{self.rng.randrange(256)}.{self.rng.randrange(256)}.{self.rng.randrange(1, 255)}'
+        })
+
+    def create_locations(self):
+        """
+        Insert the locations
+        Returns: List of (location_id, name, timezone)
+        """
+        locations = []
+        for i in range(self.options.locations):
+            place, tz = LOCATION_PLACES[i % len(LOCATION_PLACES)]
+            name = f'{place} Location' if i < len(LOCATION_PLACES) else f'{place} Location {i // len(LOCATION_PLACES) + 1}'
+            locations.append((self.new_id(), name, tz))
+        created = self.now - timedelta(days=self.options.days + 30)
+        self.insert_now(Location, [
+            {'id': location_id, 'name': name, 'timezone': tz, 'address': f'{i + 1} Beach Road',
+             'created_at': created, 'updated_at': created}
+            for i, (location_id, name, tz) in enumerate(locations)
+        ])
+        return locations
+
+    def create_users(self, location_id, location_index):
+        """
+        Insert a location's users (one admin first)
+        Returns: (user IDs, cumulative weights) - a few regulars book most often
+        """
+        slug = f'location{location_index + 1}'
+        created = self.now - timedelta(days=self.options.days + 30)
+        rows = []
+        for n in range(self.options.users_per_location):
+            is_admin = n == 0
+            rows.append({
+                'id': self.new_id(),
+                'email': f'admin@{slug}.example.com' if is_admin else f'surfer{n}@{slug}.example.com',
+                'full_name': f'{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}',
+                'password_hash': self.password_hash,
+                'location_id': location_id,
+                'role': 'admin' if is_admin else 'user',
+                'created_at': created,
+                'updated_at': created
+            })
+        self.insert_now(User, rows)
+        user_ids = [row['id'] for row in rows[1:]] or [rows[0]['id']]
+        cumulative, total = [], 0.0
+        for rank in range(len(user_ids)):
+            total += 1.0 / (rank + 1) ** 0.8
+            cumulative.append(total)
+        return user_ids, cumulative
+
+    def create_boards(self, location_id):
+        """
+        Insert a location's boards
+        Returns: List of board IDs
+        """
+        created = self.now - timedelta(days=self.options.days + 30)
+        rows = [{
+            'id': self.new_id(),
+            'location_id': location_id,
+            'name': f'{self.rng.choice(BRANDS)} #{n + 1}',
+            'brand': self.rng.choice(BRANDS),
+            'size': self.rng.choice(SIZES),
+            'image_url': None,
+            'status': Board.STATUS_AVAILABLE,
+            'condition': self.rng.choice([BOARD_CONDITION_EXCELLENT, BOARD_CONDITION_GOOD, BOARD_CONDITION_FAIR]),
+            'rating_sum': 0,
+            'rating_count': 0,
+            'version': 1,
+            'created_at': created,
+            'updated_at': created
+        } for n in range(self.options.boards_per_location)]
+        self.insert_now(Board, rows)
+        return [row['id'] for row in rows]
+
+    def pick_user(self, user_ids, cumulative):
+        """Pick a user, weighted towards the regulars"""
+        index = bisect.bisect_left(cumulative, self.rng.random() * cumulative[-1])
+        return user_ids[min(index, len(user_ids) - 1)]
+
+    def board_history(self, board_id, location_id, tz, user_ids, cumulative):
+        """
+        Generate one board's checkouts and everything that hangs off them
+        Returns: Dict of the board's final status and rating totals
+        """
+        zone = ZoneInfo(tz)
+        board = {'status': Board.STATUS_AVAILABLE, 'rating_sum': 0, 'rating_count': 0}
+        booked_until = None
+        first_day = self.options.end_date - timedelta(days=self.options.days)
+        for offset in range(self.options.days + FUTURE_DAYS):
+            day = first_day + timedelta(days=offset)
+            rate = self.options.daily_rate * SEASONAL_DEMAND[day.month - 1]
+            if day.weekday() >= 5:
+                rate *= WEEKEND_DEMAND
+            count = self.poisson(rate)
+            if not count:
+                continue
+            for hour in sorted(self.rng.choices(self.hours, weights=self.hour_weights, k=count)):
+                local_start = datetime(day.year, day.month, day.day, hour, self.rng.choice((0, 15, 30, 45)), tzinfo=zone)
+                start = local_start.astimezone(timezone.utc).replace(tzinfo=None)
+                if booked_until and start < booked_until:
+                    continue
+                duration = self.rng.choices(DURATION_HOURS, weights=DURATION_WEIGHTS)[0]
+                end = start + timedelta(hours=duration)
+                booked_until = end
+                self.add_checkout(board, board_id, location_id, local_start, start, end,
+                                  user_ids, cumulative)
+        return board
+
+    def add_checkout(self, board, board_id, location_id, local_start, start, end, user_ids, cumulative):
+        """Buffer a checkout with its logs, and maybe a rating, damage report and reservation"""
+        checkout_id = self.new_id()
+        user_id = self.pick_user(user_ids, cumulative)
+        created = start - timedelta(hours=self.rng.uniform(0.5, 72))
+        status, actual_return, updated = Checkout.STATUS_ACTIVE, None, created
+        if end <= self.now:
+            if self.rng.random() < CANCEL_RATE:
+                status = Checkout.STATUS_CANCELLED
+                updated = created + (start - created) * self.rng.random()
+            else:
+                status = Checkout.STATUS_RETURNED
+                actual_return = max(start + timedelta(minutes=10),
+                                    end + timedelta(minutes=self.rng.gauss(0, 15)))
+                updated = actual_return
+        elif start <= self.now:
+            board['status'] = Board.STATUS_CHECKED_OUT
+
+        self.add(Checkout, {
+            'id': checkout_id,
+            'user_id': user_id,
+            'board_id': board_id,
+            'checkout_time': start,
+            'expected_return_time': end,
+            'actual_return_time': actual_return,
+            'status': status,
+            'created_at': created,
+            'updated_at': updated,
+            'version': 1 if status == Checkout.STATUS_ACTIVE else 2
+        })
+        self.log(user_id, board_id, ActivityLog.ACTION_CHECKOUT, {
+            'checkout_id': checkout_id,
+            'expected_return_time': end.isoformat(),
+            'is_weekend': local_start.weekday() >= 5,
+            'location_id': location_id,
+            'duration_hours': int((end - start).total_seconds() // 3600)
+        }, location_id, created)
+
+        if status == Checkout.STATUS_CANCELLED:
+            self.log(user_id, board_id, ActivityLog.ACTION_CANCEL_CHECKOUT,
+                     {'checkout_id': checkout_id}, location_id, updated)
+        elif status == Checkout.STATUS_RETURNED:
+            self.add_return(board, board_id, location_id, checkout_id, user_id, actual_return)
+
+        if len(user_ids) > 1 and self.rng.random() < RESERVATION_RATE:
+            self.add_reservation(board_id, location_id, checkout_id, user_id, status, created, start, end,
+                                 user_ids, cumulative)
+
+    def add_return(self, board, board_id, location_id, checkout_id, user_id, returned_at):
+        """Buffer a return log, and maybe a rating and a damage report"""
+        damaged = self.rng.random() < DAMAGE_RATE
+        self.log(user_id, board_id, ActivityLog.ACTION_RETURN, {
+            'checkout_id': checkout_id,
+            'return_time': returned_at.isoformat(),
+            'has_damage': damaged
+        }, location_id, returned_at)
+
+        if self.rng.random() < RATING_RATE:
+            rating = self.rng.choices(range(1, 6), weights=RATING_WEIGHTS)[0]
+            self.add(BoardRating, {
+                'id': self.new_id(), 'board_id': board_id, 'user_id': user_id, 'checkout_id': checkout_id,
+                'rating': rating, 'review': None, 'created_at': returned_at, 'updated_at': returned_at
+            })
+            board['rating_sum'] += rating
+            board['rating_count'] += 1
+
+        if damaged:
+            # Older reports have been dealt with; recent ones are still open
+            age = self.now - returned_at
+            if age > timedelta(days=14):
+                status = DamageReport.STATUS_REPLACED
+            elif age > timedelta(days=3):
+                status = DamageReport.STATUS_IN_REPAIR
+            else:
+                status = DamageReport.STATUS_NEW
+            severity = self.rng.choices(
+                [DAMAGE_SEVERITY_MINOR, DAMAGE_SEVERITY_MODERATE, DAMAGE_SEVERITY_SEVERE], weights=[60, 30, 10]
+            )[0]
+            damage_id = self.new_id()
+            self.add(DamageReport, {
+                'id': damage_id, 'checkout_id': checkout_id, 'board_id': board_id, 'reported_by': user_id,
+                'description': 'Ding on the rail', 'severity': severity, 'status': status,
+                'admin_notes': None, 'created_at': returned_at, 'updated_at': returned_at
+            })
+            self.log(user_id, board_id, ActivityLog.ACTION_DAMAGE_REPORT, {
+                'checkout_id': checkout_id, 'damage_report_id': damage_id, 'severity': severity
+            }, location_id, returned_at)
+            if status == DamageReport.STATUS_NEW:
+                board['status'] = Board.STATUS_DAMAGED
+            elif status == DamageReport.STATUS_IN_REPAIR:
+                board['status'] = Board.STATUS_IN_REPAIR
+            else:
+                board['status'] = Board.STATUS_AVAILABLE
+
+    def add_reservation(self, board_id, location_id, checkout_id, checkout_user_id, checkout_status,
+                        created, start, end, user_ids, cumulative):
+        """Buffer another user's reservation for when a checkout ends"""
+        user_id = self.pick_user(user_ids, cumulative)
+        if user_id == checkout_user_id:
+            return
+        reserved_at = created + (start - created) * self.rng.random()
+        if checkout_status == Checkout.STATUS_CANCELLED:
+            status = Reservation.STATUS_CANCELLED
+        elif end <= self.now:
+            status = Reservation.STATUS_FULFILLED
+        else:
+            status = Reservation.STATUS_PENDING
+        self.add(Reservation, {
+            'id': self.new_id(), 'user_id': user_id, 'board_id': board_id, 'checkout_id': checkout_id,
+            'reservation_time': reserved_at, 'unlock_time': end, 'status': status,
+            'notification_sent': status == Reservation.STATUS_FULFILLED,
+            'created_at': reserved_at, 'updated_at': reserved_at, 'version': 1
+        })
+        self.log(user_id, board_id, ActivityLog.ACTION_RESERVATION, {
+            'checkout_id': checkout_id, 'unlock_time': end.isoformat()
+        }, location_id, reserved_at)
+
+    def update_boards(self, boards):
+        """Write each board's final status and rating totals (executemany UPDATE)"""
+        statement = (
+            update(Board.__table__)
+            .where(Board.__table__.c.id == bindparam('b_id'))
+            .values(status=bindparam('u_status'), rating_sum=bindparam('u_rating_sum'),
+                    rating_count=bindparam('u_rating_count'), updated_at=self.now)
+        )
+        rows = [{'b_id': board_id, 'u_status': board['status'], 'u_rating_sum': board['rating_sum'],
+                 'u_rating_count': board['rating_count']} for board_id, board in boards.items()]
+        for start in range(0, len(rows), self.options.chunk_size):
+            db.session.execute(statement, rows[start:start + self.options.chunk_size])
+            db.session.commit()
+
+    def generate(self):
+        """Generate and write the whole dataset"""
+        for location_index, (location_id, name, tz) in enumerate(self.create_locations()):
+            user_ids, cumulative = self.create_users(location_id, location_index)
+            boards = {}
+            for board_id in self.create_boards(location_id):
+                boards[board_id] = self.board_history(board_id, location_id, tz, user_ids, cumulative)
+            self.flush()
+            self.update_boards(boards)
+            print(f"  ✓ {name}: {len(boards)} boards, {len(user_ids) + 1} users "
+                  f"({self.counts['checkouts']:,} checkouts so far)")
+
+
+def main():
+    """Generate the dataset and report row counts and speed"""
+    app = create_app()
+    with app.app_context():
+        if args.drop:
+            db.drop_all()
+            db.create_all()
+        elif Location.query.first() is not None:
+            print("✗ Target database already has data (use --drop to replace it)")
+            return 1
+
+        print(f"Generating into {db.engine.url.render_as_string(hide_password=True)} (seed {args.seed})")
+        started = time.perf_counter()
+        generator = DatasetGenerator(args)
+        generator.generate()
+        elapsed = time.perf_counter() - started
+
+    total = sum(generator.counts.values())
+    print(f"\n✓ {total:,} rows in {elapsed:.1f}s ({total / elapsed:,.0f} rows/sec)")
+    for table, count in generator.counts.items():
+        print(f"  - {table}: {count:,}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -12,7 +12,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from app import create_app
 from database import db
 from models import Location, Board
-import uuid
+from services.bulk_import_service import BulkImportService
 
 
 def load_company_data():
@@ -59,17 +59,9 @@ def load_company_data():
             },
         ]
 
-        created_locations = []
-        for data in location_data:
-            existing_location = Location.query.filter_by(name=data["name"]).first()
-            if not existing_location:
-                location = Location(id=str(uuid.uuid4()), **data)
-                location.save()
-                created_locations.append(location)
-                print(f"✓ Created: {location.name}")
-            else:
-                created_locations.append(existing_location)
-                print(f"✓ Location already exists: {existing_location.name}")
+        import_service = BulkImportService()
+        summary = import_service.import_locations(enumerate(location_data, start=1))
+        print(f"✓ Locations: {summary['inserted']} created, {summary['updated']} already existed")
 
         # Board data organized by location theme with local surfboard images
         # Images are stored in static/img/ as surfboard_1.webp, surfboard_2.jpg, etc.
@@ -251,33 +243,19 @@ def load_company_data():
             ],
         }
 
-        # Assign boards to locations
-        total_boards = 0
+        # Assign images in order and import all boards in one chunked upsert
+        board_records = []
         image_index = 0
-        for location in created_locations:
-            location_boards = boards_by_location.get(location.name, [])
-            if location_boards:
-                for board_data in location_boards:
-                    # Add image URL if available
-                    if image_paths and image_index < len(image_paths):
-                        board_data["image_url"] = image_paths[image_index]
-                        image_index += 1
-                    
-                    # Check if board already exists to prevent duplicates
-                    existing_board = Board.query.filter_by(
-                        name=board_data["name"], location_id=location.id
-                    ).first()
-                    if not existing_board:
-                        board = Board(
-                            id=str(uuid.uuid4()), location_id=location.id, **board_data
-                        )
-                        board.save()
-                        total_boards += 1
-                        print(f"  ✓ Created board: {board.name} at {location.name}")
-                    else:
-                        print(
-                            f"  ✓ Board already exists: {existing_board.name} at {location.name}"
-                        )
+        for location_name, location_boards in boards_by_location.items():
+            for board_data in location_boards:
+                # Add image URL if available
+                if image_paths and image_index < len(image_paths):
+                    board_data["image_url"] = image_paths[image_index]
+                    image_index += 1
+                board_records.append({"location": location_name, **board_data})
+
+        summary = import_service.import_boards(enumerate(board_records, start=1))
+        print(f"✓ Boards: {summary['inserted']} created, {summary['updated']} already existed")
 
         print(f"\n✓ Company data loaded successfully!")
         print(f"\nDatabase now contains:")
@@ -0,0 +1,159 @@
+"""
+Check that item pages run a fixed number of SQL queries
+Seeds a throwaway SQLite database with a few items, counts the queries each
+page runs, then adds many more items and checks the counts did not grow.
+Also checks out a 1-board cart and a 20-board cart and compares their counts.
+Exits with status 1 if any page's query count grows with the number of items.
+"""
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Use a throwaway database (must be set before the app config is imported)
+db_dir = tempfile.mkdtemp()
+os.environ['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(db_dir, 'profile.db')}"
+
+from sqlalchemy import event
+from werkzeug.security import generate_password_hash
+from app import create_app
+from database import db
+from models import Location, User, Board, Checkout, Reservation, DamageReport
+from utils.constants import USER_ROLE_ADMIN
+
+USER_PAGES = ['/dashboard', '/my-checkouts']
+ADMIN_PAGES = ['/admin/dashboard', '/admin/checkout-schedule']
+CART_CHECKOUT = '/cart/checkout'
+CART_SIZES = (1, 20)
+PASSWORD = 'profile-password'
+
+
+def seed_items(location, user, admin, count):
+    """Add count boards, each with a checkout, a reservation and a damage report"""
+    now = datetime.utcnow()
+    boards = [Board(location_id=location.id, name=f'Board {i}') for i in range(count)]
+    db.session.add_all(boards)
+    db.session.flush()
+    for i, board in enumerate(boards):
+        # Alternate between in-use and scheduled checkouts
+        start = now - timedelta(hours=1) if i % 2 else now + timedelta(days=1, hours=i)
+        checkout = Checkout(user_id=user.id, board_id=board.id, checkout_time=start,
+                            expected_return_time=start + timedelta(hours=3))
+        db.session.add(checkout)
+        db.session.flush()
+        db.session.add(Reservation(user_id=user.id, board_id=board.id, checkout_id=checkout.id,
+                                   unlock_time=checkout.expected_return_time))
+        db.session.add(DamageReport(board_id=board.id, checkout_id=checkout.id,
+                                    reported_by=admin.id, description='Ding'))
+    db.session.commit()
+
+
+def expect_status(response, status, what):
+    """Fail loudly if a setup request did not do what the profile relies on"""
+    if response.status_code != status:
+        raise Exception(f'{what} returned {response.status_code}, expected {status}')
+    return response
+
+
+def log_in(client, email):
+    """Log out whoever is logged in and log in as email"""
+    client.get('/logout')
+    expect_status(client.post('/login', data={'email': email, 'password': PASSWORD}), 302, 'login')
+
+
+def count_queries(client, email, pages):
+    """Log in and count the SQL statements each page runs"""
+    log_in(client, email)
+    counts = {}
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db.engine
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        for page in pages:
+            # Warm up process-wide caches (e.g. the location registry) first
+            client.get(page)
+            statements.clear()
+            response = client.get(page)
+            if response.status_code != 200:
+                raise Exception(f'{page} returned {response.status_code}')
+            counts[page] = len(statements)
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+    return counts
+
+
+def count_cart_checkout(client, email, location, board_ids, days_ahead):
+    """Log in, fill the cart with the boards and count the SQL statements the checkout runs"""
+    log_in(client, email)
+    expect_status(client.post('/switch-location', json={'location_id': location.id}), 200, 'switch-location')
+    checkout_date = (datetime.utcnow() + timedelta(days=days_ahead)).strftime('%Y-%m-%d')
+    for board_id in board_ids:
+        response = client.post(f'/cart/add/{board_id}', json={'checkout_date': checkout_date,
+                                                              'checkout_hour': 9, 'duration_hours': 2})
+        expect_status(response, 200, 'cart add')
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db.engine
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        response = client.post(CART_CHECKOUT)
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+    expect_status(response, 200, CART_CHECKOUT)
+    if len(response.get_json()['checkouts']) != len(board_ids):
+        raise Exception(f"{CART_CHECKOUT} skipped items: {response.get_json()['errors']}")
+    return len(statements)
+
+
+def main():
+    """Compare query counts for few and many items"""
+    app = create_app()
+    app.config['WTF_CSRF_ENABLED'] = False
+    # Measure the admin dashboard's queries, not its short-lived stats cache
+    from routes.admin_routes import admin_stats_service
+    admin_stats_service.ttl_seconds = 0
+    client = app.test_client()
+
+    with app.app_context():
+        location = Location(name='Profile Beach', timezone='America/Chicago')
+        location.save()
+        user = User(email='profile-user@example.com', full_name='Profile User',
+                    location_id=location.id, password_hash=generate_password_hash(PASSWORD))
+        admin = User(email='profile-admin@example.com', full_name='Profile Admin',
+                     location_id=location.id, role=USER_ROLE_ADMIN,
+                     password_hash=generate_password_hash(PASSWORD))
+        db.session.add_all([user, admin])
+        db.session.commit()
+
+        results = []
+        for days_ahead, (count, cart_size) in enumerate(zip((2, 40), CART_SIZES), start=30):
+            seed_items(location, user, admin, count)
+            counts = count_queries(client, user.email, USER_PAGES)
+            counts.update(count_queries(client, admin.email, ADMIN_PAGES))
+            board_ids = [board.id for board in Board.query.filter_by(location_id=location.id).limit(cart_size)]
+            counts[CART_CHECKOUT] = count_cart_checkout(client, user.email, location, board_ids, days_ahead)
+            results.append(counts)
+
+    failed = False
+    print(f"{'Page':<28}{'few items':>10}{'many items':>12}")
+    for page in USER_PAGES + ADMIN_PAGES + [CART_CHECKOUT]:
+        few, many = results[0][page], results[1][page]
+        marker = '' if many <= few else '  <-- grows with items'
+        failed = failed or many > few
+        print(f"{page:<28}{few:>10}{many:>12}{marker}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
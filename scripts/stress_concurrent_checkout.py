@@ -0,0 +1,131 @@
+"""
+Stress test concurrent checkouts of a single board
+Starts many threads that each try to check out the same board at the same
+moment (each with its own app context and database session) and checks that
+exactly one of them wins and exactly one active checkout is written.
+Repeats for several rounds, returning the board in between.
+Exits with status 1 if any round has more or fewer than one winner, or if
+any losing thread fails with anything other than a lost-race error.
+
+Uses a throwaway SQLite database unless SQLALCHEMY_DATABASE_URI is set.
+
+Usage:
+    python scripts/stress_concurrent_checkout.py [--threads 32] [--rounds 20]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+from collections import Counter
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Use a throwaway database (must be set before the app config is imported)
+if not os.environ.get('SQLALCHEMY_DATABASE_URI'):
+    db_dir = tempfile.mkdtemp()
+    os.environ['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(db_dir, 'stress.db')}"
+
+from app import create_app
+from database import db
+from models import Location, User, Board, Checkout
+from services.checkout_service import CheckoutService
+from utils.constants import ERROR_BOARD_NOT_AVAILABLE, ERROR_BOARD_ALREADY_CHECKED_OUT
+
+# The errors a thread that lost the race is expected to get
+LOST_RACE_ERRORS = {ERROR_BOARD_NOT_AVAILABLE, ERROR_BOARD_ALREADY_CHECKED_OUT}
+
+
+def seed(user_count):
+    """Add a location, one board and user_count users"""
+    location = Location(name='Stress Beach', timezone='America/Chicago')
+    location.save()
+    board = Board(location_id=location.id, name='Contested Board')
+    users = [
+        User(email=f'stress-{i}@example.com', full_name=f'Stress User {i}',
+             location_id=location.id, password_hash='x')
+        for i in range(user_count)
+    ]
+    db.session.add(board)
+    db.session.add_all(users)
+    db.session.commit()
+    return location.id, board.id, [user.id for user in users]
+
+
+def run_round(app, service, location_id, board_id, user_ids):
+    """
+    Fire one checkout per user at the same board at the same time
+    Returns: (winning checkout IDs, Counter of error messages)
+    """
+    barrier = threading.Barrier(len(user_ids))
+    lock = threading.Lock()
+    winners = []
+    errors = Counter()
+
+    def attempt(user_id):
+        with app.app_context():
+            barrier.wait()
+            try:
+                checkout = service.checkout_board(user_id, board_id, location_id)
+                with lock:
+                    winners.append(checkout.id)
+            except Exception as e:
+                with lock:
+                    errors[str(e)] += 1
+            finally:
+                db.session.remove()
+
+    threads = [threading.Thread(target=attempt, args=(user_id,)) for user_id in user_ids]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return winners, errors
+
+
+def main():
+    """Run the rounds and report the winners"""
+    parser = argparse.ArgumentParser(description='Stress test concurrent checkouts of one board')
+    parser.add_argument('--threads', type=int, default=32, help='Simultaneous checkouts per round')
+    parser.add_argument('--rounds', type=int, default=20, help='Number of rounds')
+    args = parser.parse_args()
+
+    app = create_app()
+    service = CheckoutService()
+    with app.app_context():
+        location_id, board_id, user_ids = seed(args.threads)
+        backend = db.engine.url.get_backend_name()
+
+    failed = False
+    all_errors = Counter()
+    for round_number in range(1, args.rounds + 1):
+        winners, errors = run_round(app, service, location_id, board_id, user_ids)
+        all_errors.update(errors)
+
+        with app.app_context():
+            active = Checkout.query.filter_by(board_id=board_id, status=Checkout.STATUS_ACTIVE).all()
+            if len(winners) != 1 or len(active) != 1:
+                failed = True
+                print(f"Round {round_number}: {len(winners)} winners, {len(active)} active checkouts")
+            # Return the board for the next round
+            for checkout in active:
+                service.return_board(checkout.id, checkout.user_id, location_id)
+            db.session.remove()
+
+    unexpected = sum(count for message, count in all_errors.items() if message not in LOST_RACE_ERRORS)
+    failed = failed or unexpected > 0
+
+    print(f"{args.rounds} rounds x {args.threads} threads on {backend}")
+    print(f"  result: {'FAILED' if failed else 'exactly one winner every round'}")
+    for message, count in all_errors.most_common():
+        marker = '' if message in LOST_RACE_ERRORS else '  <-- unexpected'
+        print(f"  {count:6} x {message}{marker}")
+    if unexpected:
+        print(f"  {unexpected} attempts failed with errors other than losing the race")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
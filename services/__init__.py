@@ -5,6 +5,7 @@ from .checkout_service import CheckoutService
 from .reservation_service import ReservationService
 from .notification_service import NotificationService
 from .reporting_service import ReportingService
+from .availability_service import AvailabilityService
 
 __all__ = [
     'AuthService',
@@ -12,5 +13,6 @@ __all__ = [
     'CheckoutService',
     'ReservationService',
     'NotificationService',
-    'ReportingService'
+    'ReportingService',
+    'AvailabilityService'
 ]
@@ -0,0 +1,118 @@
+"""Admin stats service - Cached counters and recent activity for the admin dashboard"""
+import threading
+import time
+from sqlalchemy import select, func
+from database import db
+from models.board import Board
+from models.checkout import Checkout
+from models.damage_report import DamageReport
+from models.user import User
+from utils.constants import ADMIN_STATS_CACHE_SECONDS
+import logging
+
+logger = logging.getLogger(__name__)
+
+RECENT_CHECKOUT_LIMIT = 10
+
+
+class AdminStatsService:
+    """
+    Service for the admin dashboard numbers. Board status counts come from
+    one GROUP BY query, recent checkouts and new damage reports have board and
+    user names joined in, and the result is cached per location for
+    ttl_seconds because admins keep the page open and refresh it all day.
+    Cached values are plain dicts, never ORM instances, so they can be shared
+    between requests.
+    """
+
+    def __init__(self, ttl_seconds=ADMIN_STATS_CACHE_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._cache = {}
+
+    def get_status_counts(self, location_id):
+        """
+        Count boards per status at a location (one query)
+        Returns: Dict of status -> count
+        """
+        rows = db.session.execute(
+            select(Board.status, func.count(Board.id))
+            .where(Board.location_id == location_id)
+            .group_by(Board.status)
+        )
+        return {status: count for status, count in rows}
+
+    def get_recent_checkouts(self, location_id, limit=RECENT_CHECKOUT_LIMIT):
+        """
+        Most recent checkouts at a location with board and user names (one query)
+        Returns: List of dicts
+        """
+        rows = db.session.execute(
+            select(
+                Checkout.id, Checkout.board_id, Board.name.label('board_name'),
+                Checkout.user_id, User.full_name.label('user_name'),
+                Checkout.checkout_time, Checkout.expected_return_time, Checkout.status
+            )
+            .join(Board, Board.id == Checkout.board_id)
+            .outerjoin(User, User.id == Checkout.user_id)
+            .where(Board.location_id == location_id)
+            .order_by(Checkout.checkout_time.desc())
+            .limit(limit)
+        )
+        return [dict(row._mapping) for row in rows]
+
+    def get_new_damage(self, location_id):
+        """
+        New damage reports at a location with board names (one query)
+        Returns: List of dicts
+        """
+        rows = db.session.execute(
+            select(
+                DamageReport.id, DamageReport.board_id, Board.name.label('board_name'),
+                DamageReport.severity, DamageReport.description, DamageReport.created_at
+            )
+            .join(Board, Board.id == DamageReport.board_id)
+            .where(
+                Board.location_id == location_id,
+                DamageReport.status == DamageReport.STATUS_NEW
+            )
+            .order_by(DamageReport.created_at.desc())
+        )
+        return [dict(row._mapping) for row in rows]
+
+    def _load(self, location_id):
+        """Build the dashboard stats for a location"""
+        status_counts = self.get_status_counts(location_id)
+        return {
+            'status_counts': status_counts,
+            'available_count': status_counts.get(Board.STATUS_AVAILABLE, 0),
+            'checked_out_count': status_counts.get(Board.STATUS_CHECKED_OUT, 0),
+            'damaged_count': status_counts.get(Board.STATUS_DAMAGED, 0),
+            'recent_checkouts': self.get_recent_checkouts(location_id),
+            'new_damage': self.get_new_damage(location_id),
+        }
+
+    def get_dashboard_stats(self, location_id):
+        """
+        Get the admin dashboard stats for a location (cached for ttl_seconds)
+        Returns: Dict with status_counts, available_count, checked_out_count,
+        damaged_count, recent_checkouts and new_damage
+        """
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cache.get(location_id)
+        if cached and now - cached[0] < self.ttl_seconds:
+            return cached[1]
+
+        stats = self._load(location_id)
+        with self._lock:
+            self._cache[location_id] = (now, stats)
+        return stats
+
+    def invalidate(self, location_id=None):
+        """Drop cached stats for a location (or all locations)"""
+        with self._lock:
+            if location_id is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(location_id, None)
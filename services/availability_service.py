@@ -0,0 +1,220 @@
+"""Availability service - Set-based board availability checks"""
+from datetime import datetime, timedelta
+import pytz
+from sqlalchemy import select, union, union_all, literal
+from database import db
+from models.board import Board
+from models.checkout import Checkout
+from models.reservation import Reservation
+from services.occupancy_index import (
+    occupancy_index, load_board_occupancy, checkout_range, reservation_range, BoardOccupancy
+)
+from services.timezone_service import TimezoneService
+from utils.constants import AVAILABILITY_REASON_RESERVED, RESERVATION_HOLD_HOURS
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class AvailabilityService:
+    """
+    Service for computing board availability for many boards at once.
+    Uses the same overlap rules as Board.is_available_at_datetime, but answers
+    for every requested board with a single query instead of two per board.
+    Checks are answered from the in-memory occupancy index when it is
+    loaded, so the common dashboard/cart path only reads the index's
+    one-row freshness stamp from the database.
+    """
+
+    def __init__(self, index=None, timezone_service=None):
+        self.index = index or occupancy_index
+        self.timezone_service = timezone_service or TimezoneService()
+
+    def _get_window(self, checkout_datetime, duration_hours):
+        """Get the (start, end) window as naive UTC datetimes"""
+        # Database times are naive UTC, so strip timezone info for comparison
+        if checkout_datetime.tzinfo is not None:
+            checkout_start = checkout_datetime.replace(tzinfo=None)
+        else:
+            checkout_start = checkout_datetime
+        return checkout_start, checkout_start + timedelta(hours=duration_hours)
+
+    def _busy_board_ids(self, board_filter, checkout_start, checkout_end):
+        """
+        Get IDs of boards that are busy during the window
+        board_filter is either a list of board IDs or a select() of board IDs
+        """
+        # Active checkouts (scheduled and in-use) that overlap the window
+        checkout_conflicts = select(Checkout.board_id).where(
+            Checkout.board_id.in_(board_filter),
+            Checkout.status == Checkout.STATUS_ACTIVE,
+            Checkout.checkout_time < checkout_end,
+            Checkout.expected_return_time > checkout_start
+        )
+
+        # Pending/available reservations hold the board from their unlock time
+        reservation_conflicts = select(Reservation.board_id).where(
+            Reservation.board_id.in_(board_filter),
+            Reservation.status.in_([Reservation.STATUS_PENDING, Reservation.STATUS_AVAILABLE]),
+            Reservation.unlock_time < checkout_end,
+            Reservation.unlock_time > checkout_start - timedelta(hours=RESERVATION_HOLD_HOURS)
+        )
+
+        result = db.session.execute(union(checkout_conflicts, reservation_conflicts))
+        return {row[0] for row in result}
+
+    def load_window_occupancy(self, board_ids, window_start, window_end):
+        """
+        Load the booked times of the given boards that overlap a window (one query)
+        Returns: Dict of board_id -> BoardOccupancy
+        """
+        checkouts = select(
+            literal('checkout').label('kind'), Checkout.id, Checkout.board_id,
+            Checkout.checkout_time.label('start'), Checkout.expected_return_time.label('end')
+        ).where(
+            Checkout.board_id.in_(board_ids),
+            Checkout.status == Checkout.STATUS_ACTIVE,
+            Checkout.checkout_time < window_end,
+            Checkout.expected_return_time > window_start
+        )
+        reservations = select(
+            literal('reservation').label('kind'), Reservation.id, Reservation.board_id,
+            Reservation.unlock_time.label('start'), Reservation.unlock_time.label('end')
+        ).where(
+            Reservation.board_id.in_(board_ids),
+            Reservation.status.in_([Reservation.STATUS_PENDING, Reservation.STATUS_AVAILABLE]),
+            Reservation.unlock_time < window_end,
+            Reservation.unlock_time > window_start - timedelta(hours=RESERVATION_HOLD_HOURS)
+        )
+
+        occupancy = {}
+        for kind, booking_id, board_id, start, end in db.session.execute(union_all(checkouts, reservations)):
+            if kind == 'checkout':
+                start, end = checkout_range(start, end)
+            else:
+                start, end = reservation_range(start)
+            occupancy.setdefault(board_id, BoardOccupancy()).add_booking((kind, booking_id), start, end)
+        return occupancy
+
+    def check_boards(self, board_ids, checkout_datetime, duration_hours=1):
+        """
+        Check availability of several boards at a datetime for the given duration
+        Returns: Dict of board_id -> (is_available, reason)
+        """
+        board_ids = list(board_ids)
+        if not board_ids:
+            return {}
+
+        if self.index.can_answer():
+            return {
+                board_id: self.index.check(board_id, checkout_datetime, duration_hours)
+                for board_id in board_ids
+            }
+
+        checkout_start, checkout_end = self._get_window(checkout_datetime, duration_hours)
+        busy = self._busy_board_ids(board_ids, checkout_start, checkout_end)
+
+        return {
+            board_id: (False, AVAILABILITY_REASON_RESERVED) if board_id in busy else (True, None)
+            for board_id in board_ids
+        }
+
+    def check_board(self, board_id, checkout_datetime, duration_hours=1):
+        """
+        Check availability of a single board
+        Returns: (is_available, reason)
+        """
+        return self.check_boards([board_id], checkout_datetime, duration_hours)[board_id]
+
+    def check_location(self, location_id, checkout_datetime, duration_hours=1, boards=None):
+        """
+        Check availability of every board at a location
+        Pass boards if they are already loaded to avoid listing them again
+        Returns: Dict of board_id -> (is_available, reason)
+        """
+        if boards is None:
+            board_ids = db.session.execute(
+                select(Board.id).where(Board.location_id == location_id)
+            ).scalars().all()
+        else:
+            board_ids = [board.id for board in boards]
+        if not board_ids:
+            return {}
+
+        if self.index.can_answer():
+            return {
+                board_id: self.index.check(board_id, checkout_datetime, duration_hours)
+                for board_id in board_ids
+            }
+
+        checkout_start, checkout_end = self._get_window(checkout_datetime, duration_hours)
+        location_boards = select(Board.id).where(Board.location_id == location_id)
+        busy = self._busy_board_ids(location_boards, checkout_start, checkout_end)
+
+        return {
+            board_id: (False, AVAILABILITY_REASON_RESERVED) if board_id in busy else (True, None)
+            for board_id in board_ids
+        }
+
+    def get_next_free(self, board_ids, after, duration_hours=1):
+        """
+        Earliest on-the-hour start at or after `after` when each board is free
+        for duration_hours (e.g. to suggest a time for unavailable boards)
+        Returns: Dict of board_id -> naive UTC datetime
+        """
+        board_ids = list(board_ids)
+        if not board_ids:
+            return {}
+
+        if self.index.can_answer():
+            return {
+                board_id: self.index.next_free(board_id, after, duration_hours)
+                for board_id in board_ids
+            }
+
+        after = self._get_window(after, 0)[0]
+        duration = timedelta(hours=duration_hours)
+        occupancy = load_board_occupancy(board_ids)
+        return {
+            board_id: (occupancy.get(board_id) or BoardOccupancy()).next_free(after, duration)
+            for board_id in board_ids
+        }
+
+    def get_day_matrix(self, location_id, local_date, duration_hours=1, boards=None):
+        """
+        Availability of every board at a location for each start hour of a local date
+        Cell [board][hour] matches Board.is_available_at_datetime for that local hour
+        Without the occupancy index, the whole day is one query
+        Returns: Dict of board_id -> list of 24 booleans (index = local start hour)
+        """
+        if boards is None:
+            boards = Board.find_by_location(location_id)
+        matrix = {board.id: [] for board in boards}
+        if not boards:
+            return matrix
+
+        tz = self.timezone_service.get_location_timezone(location_id)
+        day_start = datetime(local_date.year, local_date.month, local_date.day)
+        hour_starts = [
+            tz.localize(day_start + timedelta(hours=hour)).astimezone(pytz.UTC).replace(tzinfo=None)
+            for hour in range(24)
+        ]
+
+        if self.index.can_answer():
+            for board in boards:
+                matrix[board.id] = [
+                    self.index.check(board.id, start, duration_hours)[0] for start in hour_starts
+                ]
+            return matrix
+
+        # One query for every booking that touches the day, then test each hour in memory
+        duration = timedelta(hours=duration_hours)
+        occupancy = self.load_window_occupancy(
+            [board.id for board in boards], min(hour_starts), max(hour_starts) + duration
+        )
+        for board in boards:
+            board_occupancy = occupancy.get(board.id) or BoardOccupancy()
+            matrix[board.id] = [
+                not board_occupancy.overlaps(start, start + duration) for start in hour_starts
+            ]
+        return matrix
@@ -0,0 +1,85 @@
+"""Background executor - Runs post-commit side effects off the request path"""
+import queue
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundExecutor:
+    """
+    Small in-process worker pool with a bounded queue, for side effects that
+    should not hold up the HTTP response (emails, Socket.IO fan-out,
+    reservation promotion). Each task runs in its own app context, so it gets
+    its own database session; pass IDs to tasks, not model instances.
+    When the queue is full the task runs in the caller's thread instead, so
+    work is never dropped and memory stays bounded under load.
+    Tasks are lost if the process exits before they run.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.max_workers = 0
+        self._queue = None
+        self._threads = []
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """Configure from the app (BACKGROUND_WORKERS, BACKGROUND_QUEUE_SIZE)"""
+        self.app = app
+        self.max_workers = app.config.get('BACKGROUND_WORKERS', 2)
+        self._queue = queue.Queue(maxsize=app.config.get('BACKGROUND_QUEUE_SIZE', 1000))
+
+    def _start_workers(self):
+        """Start the worker threads on first use"""
+        with self._lock:
+            self._threads = [thread for thread in self._threads if thread.is_alive()]
+            for i in range(len(self._threads), self.max_workers):
+                thread = threading.Thread(target=self._work, name=f'background-{i}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _work(self):
+        """Worker loop: run queued tasks forever"""
+        while True:
+            fn, args, kwargs = self._queue.get()
+            try:
+                self._run(fn, args, kwargs)
+            finally:
+                self._queue.task_done()
+
+    def _run(self, fn, args, kwargs):
+        """Run one task in a fresh app context, logging (not raising) errors"""
+        try:
+            with self.app.app_context():
+                fn(*args, **kwargs)
+        except Exception as e:
+            logger.error(f"Background task {getattr(fn, '__name__', fn)} failed: {e}")
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        Queue a task to run in the background
+        Returns: True if queued, False if it ran in the caller's thread
+        """
+        if self.app is None or self.max_workers <= 0:
+            # Not configured (e.g. a script) - run it now
+            fn(*args, **kwargs)
+            return False
+        if len(self._threads) < self.max_workers:
+            self._start_workers()
+        try:
+            self._queue.put_nowait((fn, args, kwargs))
+            return True
+        except queue.Full:
+            logger.warning(f"Background queue full, running {getattr(fn, '__name__', fn)} inline")
+            self._run(fn, args, kwargs)
+            return False
+
+    def wait_until_idle(self):
+        """Block until every queued task has finished (for scripts and shutdown)"""
+        if self._queue is not None:
+            self._queue.join()
+
+
+# Shared by all requests in this process (configured in create_app)
+background_executor = BackgroundExecutor()
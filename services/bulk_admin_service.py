@@ -0,0 +1,191 @@
+"""Bulk admin service - Applies one admin action to many boards or damage reports at once"""
+import json
+import uuid
+from datetime import datetime
+from sqlalchemy import select, insert, update
+from database import db, unit_of_work
+from models.board import Board
+from models.damage_report import DamageReport
+from models.activity_log import ActivityLog
+from utils.constants import (
+    BULK_ADMIN_MAX_IDS, BULK_BOARD_STATUSES,
+    ERROR_BULK_NO_IDS, ERROR_BULK_TOO_MANY_IDS, ERROR_INVALID_BOARD_STATUS,
+    ERROR_INVALID_DAMAGE_STATUS, ERROR_BOARD_NOT_FOUND, ERROR_BOARD_IS_CHECKED_OUT,
+    ERROR_DAMAGE_REPORT_NOT_FOUND
+)
+import logging
+
+logger = logging.getLogger(__name__)
+
+DAMAGE_STATUSES = [DamageReport.STATUS_NEW, DamageReport.STATUS_IN_REPAIR, DamageReport.STATUS_REPLACED]
+
+
+class BulkAdminService:
+    """
+    Service for admin actions on a batch of boards or damage reports (e.g.
+    after a storm). Each call is one transaction: one query to load the rows,
+    one set-based UPDATE, and one bulk INSERT of activity logs, however many
+    ids are given. Only rows at the admin's location are touched.
+    Each call returns a dict of updated ids, unchanged ids (already in the
+    requested state) and per-id errors.
+    """
+
+    def _validate_ids(self, ids):
+        """
+        De-duplicate and check the size of a list of ids
+        Returns: List of ids in the order given
+        """
+        ids = list(dict.fromkeys(str(id_) for id_ in (ids or []) if id_))
+        if not ids:
+            raise Exception(ERROR_BULK_NO_IDS)
+        if len(ids) > BULK_ADMIN_MAX_IDS:
+            raise Exception(ERROR_BULK_TOO_MANY_IDS)
+        return ids
+
+    def _log_rows(self, user_id, action_type, location_id, ip_address, entries):
+        """
+        Build activity log rows for a bulk INSERT
+        entries is a list of (board_id, action_details) pairs
+        """
+        now = datetime.utcnow()
+        return [{
+            'id': str(uuid.uuid4()),
+            'user_id': user_id,
+            'board_id': board_id,
+            'action_type': action_type,
+            'action_details': json.dumps(details),
+            'location_id': location_id,
+            'timestamp': now,
+            'ip_address': ip_address
+        } for board_id, details in entries]
+
+    def set_board_status(self, board_ids, new_status, location_id, user_id, ip_address=None):
+        """
+        Set the status of many boards at a location in one UPDATE
+        Checked-out boards are skipped (their status follows the checkout)
+        Returns: Dict with 'updated', 'unchanged' and 'errors'
+        """
+        if new_status not in BULK_BOARD_STATUSES:
+            raise Exception(ERROR_INVALID_BOARD_STATUS)
+        board_ids = self._validate_ids(board_ids)
+
+        with unit_of_work():
+            old_statuses = dict(db.session.execute(
+                select(Board.id, Board.status)
+                .where(Board.id.in_(board_ids), Board.location_id == location_id)
+            ).all())
+
+            errors = []
+            unchanged = []
+            to_update = []
+            for board_id in board_ids:
+                status = old_statuses.get(board_id)
+                if status is None:
+                    errors.append({'id': board_id, 'error': ERROR_BOARD_NOT_FOUND})
+                elif status == Board.STATUS_CHECKED_OUT:
+                    errors.append({'id': board_id, 'error': ERROR_BOARD_IS_CHECKED_OUT})
+                elif status == new_status:
+                    unchanged.append(board_id)
+                else:
+                    to_update.append(board_id)
+
+            updated = []
+            if to_update:
+                # Re-check the status in the UPDATE: a board checked out since the SELECT is left alone
+                updated_set = set(db.session.execute(
+                    update(Board)
+                    .where(Board.id.in_(to_update), Board.status != Board.STATUS_CHECKED_OUT)
+                    .values(status=new_status, updated_at=datetime.utcnow(), version=Board.version + 1)
+                    .returning(Board.id)
+                    .execution_options(synchronize_session='fetch')
+                ).scalars())
+                for board_id in to_update:
+                    if board_id in updated_set:
+                        updated.append(board_id)
+                    else:
+                        errors.append({'id': board_id, 'error': ERROR_BOARD_IS_CHECKED_OUT})
+
+            if updated:
+                db.session.execute(insert(ActivityLog), self._log_rows(
+                    user_id, ActivityLog.ACTION_BOARD_STATUS_CHANGE, location_id, ip_address,
+                    [(board_id, {'old_status': old_statuses[board_id], 'new_status': new_status, 'bulk': True})
+                     for board_id in updated]
+                ))
+
+        logger.info(f"Set {len(updated)} boards to {new_status} at location {location_id}")
+        return {'updated': updated, 'unchanged': unchanged, 'errors': errors}
+
+    def retire_boards(self, board_ids, location_id, user_id, ip_address=None):
+        """
+        Take many boards out of service (status replaced)
+        Returns: Dict with 'updated', 'unchanged' and 'errors'
+        """
+        return self.set_board_status(board_ids, Board.STATUS_REPLACED, location_id, user_id, ip_address)
+
+    def transition_damage_reports(self, report_ids, new_status, location_id, user_id,
+                                  admin_notes=None, ip_address=None):
+        """
+        Move many damage reports at a location to a new status in one UPDATE
+        Reports moved to replaced make their boards available again (one more UPDATE)
+        Returns: Dict with 'updated', 'unchanged', 'errors' and 'boards'
+                 (board_id -> new status for boards that changed)
+        """
+        if new_status not in DAMAGE_STATUSES:
+            raise Exception(ERROR_INVALID_DAMAGE_STATUS)
+        report_ids = self._validate_ids(report_ids)
+
+        with unit_of_work():
+            reports = {
+                report_id: (board_id, status)
+                for report_id, board_id, status in db.session.execute(
+                    select(DamageReport.id, DamageReport.board_id, DamageReport.status)
+                    .join(Board, Board.id == DamageReport.board_id)
+                    .where(DamageReport.id.in_(report_ids), Board.location_id == location_id)
+                )
+            }
+
+            errors = []
+            unchanged = []
+            updated = []
+            for report_id in report_ids:
+                if report_id not in reports:
+                    errors.append({'id': report_id, 'error': ERROR_DAMAGE_REPORT_NOT_FOUND})
+                elif reports[report_id][1] == new_status and not admin_notes:
+                    unchanged.append(report_id)
+                else:
+                    updated.append(report_id)
+
+            boards = {}
+            if updated:
+                values = {'status': new_status, 'updated_at': datetime.utcnow()}
+                if admin_notes:
+                    values['admin_notes'] = admin_notes
+                db.session.execute(
+                    update(DamageReport)
+                    .where(DamageReport.id.in_(updated))
+                    .values(**values)
+                    .execution_options(synchronize_session='fetch')
+                )
+
+                if new_status == DamageReport.STATUS_REPLACED:
+                    board_ids = {reports[report_id][0] for report_id in updated}
+                    boards = {board_id: Board.STATUS_AVAILABLE for board_id in db.session.execute(
+                        update(Board)
+                        .where(Board.id.in_(board_ids),
+                               Board.status.notin_([Board.STATUS_AVAILABLE, Board.STATUS_CHECKED_OUT]))
+                        .values(status=Board.STATUS_AVAILABLE, updated_at=datetime.utcnow(),
+                                version=Board.version + 1)
+                        .returning(Board.id)
+                        .execution_options(synchronize_session='fetch')
+                    ).scalars()}
+
+                db.session.execute(insert(ActivityLog), self._log_rows(
+                    user_id, ActivityLog.ACTION_DAMAGE_STATUS_CHANGE, location_id, ip_address,
+                    [(reports[report_id][0], {'damage_report_id': report_id,
+                                              'old_status': reports[report_id][1],
+                                              'new_status': new_status, 'bulk': True})
+                     for report_id in updated]
+                ))
+
+        logger.info(f"Moved {len(updated)} damage reports to {new_status} at location {location_id}")
+        return {'updated': updated, 'unchanged': unchanged, 'errors': errors, 'boards': boards}
@@ -0,0 +1,154 @@
+"""Bulk checkout service - Checks out many cart items in one set-based transaction"""
+import json
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import select, insert, update
+from database import db, unit_of_work, after_commit
+from models.board import Board
+from models.checkout import Checkout
+from models.activity_log import ActivityLog
+from services.availability_service import AvailabilityService
+from services.occupancy_index import occupancy_index, checkout_range, BoardOccupancy
+from utils.constants import AVAILABILITY_REASON_RESERVED, AVAILABILITY_REASON_IN_CART
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class BulkCheckoutService:
+    """
+    Service for checking out a whole cart at once. The work is the same
+    handful of statements however many items there are, all in one
+    transaction: one UPDATE that locks the boards and a query for their
+    names, one query for the bookings that overlap the cart's time span,
+    then bulk INSERTs for the checkouts and activity logs and one UPDATE
+    for the board statuses.
+    Conflicts are checked against the database inside the transaction (the
+    board rows stay locked until commit), so two carts can't book the same
+    board and time.
+    IDs are generated up front, so nothing is refreshed after the commit.
+    """
+
+    def __init__(self, availability_service=None):
+        self.availability_service = availability_service or AvailabilityService()
+
+    def _lock_boards(self, board_ids):
+        """
+        Lock the given boards' rows until commit, then load their names
+        The lock is a no-op UPDATE: a row lock on Postgres, and on SQLite it
+        starts the write transaction, so the conflict check that follows
+        can't interleave with another cart's
+        Returns: Dict of board_id -> name
+        """
+        board_ids = {board_id for board_id in board_ids if board_id}
+        if not board_ids:
+            return {}
+        db.session.execute(
+            update(Board)
+            .where(Board.id.in_(board_ids))
+            .values(version=Board.version)
+            .execution_options(synchronize_session=False)
+        )
+        rows = db.session.execute(select(Board.id, Board.name).where(Board.id.in_(board_ids)))
+        return {board_id: name for board_id, name in rows}
+
+    def checkout_items(self, user_id, items, ip_address=None):
+        """
+        Check out many bookings for a user in one transaction
+        items is a list of dicts with board_id, location_id, duration_hours,
+        checkout_datetime_local and checkout_datetime_utc
+        Items that are not available (including ones that overlap an earlier
+        item for the same board) are skipped with an error message
+        Returns: (list of Checkout objects, list of error messages)
+        """
+        errors = []
+        now = datetime.utcnow()
+        checkouts = []
+        checkout_rows = []
+        log_rows = []
+        with unit_of_work():
+            board_names = self._lock_boards(item['board_id'] for item in items)
+            ranges = [
+                checkout_range(item['checkout_datetime_utc'],
+                               item['checkout_datetime_utc'] + timedelta(hours=item['duration_hours']))
+                for item in items
+            ]
+            # Bookings already in the database that touch the cart's time span (one query)
+            booked = self.availability_service.load_window_occupancy(
+                list(board_names), min(start for start, _ in ranges), max(end for _, end in ranges)
+            ) if board_names else {}
+            # Bookings accepted so far in this batch, so one cart can't double-book a board
+            batch_occupancy = {}
+
+            for item, (start, end) in zip(items, ranges):
+                board_id = item['board_id']
+                duration_hours = item['duration_hours']
+                board_name = board_names.get(board_id)
+                if board_name is None:
+                    errors.append("Board not found")
+                    continue
+
+                occupancy = batch_occupancy.setdefault(board_id, BoardOccupancy())
+                if board_id in booked and booked[board_id].overlaps(start, end):
+                    errors.append(f"Board {board_name} is {AVAILABILITY_REASON_RESERVED} at that time")
+                    continue
+                if occupancy.overlaps(start, end):
+                    errors.append(f"Board {board_name} is {AVAILABILITY_REASON_IN_CART} at that time")
+                    continue
+
+                checkout = Checkout(
+                    id=str(uuid.uuid4()),
+                    user_id=user_id,
+                    board_id=board_id,
+                    checkout_time=start,
+                    expected_return_time=end,
+                    status=Checkout.STATUS_ACTIVE,
+                    created_at=now,
+                    updated_at=now
+                )
+                occupancy.add_booking(('checkout', checkout.id), start, end)
+                checkouts.append(checkout)
+                checkout_rows.append({
+                    'id': checkout.id,
+                    'user_id': user_id,
+                    'board_id': board_id,
+                    'checkout_time': checkout.checkout_time,
+                    'expected_return_time': checkout.expected_return_time,
+                    'status': checkout.status,
+                    'created_at': now,
+                    'updated_at': now,
+                    'version': 1
+                })
+                log_rows.append({
+                    'id': str(uuid.uuid4()),
+                    'user_id': user_id,
+                    'board_id': board_id,
+                    'action_type': ActivityLog.ACTION_CHECKOUT,
+                    'action_details': json.dumps({
+                        'checkout_id': checkout.id,
+                        'expected_return_time': checkout.expected_return_time.isoformat(),
+                        'is_weekend': item['checkout_datetime_local'].weekday() >= 5,
+                        'location_id': item['location_id'],
+                        'duration_hours': duration_hours
+                    }),
+                    'location_id': item['location_id'],
+                    'timestamp': now,
+                    'ip_address': ip_address
+                })
+
+            if not checkouts:
+                return [], errors
+
+            db.session.execute(insert(Checkout), checkout_rows)
+            db.session.execute(insert(ActivityLog), log_rows)
+            db.session.execute(
+                update(Board)
+                .where(Board.id.in_({checkout.board_id for checkout in checkouts}))
+                .values(status=Board.STATUS_CHECKED_OUT, updated_at=now, version=Board.version + 1)
+                .execution_options(synchronize_session='fetch')
+            )
+            for checkout in checkouts:
+                after_commit(lambda checkout=checkout: occupancy_index.sync_checkout(checkout))
+
+        logger.info(f"Checked out {len(checkouts)} boards for user {user_id}")
+        return checkouts, errors
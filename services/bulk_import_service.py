@@ -0,0 +1,297 @@
+"""Bulk import service - Streams locations and boards from CSV / JSONL files into the database"""
+import csv
+import json
+import os
+import time
+import uuid
+from datetime import datetime
+from itertools import islice
+from sqlalchemy import select, insert, update, bindparam, func, case
+from database import db, unit_of_work, after_commit
+from models.location import Location
+from models.board import Board
+from utils.constants import (
+    IMPORT_CHUNK_SIZE, IMPORT_MAX_ERRORS_REPORTED, BOARD_CONDITIONS,
+    BOARD_STATUS_AVAILABLE, BOARD_STATUS_CHECKED_OUT, BOARD_STATUS_DAMAGED, BOARD_STATUS_IN_REPAIR, BOARD_STATUS_REPLACED,
+    BOARD_CONDITION_GOOD, ERROR_IMPORT_UNKNOWN_FORMAT, ERROR_IMPORT_INVALID_RECORD, ERROR_IMPORT_MISSING_NAME,
+    ERROR_IMPORT_UNKNOWN_LOCATION, ERROR_INVALID_BOARD_STATUS, ERROR_INVALID_BOARD_CONDITION
+)
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Statuses an import may set (checked_out only comes from a checkout)
+IMPORT_BOARD_STATUSES = [BOARD_STATUS_AVAILABLE, BOARD_STATUS_DAMAGED, BOARD_STATUS_IN_REPAIR, BOARD_STATUS_REPLACED]
+DEFAULT_LOCATION_TIMEZONE = Location.__table__.c.timezone.default.arg
+
+locations_table = Location.__table__
+boards_table = Board.__table__
+
+# Upserts of existing rows: fields missing from the record (None) keep their value
+UPDATE_LOCATION = (
+    update(locations_table)
+    .where(locations_table.c.id == bindparam('b_id'))
+    .values(
+        timezone=func.coalesce(bindparam('u_timezone'), locations_table.c.timezone),
+        address=func.coalesce(bindparam('u_address'), locations_table.c.address),
+        updated_at=bindparam('u_updated_at')
+    )
+)
+UPDATE_BOARD = (
+    update(boards_table)
+    .where(boards_table.c.id == bindparam('b_id'))
+    .values(
+        brand=func.coalesce(bindparam('u_brand'), boards_table.c.brand),
+        size=func.coalesce(bindparam('u_size'), boards_table.c.size),
+        image_url=func.coalesce(bindparam('u_image_url'), boards_table.c.image_url),
+        # A checked-out board keeps its status until it is returned
+        status=case(
+            (boards_table.c.status == BOARD_STATUS_CHECKED_OUT, boards_table.c.status),
+            else_=func.coalesce(bindparam('u_status'), boards_table.c.status)
+        ),
+        condition=func.coalesce(bindparam('u_condition'), boards_table.c.condition),
+        updated_at=bindparam('u_updated_at'),
+        version=boards_table.c.version + 1
+    )
+)
+
+
+def read_records(path):
+    """
+    Stream records from a .csv (with a header row) or .jsonl file
+    A JSONL line that is not valid JSON is yielded as None, for the import to skip
+    Yields: (line_number, record) pairs, one at a time
+    """
+    suffix = os.path.splitext(path)[1].lower()
+    if suffix not in ('.csv', '.jsonl', '.ndjson'):
+        raise Exception(ERROR_IMPORT_UNKNOWN_FORMAT)
+    with open(path, newline='', encoding='utf-8') as f:
+        if suffix == '.csv':
+            for line_number, row in enumerate(csv.DictReader(f), start=2):
+                yield line_number, row
+        else:
+            for line_number, line in enumerate(f, start=1):
+                if line.strip():
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        record = None
+                    yield line_number, record
+
+
+def _value(record, field):
+    """A record's field as a stripped string, or None if missing or blank"""
+    value = record.get(field)
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _chunks(records, size):
+    """Split an iterator of records into lists of at most size records"""
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class BulkImportService:
+    """
+    Service for loading large fleets of locations and boards. Records are
+    read as a stream and written in chunks: each chunk is one transaction
+    with one executemany INSERT for new rows and one executemany UPDATE for
+    existing ones, whatever the chunk size.
+    Rows are matched on natural keys (location name; board name within its
+    location) using maps loaded up front - one query for all locations and
+    one per location for its boards - so there are no per-row lookups.
+    Re-importing the same file updates rows instead of duplicating them.
+    Each import returns a summary dict with counts, the first errors and
+    rows per second.
+    """
+
+    def __init__(self, chunk_size=IMPORT_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self._board_ids = {}
+
+    def _new_summary(self):
+        """Empty import summary"""
+        return {'rows': 0, 'inserted': 0, 'updated': 0, 'skipped': 0, 'errors': [],
+                'started': time.perf_counter()}
+
+    def _finish_summary(self, summary):
+        """Add elapsed seconds and rows per second to a summary"""
+        started = summary.pop('started')
+        summary['seconds'] = time.perf_counter() - started
+        summary['rows_per_second'] = summary['rows'] / summary['seconds'] if summary['seconds'] else 0.0
+        return summary
+
+    def _skip(self, summary, line_number, message):
+        """Count a skipped row, keeping the first few errors for the summary"""
+        summary['skipped'] += 1
+        if len(summary['errors']) < IMPORT_MAX_ERRORS_REPORTED:
+            summary['errors'].append({'line': line_number, 'error': message})
+
+    def _write_chunk(self, table, update_statement, inserts, updates, summary):
+        """Write one chunk of new and existing rows as one transaction"""
+        with unit_of_work():
+            if inserts:
+                db.session.execute(insert(table), inserts)
+            if updates:
+                db.session.execute(update_statement, updates)
+        summary['inserted'] += len(inserts)
+        summary['updated'] += len(updates)
+
+    def _location_ids(self):
+        """
+        Load every location's ID by name (one query)
+        Returns: Dict of name -> location_id
+        """
+        return {name: location_id for location_id, name in db.session.execute(
+            select(locations_table.c.id, locations_table.c.name)
+        )}
+
+    def _board_ids_for(self, location_id):
+        """
+        Load a location's board IDs by name (one query per location per import)
+        Returns: Dict of name -> board_id
+        """
+        if location_id not in self._board_ids:
+            rows = db.session.execute(
+                select(boards_table.c.id, boards_table.c.name)
+                .where(boards_table.c.location_id == location_id)
+            )
+            board_ids = {}
+            for board_id, name in rows:
+                board_ids.setdefault(name, board_id)
+            self._board_ids[location_id] = board_ids
+        return self._board_ids[location_id]
+
+    def import_locations(self, records):
+        """
+        Insert or update locations, matched by name
+        records yields (line_number, dict) with name, timezone and address
+        Returns: Summary dict
+        """
+        summary = self._new_summary()
+        location_ids = self._location_ids()
+        for chunk in _chunks(records, self.chunk_size):
+            now = datetime.utcnow()
+            inserts, updates = [], []
+            for line_number, record in chunk:
+                summary['rows'] += 1
+                if not isinstance(record, dict):
+                    self._skip(summary, line_number, ERROR_IMPORT_INVALID_RECORD)
+                    continue
+                name = _value(record, 'name')
+                if not name:
+                    self._skip(summary, line_number, ERROR_IMPORT_MISSING_NAME)
+                    continue
+                timezone = _value(record, 'timezone')
+                address = _value(record, 'address')
+                if name in location_ids:
+                    updates.append({'b_id': location_ids[name], 'u_timezone': timezone,
+                                    'u_address': address, 'u_updated_at': now})
+                else:
+                    location_ids[name] = str(uuid.uuid4())
+                    inserts.append({
+                        'id': location_ids[name],
+                        'name': name,
+                        'timezone': timezone or DEFAULT_LOCATION_TIMEZONE,
+                        'address': address,
+                        'created_at': now,
+                        'updated_at': now
+                    })
+            self._write_chunk(locations_table, UPDATE_LOCATION, inserts, updates, summary)
+
+        # Make the location registry pick up the new locations
+        from services.location_registry import location_registry
+        after_commit(location_registry.invalidate)
+        return self._finish_summary(summary)
+
+    def import_boards(self, records):
+        """
+        Insert or update boards, matched by name within their location
+        records yields (line_number, dict) with location (name) or location_id,
+        name, brand, size, image_url, status and condition
+        Returns: Summary dict
+        """
+        summary = self._new_summary()
+        location_ids = self._location_ids()
+        known_location_ids = set(location_ids.values())
+        self._board_ids = {}
+        for chunk in _chunks(records, self.chunk_size):
+            now = datetime.utcnow()
+            inserts, updates = [], []
+            for line_number, record in chunk:
+                summary['rows'] += 1
+                if not isinstance(record, dict):
+                    self._skip(summary, line_number, ERROR_IMPORT_INVALID_RECORD)
+                    continue
+                name = _value(record, 'name')
+                if not name:
+                    self._skip(summary, line_number, ERROR_IMPORT_MISSING_NAME)
+                    continue
+                location_id = _value(record, 'location_id')
+                if location_id not in known_location_ids:
+                    location_id = location_ids.get(_value(record, 'location'))
+                if location_id is None:
+                    self._skip(summary, line_number, ERROR_IMPORT_UNKNOWN_LOCATION)
+                    continue
+                status = (_value(record, 'status') or '').lower() or None
+                if status and status not in IMPORT_BOARD_STATUSES:
+                    self._skip(summary, line_number, ERROR_INVALID_BOARD_STATUS)
+                    continue
+                condition = (_value(record, 'condition') or '').lower() or None
+                if condition and condition not in BOARD_CONDITIONS:
+                    self._skip(summary, line_number, ERROR_INVALID_BOARD_CONDITION)
+                    continue
+
+                fields = {field: _value(record, field) for field in ('brand', 'size', 'image_url')}
+                board_ids = self._board_ids_for(location_id)
+                if name in board_ids:
+                    updates.append({
+                        'b_id': board_ids[name],
+                        'u_brand': fields['brand'],
+                        'u_size': fields['size'],
+                        'u_image_url': fields['image_url'],
+                        'u_status': status,
+                        'u_condition': condition,
+                        'u_updated_at': now
+                    })
+                else:
+                    board_ids[name] = str(uuid.uuid4())
+                    inserts.append({
+                        'id': board_ids[name],
+                        'location_id': location_id,
+                        'name': name,
+                        **fields,
+                        'status': status or BOARD_STATUS_AVAILABLE,
+                        'condition': condition or BOARD_CONDITION_GOOD,
+                        'rating_sum': 0,
+                        'rating_count': 0,
+                        'version': 1,
+                        'created_at': now,
+                        'updated_at': now
+                    })
+            self._write_chunk(boards_table, UPDATE_BOARD, inserts, updates, summary)
+
+        self._board_ids = {}
+        return self._finish_summary(summary)
+
+    def import_file(self, path, kind):
+        """
+        Import a locations or boards file (kind is 'locations' or 'boards')
+        Returns: Summary dict
+        """
+        records = read_records(path)
+        if kind == 'locations':
+            summary = self.import_locations(records)
+        else:
+            summary = self.import_boards(records)
+        logger.info(f"Imported {kind} from {path}: {summary['inserted']} inserted, "
+                    f"{summary['updated']} updated, {summary['skipped']} skipped "
+                    f"({summary['rows_per_second']:.0f} rows/sec)")
+        return summary
@@ -0,0 +1,66 @@
+"""Cart service - Batched lookups for cart views and validation"""
+from datetime import datetime, timedelta
+from sqlalchemy import select, union_all
+from database import db
+from models.board import Board
+from models.checkout import Checkout
+from models.reservation import Reservation
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CartService:
+    """
+    Service for resolving cart items and checking cart conflicts with a
+    constant number of queries, however many items are in the cart or how
+    many bookings the user already has.
+    """
+
+    def __init__(self):
+        pass
+
+    def load_boards(self, board_ids):
+        """
+        Load the boards for cart items (one query)
+        Returns: Dict of board_id -> Board
+        """
+        board_ids = {board_id for board_id in board_ids if board_id}
+        if not board_ids:
+            return {}
+        return {board.id: board for board in Board.query.filter(Board.id.in_(board_ids))}
+
+    def find_other_location_booking(self, user_id, location_id, checkout_date):
+        """
+        Find a location (other than location_id) where the user already has an
+        active checkout or a pending/available reservation on checkout_date (one query)
+        Returns: Location ID or None
+        """
+        day_start = datetime(checkout_date.year, checkout_date.month, checkout_date.day)
+        day_end = day_start + timedelta(days=1)
+
+        checkouts = (
+            select(Board.location_id.label('location_id'))
+            .select_from(Checkout)
+            .join(Board, Board.id == Checkout.board_id)
+            .where(
+                Checkout.user_id == user_id,
+                Checkout.status == Checkout.STATUS_ACTIVE,
+                Checkout.checkout_time >= day_start,
+                Checkout.checkout_time < day_end,
+                Board.location_id != location_id
+            )
+        )
+        reservations = (
+            select(Board.location_id.label('location_id'))
+            .select_from(Reservation)
+            .join(Board, Board.id == Reservation.board_id)
+            .where(
+                Reservation.user_id == user_id,
+                Reservation.status.in_([Reservation.STATUS_PENDING, Reservation.STATUS_AVAILABLE]),
+                Reservation.unlock_time >= day_start,
+                Reservation.unlock_time < day_end,
+                Board.location_id != location_id
+            )
+        )
+        return db.session.execute(union_all(checkouts, reservations).limit(1)).scalar()
@@ -0,0 +1,146 @@
+"""Cart store - Server-side cart storage keyed by a cart token"""
+import secrets
+import threading
+import time
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy.orm import Session
+from database import db
+from models.cart import Cart
+from utils.constants import CART_STORE_DATABASE, CART_STORE_MEMORY, CART_TTL_SECONDS
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Seconds between sweeps of expired carts
+PURGE_INTERVAL_SECONDS = 60 * 60
+
+
+def new_cart_token():
+    """Generate a random cart token for the session cookie"""
+    return secrets.token_urlsafe(24)
+
+
+class MemoryCartStore:
+    """
+    Carts kept in this process's memory. Fast, but carts are lost on
+    restart and not shared between worker processes - use it for a single
+    process deployment or local development.
+    """
+
+    def __init__(self, ttl_seconds=CART_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._carts = {}
+        self._last_purge = time.monotonic()
+
+    def get(self, token):
+        """
+        Get the cart items for a token
+        Returns: List of cart items (empty if missing or expired)
+        """
+        with self._lock:
+            entry = self._carts.get(token)
+            if entry is None:
+                return []
+            expires_at, items = entry
+            if expires_at <= time.monotonic():
+                del self._carts[token]
+                return []
+            return list(items)
+
+    def save(self, token, items, user_id=None):
+        """Save the cart items for a token (and extend its expiry)"""
+        now = time.monotonic()
+        with self._lock:
+            self._carts[token] = (now + self.ttl_seconds, list(items))
+            if now - self._last_purge > PURGE_INTERVAL_SECONDS:
+                self._purge(now)
+
+    def delete(self, token):
+        """Delete a cart"""
+        with self._lock:
+            self._carts.pop(token, None)
+
+    def _purge(self, now):
+        """Drop expired carts (caller holds the lock)"""
+        expired = [token for token, (expires_at, _) in self._carts.items() if expires_at <= now]
+        for token in expired:
+            del self._carts[token]
+        self._last_purge = now
+
+
+class DatabaseCartStore:
+    """
+    Carts kept in the carts table, shared by every worker process.
+    Uses its own short session so saving a cart never commits (or expires)
+    whatever the request's session is in the middle of.
+    """
+
+    def __init__(self, ttl_seconds=CART_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._last_purge = time.monotonic()
+
+    def get(self, token):
+        """
+        Get the cart items for a token
+        Returns: List of cart items (empty if missing or expired)
+        """
+        with Session(db.engine) as cart_session:
+            cart = cart_session.get(Cart, token)
+            if cart is None:
+                return []
+            if cart.is_expired():
+                cart_session.delete(cart)
+                cart_session.commit()
+                return []
+            return list(cart.items or [])
+
+    def save(self, token, items, user_id=None):
+        """Save the cart items for a token (and extend its expiry)"""
+        expires_at = datetime.utcnow() + timedelta(seconds=self.ttl_seconds)
+        with Session(db.engine) as cart_session:
+            cart = cart_session.get(Cart, token)
+            if cart is None:
+                cart = Cart(token=token, user_id=user_id)
+                cart_session.add(cart)
+            # Assign a new list so the JSON column is marked as changed
+            cart.items = list(items)
+            cart.expires_at = expires_at
+            cart_session.commit()
+
+            now = time.monotonic()
+            if now - self._last_purge > PURGE_INTERVAL_SECONDS:
+                self._last_purge = now
+                purged = cart_session.query(Cart).filter(
+                    Cart.expires_at <= datetime.utcnow()
+                ).delete(synchronize_session=False)
+                cart_session.commit()
+                if purged:
+                    logger.info(f"Purged {purged} expired carts")
+
+    def delete(self, token):
+        """Delete a cart"""
+        with Session(db.engine) as cart_session:
+            cart_session.query(Cart).filter(Cart.token == token).delete(synchronize_session=False)
+            cart_session.commit()
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_cart_store():
+    """Get the cart store selected by the CART_STORE config setting (one per process)"""
+    kind = current_app.config.get('CART_STORE', CART_STORE_DATABASE)
+    with _stores_lock:
+        store = _stores.get(kind)
+        if store is None:
+            if kind == CART_STORE_MEMORY:
+                store = MemoryCartStore()
+            elif kind == CART_STORE_DATABASE:
+                store = DatabaseCartStore()
+            else:
+                raise Exception(f"Unknown cart store: {kind}")
+            _stores[kind] = store
+    return store
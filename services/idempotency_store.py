@@ -0,0 +1,121 @@
+"""Idempotency store - Stored responses for write requests sent with an Idempotency-Key"""
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from database import db
+from models.idempotency_key import IdempotencyKey
+from utils.constants import IDEMPOTENCY_TTL_SECONDS
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Seconds between sweeps of expired keys
+PURGE_INTERVAL_SECONDS = 60 * 60
+
+
+class IdempotencyStore:
+    """
+    Keys are claimed before the request runs and completed with its response,
+    in the idempotency_keys table so every worker process sees them.
+    Uses its own short sessions so claiming a key commits immediately and
+    never touches the request's transaction.
+    A claim that is not completed within IDEMPOTENCY_LOCK_TIMEOUT_SECONDS
+    is treated as abandoned and a retry takes it over; completing or
+    releasing only touches the row while it still belongs to that claim.
+    """
+
+    def __init__(self, ttl_seconds=IDEMPOTENCY_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._last_purge = time.monotonic()
+
+    def claim(self, user_id, key, request_path):
+        """
+        Claim a key for a new request (one primary key lookup for a retry)
+        An expired key, or one whose request was abandoned mid-way, is taken over
+        Returns: (IdempotencyKey, claimed) - claimed is False if the key was
+                 already in use, and the returned record is the existing one
+        """
+        now = datetime.utcnow()
+        with Session(db.engine, expire_on_commit=False) as key_session:
+            record = key_session.get(IdempotencyKey, (user_id, key))
+            if record is not None:
+                if not (record.is_expired(now) or record.is_abandoned(now)):
+                    return record, False
+                if record.is_abandoned(now):
+                    logger.warning(f"Taking over abandoned idempotency key {key} for user {user_id}")
+                # Conditional on the old claim time, so only one retry takes it over
+                taken = key_session.execute(
+                    update(IdempotencyKey)
+                    .where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key,
+                           IdempotencyKey.created_at == record.created_at)
+                    .values(request_path=request_path, status_code=None, response_body=None,
+                            mimetype=None, created_at=now,
+                            expires_at=now + timedelta(seconds=self.ttl_seconds))
+                ).rowcount
+                key_session.commit()
+                if not taken:
+                    return key_session.get(IdempotencyKey, (user_id, key), populate_existing=True), False
+                self._purge_expired()
+                return record, True
+
+            record = IdempotencyKey(
+                user_id=user_id,
+                key=key,
+                request_path=request_path,
+                expires_at=now + timedelta(seconds=self.ttl_seconds),
+                created_at=now
+            )
+            key_session.add(record)
+            try:
+                key_session.commit()
+            except IntegrityError:
+                # Another request claimed the same key first
+                key_session.rollback()
+                return key_session.get(IdempotencyKey, (user_id, key)), False
+
+        self._purge_expired()
+        return record, True
+
+    def _claimed(self, key_session, record):
+        """Query for a claim's row, only while it is still this claim (not taken over)"""
+        return key_session.query(IdempotencyKey).filter(
+            IdempotencyKey.user_id == record.user_id,
+            IdempotencyKey.key == record.key,
+            IdempotencyKey.created_at == record.created_at
+        )
+
+    def complete(self, record, status_code, response_body, mimetype):
+        """Store the response for a claimed key so retries can replay it"""
+        with Session(db.engine) as key_session:
+            self._claimed(key_session, record).update({
+                IdempotencyKey.status_code: status_code,
+                IdempotencyKey.response_body: response_body,
+                IdempotencyKey.mimetype: mimetype
+            }, synchronize_session=False)
+            key_session.commit()
+
+    def release(self, record):
+        """Drop a claimed key (the request failed, so a retry should run it again)"""
+        with Session(db.engine) as key_session:
+            self._claimed(key_session, record).delete(synchronize_session=False)
+            key_session.commit()
+
+    def _purge_expired(self):
+        """Delete expired keys, at most once per PURGE_INTERVAL_SECONDS"""
+        now = time.monotonic()
+        if now - self._last_purge <= PURGE_INTERVAL_SECONDS:
+            return
+        self._last_purge = now
+        with Session(db.engine) as key_session:
+            purged = key_session.query(IdempotencyKey).filter(
+                IdempotencyKey.expires_at <= datetime.utcnow()
+            ).delete(synchronize_session=False)
+            key_session.commit()
+        if purged:
+            logger.info(f"Purged {purged} expired idempotency keys")
+
+
+# Shared by all requests in this process
+idempotency_store = IdempotencyStore()
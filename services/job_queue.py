@@ -0,0 +1,292 @@
+"""Job queue - Persistent background jobs stored in the jobs table"""
+import os
+import socket
+import threading
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import select, update, delete
+from sqlalchemy.orm import Session
+from database import db, commit_changes, after_commit
+from models.job import Job
+from utils.constants import (
+    JOB_MAX_ATTEMPTS, JOB_RETRY_BASE_SECONDS, JOB_RETRY_MAX_SECONDS,
+    JOB_LOCK_TIMEOUT_SECONDS, JOB_RETENTION_DAYS, JOB_POLL_SECONDS,
+    JOB_HOUSEKEEPING_SECONDS, ERROR_JOB_UNKNOWN
+)
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Job name -> handler function, filled in by @job_handler (see services/jobs.py)
+JOB_HANDLERS = {}
+
+# Due jobs looked at per claim attempt (another worker may win some of them)
+CLAIM_BATCH_SIZE = 10
+
+
+def job_handler(name):
+    """Register a function as the handler for jobs with the given name"""
+    def decorator(fn):
+        JOB_HANDLERS[name] = fn
+        return fn
+    return decorator
+
+
+def retry_delay(attempts):
+    """
+    Backoff before the next attempt of a job that failed
+    Returns: timedelta, doubling from JOB_RETRY_BASE_SECONDS up to JOB_RETRY_MAX_SECONDS
+    """
+    seconds = JOB_RETRY_BASE_SECONDS * (2 ** max(attempts - 1, 0))
+    return timedelta(seconds=min(seconds, JOB_RETRY_MAX_SECONDS))
+
+
+class JobQueue:
+    """
+    Enqueues, claims and finishes jobs. A job is enqueued in the caller's
+    transaction, so it only exists if the change that needed it commits.
+    Claiming and finishing use their own short sessions, so they commit
+    straight away and never touch the session the handler works in.
+    Handlers get the job's payload as keyword arguments; pass IDs, not
+    model instances. A handler that raises is retried with backoff until
+    max_attempts, then the job is marked failed.
+    """
+
+    def enqueue(self, name, run_at=None, max_attempts=JOB_MAX_ATTEMPTS, **payload):
+        """
+        Add a job to run now, or at run_at (UTC)
+        Inside a unit of work the job commits with the rest of the transaction
+        Returns: Job object
+        """
+        job = Job(name=name, payload=payload, run_at=run_at, max_attempts=max_attempts)
+        db.session.add(job)
+        commit_changes()
+        after_commit(job_worker.wake)
+        return job
+
+    def claim_next(self, worker_id):
+        """
+        Claim the next due job for a worker. Each candidate is claimed with a
+        conditional UPDATE, so two workers never run the same job.
+        Returns: Job object (status running), or None if nothing is due
+        """
+        now = datetime.utcnow()
+        with Session(db.engine, expire_on_commit=False) as job_session:
+            candidate_ids = job_session.execute(
+                select(Job.id)
+                .where(Job.status == Job.STATUS_QUEUED, Job.run_at <= now)
+                .order_by(Job.run_at)
+                .limit(CLAIM_BATCH_SIZE)
+            ).scalars().all()
+            for job_id in candidate_ids:
+                result = job_session.execute(
+                    update(Job)
+                    .where(Job.id == job_id, Job.status == Job.STATUS_QUEUED)
+                    .values(status=Job.STATUS_RUNNING, attempts=Job.attempts + 1,
+                            locked_by=worker_id, locked_at=now, updated_at=now)
+                    .execution_options(synchronize_session=False)
+                )
+                if result.rowcount == 1:
+                    job_session.commit()
+                    return job_session.get(Job, job_id)
+            job_session.rollback()
+        return None
+
+    def run(self, job):
+        """
+        Run a claimed job's handler and record the outcome
+        Returns: True if the job succeeded
+        """
+        from services import jobs  # noqa: F401 - registers the handlers
+        try:
+            handler = JOB_HANDLERS.get(job.name)
+            if handler is None:
+                raise Exception(f"{ERROR_JOB_UNKNOWN}: {job.name}")
+            handler(**job.payload)
+        except Exception as e:
+            db.session.rollback()
+            self._fail(job, e)
+            return False
+        self._finish(job, Job.STATUS_SUCCEEDED, values={'last_error': None})
+        return True
+
+    def _fail(self, job, error):
+        """Requeue a failed job with backoff, or mark it failed after its last attempt"""
+        if job.attempts >= job.max_attempts:
+            logger.error(f"Job {job.name} {job.id} failed after {job.attempts} attempts: {error}")
+            self._finish(job, Job.STATUS_FAILED, values={'last_error': str(error)})
+            return
+        run_at = datetime.utcnow() + retry_delay(job.attempts)
+        logger.warning(f"Job {job.name} {job.id} failed (attempt {job.attempts}), retrying at {run_at}: {error}")
+        self._finish(job, Job.STATUS_QUEUED, values={'last_error': str(error), 'run_at': run_at})
+
+    def _finish(self, job, status, values):
+        """Release a job this worker holds, setting its new status"""
+        with Session(db.engine) as job_session:
+            job_session.execute(
+                update(Job)
+                .where(Job.id == job.id, Job.locked_by == job.locked_by)
+                .values(status=status, locked_by=None, locked_at=None,
+                        updated_at=datetime.utcnow(), **values)
+                .execution_options(synchronize_session=False)
+            )
+            job_session.commit()
+        job.status = status
+
+    def requeue_stale(self):
+        """
+        Put back jobs left running longer than JOB_LOCK_TIMEOUT_SECONDS
+        (their worker died); the interrupted attempt still counts
+        Returns: Number of jobs requeued
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=JOB_LOCK_TIMEOUT_SECONDS)
+        with Session(db.engine) as job_session:
+            result = job_session.execute(
+                update(Job)
+                .where(Job.status == Job.STATUS_RUNNING, Job.locked_at < cutoff)
+                .values(status=Job.STATUS_QUEUED, locked_by=None, locked_at=None,
+                        updated_at=datetime.utcnow())
+                .execution_options(synchronize_session=False)
+            )
+            job_session.commit()
+        if result.rowcount:
+            logger.warning(f"Requeued {result.rowcount} stale jobs")
+        return result.rowcount
+
+    def purge_finished(self):
+        """
+        Delete succeeded and failed jobs older than JOB_RETENTION_DAYS
+        Returns: Number of jobs deleted
+        """
+        cutoff = datetime.utcnow() - timedelta(days=JOB_RETENTION_DAYS)
+        with Session(db.engine) as job_session:
+            result = job_session.execute(
+                delete(Job)
+                .where(Job.status.in_([Job.STATUS_SUCCEEDED, Job.STATUS_FAILED]),
+                       Job.updated_at < cutoff)
+                .execution_options(synchronize_session=False)
+            )
+            job_session.commit()
+        if result.rowcount:
+            logger.info(f"Purged {result.rowcount} finished jobs")
+        return result.rowcount
+
+
+class JobWorker:
+    """
+    Pool of threads that claim and run due jobs. Web processes start it on
+    the first enqueue when JOBS_RUN_IN_PROCESS is on; `flask jobs worker`
+    runs it as a dedicated process. Any number of workers, in any number of
+    processes, can share the jobs table.
+    """
+
+    def __init__(self, queue):
+        self.queue = queue
+        self.app = None
+        self.run_in_process = False
+        self.concurrency = 1
+        self.poll_seconds = JOB_POLL_SECONDS
+        self._threads = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._last_housekeeping = 0.0
+
+    def init_app(self, app):
+        """Configure from the app (JOBS_RUN_IN_PROCESS, JOB_WORKERS)"""
+        self.app = app
+        self.run_in_process = app.config.get('JOBS_RUN_IN_PROCESS', True)
+        self.concurrency = app.config.get('JOB_WORKERS', 1)
+
+    def start(self, concurrency=None, poll_seconds=None):
+        """Start the worker threads (no-op for threads already running)"""
+        if concurrency is not None:
+            self.concurrency = concurrency
+        if poll_seconds is not None:
+            self.poll_seconds = poll_seconds
+        with self._lock:
+            self._stopping.clear()
+            self._threads = [thread for thread in self._threads if thread.is_alive()]
+            for i in range(len(self._threads), self.concurrency):
+                thread = threading.Thread(target=self._work, name=f'job-worker-{i}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def wake(self):
+        """Tell idle workers there may be a new job (starting them in-process if configured)"""
+        if self.app is None:
+            return
+        if self.run_in_process and len(self._threads) < self.concurrency:
+            self.start()
+        self._wake.set()
+
+    def stop(self, timeout=None):
+        """Stop the worker threads once their current jobs finish"""
+        self._stopping.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = [thread for thread in self._threads if thread.is_alive()]
+
+    def join(self):
+        """Block until the worker threads stop"""
+        while any(thread.is_alive() for thread in self._threads):
+            for thread in self._threads:
+                thread.join(1)
+
+    def run_once(self, worker_id=None):
+        """
+        Claim and run one due job in the current app context
+        Returns: True if a job ran, False if nothing was due
+        """
+        job = self.queue.claim_next(worker_id or self._worker_id())
+        if job is None:
+            return False
+        self.queue.run(job)
+        return True
+
+    def run_pending(self):
+        """
+        Run due jobs until none are left (for `flask jobs worker --once`)
+        Returns: Number of jobs run
+        """
+        count = 0
+        while True:
+            # Fresh app context (and session) per job
+            with self.app.app_context():
+                if not self.run_once():
+                    return count
+            count += 1
+
+    def _worker_id(self):
+        """Identify this thread in jobs.locked_by"""
+        return f"{socket.gethostname()}:{os.getpid()}:{threading.current_thread().name}"
+
+    def _housekeeping(self):
+        """Requeue stale jobs and purge old ones, at most once per JOB_HOUSEKEEPING_SECONDS per process"""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_housekeeping < JOB_HOUSEKEEPING_SECONDS:
+                return
+            self._last_housekeeping = now
+        self.queue.requeue_stale()
+        self.queue.purge_finished()
+
+    def _work(self):
+        """Worker loop: run due jobs, sleeping until woken or polled when idle"""
+        while not self._stopping.is_set():
+            try:
+                with self.app.app_context():
+                    self._housekeeping()
+                    ran = self.run_once()
+            except Exception as e:
+                logger.error(f"Job worker error: {e}")
+                ran = False
+            if not ran:
+                self._wake.wait(self.poll_seconds)
+                self._wake.clear()
+
+
+# Shared by all requests in this process (configured in create_app)
+job_queue = JobQueue()
+job_worker = JobWorker(job_queue)
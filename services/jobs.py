@@ -0,0 +1,48 @@
+"""Job handlers - Background work run from the jobs table"""
+from services.job_queue import job_handler
+from utils.constants import ERROR_JOB_NOTIFICATION_FAILED
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@job_handler('notify_damage_reported')
+def notify_damage_reported(damage_id, location_id):
+    """Email the location's admins about a damage report"""
+    from models.damage_report import DamageReport
+    from services.notification_service import NotificationService
+    damage = DamageReport.find_by_id(damage_id)
+    if not damage:
+        return
+    notification_service = NotificationService()
+    if not notification_service.notify_damage_reported(damage, location_id) and notification_service.email_enabled:
+        raise Exception(ERROR_JOB_NOTIFICATION_FAILED)
+
+
+@job_handler('notify_reservation_available')
+def notify_reservation_available(reservation_id, location_id):
+    """Email a user that their reserved board is available and push an in-app notification"""
+    from flask import current_app
+    from models.reservation import Reservation
+    from models.board import Board
+    from services.notification_service import NotificationService
+    reservation = Reservation.find_by_id(reservation_id)
+    if not reservation:
+        return
+    notification_service = NotificationService()
+    sent = notification_service.notify_reservation_available(reservation)
+
+    try:
+        socketio = current_app.extensions.get('socketio')
+        board = Board.find_by_id(reservation.board_id)
+        if socketio and board:
+            socketio.emit('notification', {
+                'user_id': reservation.user_id,
+                'message': f'Your reserved board "{board.name}" is now available!',
+                'type': 'success'
+            }, room=f'location_{location_id}')
+    except Exception as e:
+        logger.error(f"Error sending WebSocket notification: {e}")
+
+    if not sent and notification_service.email_enabled:
+        raise Exception(ERROR_JOB_NOTIFICATION_FAILED)
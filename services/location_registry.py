@@ -0,0 +1,102 @@
+"""Location registry - Process-wide in-memory cache of locations"""
+import threading
+import time
+import pytz
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from database import db
+from models.location import Location
+from utils.constants import LOCATION_CACHE_TTL_SECONDS
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class LocationRegistry:
+    """
+    Locations (and their timezones) kept in memory for the whole process.
+    Locations almost never change, so they are loaded once at startup and
+    reloaded after ttl_seconds, or straight away when Location.save
+    invalidates the registry.
+    Cached locations are detached from any session: read them, don't modify
+    them (use Location.find_by_id to get an instance to edit).
+    """
+
+    def __init__(self, ttl_seconds=LOCATION_CACHE_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.RLock()
+        self._locations = []
+        self._by_id = {}
+        self._timezones = {}
+        self._loaded_at = None
+
+    def load(self):
+        """Load all locations from the database"""
+        # Use a separate session so the request's identity map is left untouched,
+        # but read through the request's connection: a reload can happen inside a
+        # unit of work that holds the write lock, and a second pooled connection
+        # would then queue behind the lock (and the pool) the caller is holding
+        with Session(bind=db.session.connection()) as session:
+            locations = session.scalars(select(Location)).all()
+        timezones = {}
+        for location in locations:
+            try:
+                timezones[location.id] = pytz.timezone(location.timezone)
+            except pytz.UnknownTimeZoneError:
+                logger.warning(f"Unknown timezone {location.timezone} for location {location.id}")
+                timezones[location.id] = pytz.UTC
+        with self._lock:
+            self._locations = locations
+            self._by_id = {location.id: location for location in locations}
+            self._timezones = timezones
+            self._loaded_at = time.monotonic()
+        logger.info(f"Location registry loaded: {len(locations)} locations")
+
+    def invalidate(self):
+        """Drop the cached locations so the next lookup reloads them"""
+        with self._lock:
+            self._loaded_at = None
+
+    def _ensure_loaded(self):
+        """Reload if never loaded, invalidated or older than the TTL"""
+        loaded_at = self._loaded_at
+        if loaded_at is None or time.monotonic() - loaded_at > self.ttl_seconds:
+            self.load()
+
+    def find_all(self):
+        """Get all locations"""
+        self._ensure_loaded()
+        return list(self._locations)
+
+    def get(self, location_id):
+        """
+        Get a location by ID
+        Returns: Location or None
+        """
+        if not location_id:
+            return None
+        self._ensure_loaded()
+        location = self._by_id.get(location_id)
+        if location is None and Location.query.get(location_id) is not None:
+            # Created by another process since the last load
+            self.load()
+            location = self._by_id.get(location_id)
+        return location
+
+    def get_first_id(self):
+        """Get the ID of the first location (default when nothing is selected)"""
+        locations = self.find_all()
+        return locations[0].id if locations else None
+
+    def get_timezone(self, location_id):
+        """
+        Get the timezone for a location
+        Returns: pytz timezone (UTC for unknown locations)
+        """
+        if self.get(location_id) is None:
+            return pytz.UTC
+        return self._timezones.get(location_id, pytz.UTC)
+
+
+# Shared registry for the process (loaded in create_app)
+location_registry = LocationRegistry()
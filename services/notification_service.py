@@ -102,10 +102,10 @@ class NotificationService:
         Notify admins when a board is reported as damaged
         """
         from models.damage_report import DamageReport
-        from models.location import Location
+        from services.location_registry import location_registry
         
         board = Board.find_by_id(damage_report.board_id)
-        location = Location.find_by_id(location_id)
+        location = location_registry.get(location_id)
         admins = User.find_admins_by_location(location_id)
         
         if not board or not admins:
@@ -0,0 +1,449 @@
+"""Occupancy index - In-memory booked time ranges and hourly bitmaps per board"""
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from datetime import timedelta
+import threading
+from sqlalchemy import select, func
+from database import db
+from models.checkout import Checkout
+from models.reservation import Reservation
+from utils.constants import (
+    AVAILABILITY_REASON_RESERVED, RESERVATION_HOLD_HOURS, OCCUPANCY_CATCHUP_MARGIN_SECONDS
+)
+import logging
+
+logger = logging.getLogger(__name__)
+
+HOURS_PER_DAY = 24
+HELD_RESERVATION_STATUSES = [Reservation.STATUS_PENDING, Reservation.STATUS_AVAILABLE]
+
+
+def _naive_utc(dt):
+    """Strip timezone info (database times are naive UTC)"""
+    return dt.replace(tzinfo=None) if dt.tzinfo is not None else dt
+
+
+def _hour_number(dt, round_up=False):
+    """Absolute hour number of a datetime (days since 0001-01-01 * 24 + hour)"""
+    hour = dt.toordinal() * HOURS_PER_DAY + dt.hour
+    if round_up and (dt.minute or dt.second or dt.microsecond):
+        hour += 1
+    return hour
+
+
+def _ceil_hour(dt):
+    """Round a datetime up to the next whole hour"""
+    if dt.minute or dt.second or dt.microsecond:
+        return dt.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+    return dt
+
+
+def _day_masks(first_hour, end_hour):
+    """
+    Split the absolute hour range [first_hour, end_hour) into per-day masks
+    Returns: List of (day_ordinal, mask) where bit N is hour N of that UTC day
+    """
+    masks = []
+    hour = first_hour
+    while hour < end_hour:
+        day, start_bit = divmod(hour, HOURS_PER_DAY)
+        end_bit = min(HOURS_PER_DAY, start_bit + (end_hour - hour))
+        masks.append((day, ((1 << end_bit) - 1) ^ ((1 << start_bit) - 1)))
+        hour += end_bit - start_bit
+    return masks
+
+
+def checkout_range(checkout_time, expected_return_time):
+    """Booked (start, end) range of a checkout as naive UTC"""
+    start = _naive_utc(checkout_time)
+    end = _naive_utc(expected_return_time) if expected_return_time else start + timedelta(hours=1)
+    return start, end
+
+
+def reservation_range(unlock_time):
+    """Booked (start, end) range of a reservation: held from its unlock time"""
+    start = _naive_utc(unlock_time)
+    return start, start + timedelta(hours=RESERVATION_HOLD_HOURS)
+
+
+class BoardOccupancy:
+    """
+    Booked time for one board, kept in two views:
+    - sorted, merged (start, end) intervals for O(log n) overlap and
+      next-free-slot queries at any time
+    - one 24-bit mask of touched hours per UTC day in an array, for a
+      single mask test when the query starts on the hour
+    Adding or removing a booking updates only the blocks and day masks it
+    touches.
+    """
+
+    def __init__(self):
+        # Booking key -> (start, end); the views below are derived from it
+        self.bookings = {}
+        # (start, end, key) for every booking, sorted
+        self.sorted_bookings = []
+        self.starts = []
+        self.ends = []
+        self.base_day = None
+        self.masks = array('L')
+
+    def _slot(self, day):
+        """Get the array slot for a day, growing the array as needed"""
+        if self.base_day is None:
+            self.base_day = day
+        if day < self.base_day:
+            self.masks[0:0] = array('L', [0] * (self.base_day - day))
+            self.base_day = day
+        slot = day - self.base_day
+        if slot >= len(self.masks):
+            self.masks.extend([0] * (slot - len(self.masks) + 1))
+        return slot
+
+    def _hours(self, start, end):
+        """Absolute hour range [first, end) touched by a time range"""
+        return _hour_number(start), _hour_number(end, round_up=True)
+
+    def _mark_hours(self, first_hour, end_hour):
+        """Set the bits of the absolute hour range [first_hour, end_hour)"""
+        for day, mask in _day_masks(first_hour, end_hour):
+            self.masks[self._slot(day)] |= mask
+
+    def _clear_hours(self, first_hour, end_hour):
+        """Clear the bits of the absolute hour range [first_hour, end_hour)"""
+        if self.base_day is None:
+            return
+        for day, mask in _day_masks(first_hour, end_hour):
+            slot = day - self.base_day
+            if 0 <= slot < len(self.masks):
+                self.masks[slot] &= ~mask
+
+    def refresh(self):
+        """Rebuild the sorted bookings, merged intervals and hour masks (after a bulk load)"""
+        self.sorted_bookings = sorted((start, end, key) for key, (start, end) in self.bookings.items())
+        self.starts = []
+        self.ends = []
+        self.base_day = None
+        self.masks = array('L')
+        for start, end, _ in self.sorted_bookings:
+            if end <= start:
+                continue
+            if self.ends and start <= self.ends[-1]:
+                # Overlapping or touching the previous block - extend it
+                self.ends[-1] = max(self.ends[-1], end)
+            else:
+                self.starts.append(start)
+                self.ends.append(end)
+        for start, end in zip(self.starts, self.ends):
+            self._mark_hours(*self._hours(start, end))
+
+    def add_booking(self, key, start, end):
+        """Add (or move) a booked time range"""
+        if key in self.bookings:
+            self.remove_booking(key)
+        self.bookings[key] = (start, end)
+        insort(self.sorted_bookings, (start, end, key))
+        if end <= start:
+            return
+        # Merge with the blocks it overlaps or touches: those ending at or
+        # after `start` and starting at or before `end`
+        i = bisect_left(self.ends, start)
+        j = bisect_right(self.starts, end)
+        if i < j:
+            start, end = min(start, self.starts[i]), max(end, self.ends[j - 1])
+        self.starts[i:j] = [start]
+        self.ends[i:j] = [end]
+        self._mark_hours(*self._hours(start, end))
+
+    def remove_booking(self, key):
+        """Remove a booked time range"""
+        booked = self.bookings.pop(key, None)
+        if booked is None:
+            return
+        start, end = booked
+        del self.sorted_bookings[bisect_left(self.sorted_bookings, (start, end, key))]
+        if end <= start:
+            return
+
+        # Re-merge the bookings left in the block that held this one
+        b = bisect_right(self.starts, start) - 1
+        block_start, block_end = self.starts[b], self.ends[b]
+        blocks = []
+        k = bisect_left(self.sorted_bookings, (block_start,))
+        while k < len(self.sorted_bookings) and self.sorted_bookings[k][0] <= block_end:
+            booking_start, booking_end, _ = self.sorted_bookings[k]
+            if booking_end > booking_start:
+                if blocks and booking_start <= blocks[-1][1]:
+                    blocks[-1][1] = max(blocks[-1][1], booking_end)
+                else:
+                    blocks.append([booking_start, booking_end])
+            k += 1
+        self.starts[b:b + 1] = [block[0] for block in blocks]
+        self.ends[b:b + 1] = [block[1] for block in blocks]
+
+        # Redo the masks for the block's hours, including neighbours that share its edge hours
+        first_hour, end_hour = self._hours(block_start, block_end)
+        self._clear_hours(first_hour, end_hour)
+        for n in range(max(0, b - 1), min(len(self.starts), b + len(blocks) + 1)):
+            block_first, block_end_hour = self._hours(self.starts[n], self.ends[n])
+            if block_first < end_hour and block_end_hour > first_hour:
+                self._mark_hours(max(block_first, first_hour), min(block_end_hour, end_hour))
+
+    def overlaps(self, start, end):
+        """Check if [start, end) overlaps any booked block - O(log n)"""
+        # Blocks are disjoint and sorted, so only the last block starting
+        # before `end` can reach past `start`
+        i = bisect_left(self.starts, end)
+        return i > 0 and self.ends[i - 1] > start
+
+    def hours_free(self, first_hour, end_hour):
+        """Check that no booked bit is set in the absolute hour range"""
+        if self.base_day is None:
+            return True
+        for day, mask in _day_masks(first_hour, end_hour):
+            slot = day - self.base_day
+            if 0 <= slot < len(self.masks) and self.masks[slot] & mask:
+                return False
+        return True
+
+    def next_free(self, after, duration, on_the_hour=True):
+        """
+        Earliest start at or after `after` with `duration` of free time
+        With on_the_hour, candidate starts are rounded up to whole hours
+        """
+        candidate = after
+        while True:
+            if on_the_hour:
+                candidate = _ceil_hour(candidate)
+            i = bisect_left(self.starts, candidate + duration)
+            if i == 0 or self.ends[i - 1] <= candidate:
+                return candidate
+            # Jump past the block that gets in the way
+            candidate = self.ends[i - 1]
+
+
+class OccupancyIndex:
+    """
+    Process-wide index of booked time per board (active checkouts, and
+    pending/available reservations which hold a board from their unlock time).
+    Answers "is board X free from T for N hours" and "when is board X next
+    free after T" from memory instead of querying the database.
+    Built from the checkouts/reservations tables at startup and kept up to
+    date by the services that create, return or cancel bookings. Before
+    answering, it compares a fingerprint of the tables (latest updated_at
+    and held row counts) with the one it last saw, and reloads the rows
+    changed since then - so bookings written by other processes or raw SQL
+    are picked up. The database stays the source of truth.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._boards = {}
+        self.stamp = None
+        self.is_loaded = False
+
+    def _board(self, board_id):
+        """Get (or create) the occupancy for a board"""
+        occupancy = self._boards.get(board_id)
+        if occupancy is None:
+            occupancy = self._boards[board_id] = BoardOccupancy()
+        return occupancy
+
+    def rebuild(self):
+        """Load all active checkouts and pending/available reservations"""
+        # Read the stamp first so changes made during the load show up as stale
+        stamp = read_booking_stamp()
+        boards = load_board_occupancy()
+        with self._lock:
+            self._boards = boards
+            self.stamp = stamp
+            self.is_loaded = True
+        booking_count = sum(len(occupancy.bookings) for occupancy in boards.values())
+        logger.info(f"Occupancy index built: {booking_count} bookings on {len(boards)} boards")
+
+    def sync_checkout(self, checkout):
+        """Add an active checkout, or remove it if it is no longer active"""
+        with self._lock:
+            if checkout.status == Checkout.STATUS_ACTIVE:
+                start, end = checkout_range(checkout.checkout_time, checkout.expected_return_time)
+                self._board(checkout.board_id).add_booking(('checkout', checkout.id), start, end)
+            else:
+                self.remove_checkout(checkout)
+
+    def remove_checkout(self, checkout):
+        """Remove a checkout from the index"""
+        with self._lock:
+            occupancy = self._boards.get(checkout.board_id)
+            if occupancy:
+                occupancy.remove_booking(('checkout', checkout.id))
+
+    def sync_reservation(self, reservation):
+        """Add a pending/available reservation, or remove it otherwise"""
+        with self._lock:
+            if reservation.status in HELD_RESERVATION_STATUSES:
+                start, end = reservation_range(reservation.unlock_time)
+                self._board(reservation.board_id).add_booking(('reservation', reservation.id), start, end)
+            else:
+                self.remove_reservation(reservation)
+
+    def remove_reservation(self, reservation):
+        """Remove a reservation from the index"""
+        with self._lock:
+            occupancy = self._boards.get(reservation.board_id)
+            if occupancy:
+                occupancy.remove_booking(('reservation', reservation.id))
+
+    def check(self, board_id, checkout_datetime, duration_hours=1):
+        """
+        Check if a board is free for duration_hours starting at checkout_datetime
+        Returns: (is_available, reason)
+        """
+        start = _naive_utc(checkout_datetime)
+        end = start + timedelta(hours=duration_hours)
+        with self._lock:
+            occupancy = self._boards.get(board_id)
+            if occupancy is None:
+                return True, None
+            if start == _ceil_hour(start):
+                # On the hour: one mask test per day touched
+                is_free = occupancy.hours_free(_hour_number(start), _hour_number(end, round_up=True))
+            else:
+                is_free = not occupancy.overlaps(start, end)
+        if not is_free:
+            return False, AVAILABILITY_REASON_RESERVED
+        return True, None
+
+    def next_free(self, board_id, after, duration_hours=1):
+        """
+        Earliest on-the-hour start at or after `after` when the board is free
+        for duration_hours
+        Returns: Naive UTC datetime
+        """
+        after = _naive_utc(after)
+        with self._lock:
+            occupancy = self._boards.get(board_id)
+            if occupancy is None:
+                return _ceil_hour(after)
+            return occupancy.next_free(after, timedelta(hours=duration_hours))
+
+    def _held_counts(self):
+        """Number of (checkout, reservation) bookings in the index"""
+        counts = {'checkout': 0, 'reservation': 0}
+        for occupancy in self._boards.values():
+            for kind, _ in occupancy.bookings:
+                counts[kind] += 1
+        return counts['checkout'], counts['reservation']
+
+    def catch_up(self, stamp):
+        """
+        Apply bookings changed in the database since the last stamp (one query
+        per table), or rebuild if the held counts still don't match
+        """
+        last_changes = [changed for changed in (self.stamp or ())[0::2] if changed]
+        if not last_changes:
+            self.rebuild()
+            return
+        since = min(last_changes) - timedelta(seconds=OCCUPANCY_CATCHUP_MARGIN_SECONDS)
+        changes = load_changed_bookings(since)
+        with self._lock:
+            for board_id, key, booked_range in changes:
+                if booked_range:
+                    self._board(board_id).add_booking(key, *booked_range)
+                elif board_id in self._boards:
+                    self._boards[board_id].remove_booking(key)
+            is_consistent = self._held_counts() == (stamp[1], stamp[3])
+            if is_consistent:
+                self.stamp = stamp
+        if not is_consistent:
+            # Rows deleted, or written with old updated_at values
+            logger.info("Occupancy index out of step with the database - rebuilding")
+            self.rebuild()
+        else:
+            logger.debug(f"Occupancy index caught up on {len(changes)} changed bookings")
+
+    def can_answer(self):
+        """
+        Check if the index is loaded and can answer queries, first catching
+        up on any bookings changed in the database since the last check
+        """
+        if not self.is_loaded:
+            return False
+        stamp = read_booking_stamp()
+        if stamp != self.stamp:
+            self.catch_up(stamp)
+        return True
+
+
+def read_booking_stamp():
+    """
+    Fingerprint of the booking tables (one query): latest updated_at and
+    number of held rows for checkouts, then the same for reservations
+    Returns: Tuple of 4 values
+    """
+    return tuple(db.session.execute(select(
+        select(func.max(Checkout.updated_at)).scalar_subquery(),
+        select(func.count(Checkout.id)).where(Checkout.status == Checkout.STATUS_ACTIVE).scalar_subquery(),
+        select(func.max(Reservation.updated_at)).scalar_subquery(),
+        select(func.count(Reservation.id))
+        .where(Reservation.status.in_(HELD_RESERVATION_STATUSES)).scalar_subquery()
+    )).one())
+
+
+def load_changed_bookings(since):
+    """
+    Load checkouts and reservations updated at or after `since`, whatever
+    their status (one query per table)
+    Returns: List of (board_id, booking key, (start, end) or None if no longer held)
+    """
+    changes = []
+    for checkout_id, board_id, status, checkout_time, expected_return_time in db.session.execute(
+        select(Checkout.id, Checkout.board_id, Checkout.status, Checkout.checkout_time,
+               Checkout.expected_return_time)
+        .where(Checkout.updated_at >= since)
+    ):
+        is_held = status == Checkout.STATUS_ACTIVE
+        changes.append((board_id, ('checkout', checkout_id),
+                        checkout_range(checkout_time, expected_return_time) if is_held else None))
+    for reservation_id, board_id, status, unlock_time in db.session.execute(
+        select(Reservation.id, Reservation.board_id, Reservation.status, Reservation.unlock_time)
+        .where(Reservation.updated_at >= since)
+    ):
+        is_held = status in HELD_RESERVATION_STATUSES
+        changes.append((board_id, ('reservation', reservation_id),
+                        reservation_range(unlock_time) if is_held else None))
+    return changes
+
+
+def load_board_occupancy(board_ids=None):
+    """
+    Load booked time ranges from the database (one query per table)
+    Limit to board_ids if given
+    Returns: Dict of board_id -> BoardOccupancy
+    """
+    checkout_query = (
+        select(Checkout.id, Checkout.board_id, Checkout.checkout_time, Checkout.expected_return_time)
+        .where(Checkout.status == Checkout.STATUS_ACTIVE)
+    )
+    reservation_query = (
+        select(Reservation.id, Reservation.board_id, Reservation.unlock_time)
+        .where(Reservation.status.in_(HELD_RESERVATION_STATUSES))
+    )
+    if board_ids is not None:
+        checkout_query = checkout_query.where(Checkout.board_id.in_(board_ids))
+        reservation_query = reservation_query.where(Reservation.board_id.in_(board_ids))
+
+    boards = {}
+    for checkout_id, board_id, checkout_time, expected_return_time in db.session.execute(checkout_query):
+        boards.setdefault(board_id, BoardOccupancy()).bookings[('checkout', checkout_id)] = checkout_range(
+            checkout_time, expected_return_time
+        )
+    for reservation_id, board_id, unlock_time in db.session.execute(reservation_query):
+        boards.setdefault(board_id, BoardOccupancy()).bookings[('reservation', reservation_id)] = (
+            reservation_range(unlock_time)
+        )
+    for occupancy in boards.values():
+        occupancy.refresh()
+    return boards
+
+
+# Shared index for the process (rebuilt in create_app)
+occupancy_index = OccupancyIndex()
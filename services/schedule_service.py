@@ -0,0 +1,111 @@
+"""Schedule service - Date-windowed checkout schedule for the admin portal"""
+import calendar
+from datetime import datetime, timedelta
+import pytz
+from sqlalchemy import select
+from database import db
+from models.board import Board
+from models.checkout import Checkout
+from models.user import User
+from services.timezone_service import TimezoneService
+from utils.constants import SCHEDULE_VIEW_WEEK, SCHEDULE_VIEW_MONTH, SCHEDULE_MAX_DAYS
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ScheduleService:
+    """
+    Service for the admin checkout schedule. Only checkouts that overlap a
+    date window (in the location's timezone) are loaded, with board and user
+    names joined in, so a page view costs the same after a long season.
+    """
+
+    def __init__(self, timezone_service=None):
+        self.timezone_service = timezone_service or TimezoneService()
+
+    def get_window(self, start_date, view=SCHEDULE_VIEW_WEEK):
+        """
+        Get the dates covered by a schedule view
+        - week: 7 days starting at start_date
+        - month: the calendar month containing start_date
+        Returns: (first_date, day_count)
+        """
+        if view == SCHEDULE_VIEW_MONTH:
+            first_date = start_date.replace(day=1)
+            return first_date, calendar.monthrange(first_date.year, first_date.month)[1]
+        return start_date, 7
+
+    def _utc_bounds(self, location_id, first_date, day_count):
+        """Get the window's [start, end) as naive UTC datetimes"""
+        tz = self.timezone_service.get_location_timezone(location_id)
+        start_local = tz.localize(datetime(first_date.year, first_date.month, first_date.day))
+        end_date = first_date + timedelta(days=day_count)
+        end_local = tz.localize(datetime(end_date.year, end_date.month, end_date.day))
+        return (
+            start_local.astimezone(pytz.UTC).replace(tzinfo=None),
+            end_local.astimezone(pytz.UTC).replace(tzinfo=None)
+        )
+
+    def get_checkouts(self, location_id, first_date, day_count, board_id=None):
+        """
+        Get checkouts at a location that overlap the window (one query)
+        Returns: List of rows with id, board_id, board_name, user_id, user_name,
+        checkout_time, expected_return_time, actual_return_time and status
+        """
+        day_count = min(day_count, SCHEDULE_MAX_DAYS)
+        window_start, window_end = self._utc_bounds(location_id, first_date, day_count)
+        query = (
+            select(
+                Checkout.id, Checkout.board_id, Board.name.label('board_name'),
+                Checkout.user_id, User.full_name.label('user_name'),
+                Checkout.checkout_time, Checkout.expected_return_time,
+                Checkout.actual_return_time, Checkout.status
+            )
+            .join(Board, Board.id == Checkout.board_id)
+            .outerjoin(User, User.id == Checkout.user_id)
+            .where(
+                Board.location_id == location_id,
+                Checkout.checkout_time < window_end,
+                Checkout.expected_return_time > window_start
+            )
+            .order_by(Checkout.checkout_time, Checkout.id)
+        )
+        if board_id:
+            query = query.where(Checkout.board_id == board_id)
+        return db.session.execute(query).all()
+
+    def get_day_buckets(self, location_id, first_date, day_count, board_id=None):
+        """
+        Group the window's checkouts by local day; a checkout is listed on
+        every day it covers
+        Returns: List of dicts with date, count and checkouts (JSON ready)
+        """
+        day_count = min(day_count, SCHEDULE_MAX_DAYS)
+        tz = self.timezone_service.get_location_timezone(location_id)
+        days = [first_date + timedelta(days=i) for i in range(day_count)]
+        buckets = {day: [] for day in days}
+
+        for row in self.get_checkouts(location_id, first_date, day_count, board_id):
+            start_local = pytz.UTC.localize(row.checkout_time).astimezone(tz)
+            end_local = pytz.UTC.localize(row.expected_return_time).astimezone(tz)
+            # The return instant itself doesn't occupy the day it lands on at midnight
+            last_day = (end_local - timedelta(microseconds=1)).date()
+            entry = {
+                'id': row.id,
+                'board_id': row.board_id,
+                'board_name': row.board_name,
+                'user_name': row.user_name,
+                'checkout_time': start_local.isoformat(),
+                'expected_return_time': end_local.isoformat(),
+                'status': row.status
+            }
+            day = max(start_local.date(), first_date)
+            while day <= last_day and day in buckets:
+                buckets[day].append(entry)
+                day += timedelta(days=1)
+
+        return [
+            {'date': day.isoformat(), 'count': len(buckets[day]), 'checkouts': buckets[day]}
+            for day in days
+        ]
@@ -0,0 +1,167 @@
+"""Timeline service - A user's checkouts and reservations as one paginated list"""
+import base64
+from datetime import datetime
+from sqlalchemy import select, union_all, literal, case, and_, or_
+from sqlalchemy.orm import joinedload
+from database import db
+from models.board import Board
+from models.checkout import Checkout
+from models.reservation import Reservation
+from utils.constants import (
+    TIMELINE_STATUS_SCHEDULED, TIMELINE_STATUS_IN_USE, TIMELINE_STATUS_RESERVATION,
+    TIMELINE_PAGE_SIZE
+)
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Sort rank of each timeline status: scheduled first, then in use, then reservations
+STATUS_RANKS = {
+    TIMELINE_STATUS_SCHEDULED: 0,
+    TIMELINE_STATUS_IN_USE: 1,
+    TIMELINE_STATUS_RESERVATION: 2,
+}
+
+
+def encode_cursor(ranked_at, rank, sort_time, item_id):
+    """
+    Encode the sort key of the last item on a page as an opaque cursor
+    ranked_at is the time the ranks were computed at, so later pages rank
+    items the same way even after a scheduled checkout starts
+    """
+    raw = f"{ranked_at.isoformat()}|{rank}|{sort_time.isoformat()}|{item_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor from encode_cursor
+    Returns: (ranked_at, rank, sort_time, item_id) or None if the cursor is invalid
+    """
+    try:
+        ranked_at, rank, sort_time, item_id = (
+            base64.urlsafe_b64decode(cursor.encode()).decode().split('|', 3)
+        )
+        return datetime.fromisoformat(ranked_at), int(rank), datetime.fromisoformat(sort_time), item_id
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+class TimelineService:
+    """
+    Service for a user's "my items" timeline: active checkouts (scheduled or
+    in use) and non-cancelled reservations. Filtering, status classification
+    and ordering happen in one UNION query, paginated by keyset, so a page
+    costs the same number of queries however many items the user has.
+    """
+
+    def __init__(self):
+        pass
+
+    def _timeline_query(self, user_id, now):
+        """UNION of the user's timeline rows: (kind, id, rank, sort_time)"""
+        checkouts = select(
+            literal('checkout').label('kind'),
+            Checkout.id.label('id'),
+            case(
+                (Checkout.checkout_time > now, STATUS_RANKS[TIMELINE_STATUS_SCHEDULED]),
+                else_=STATUS_RANKS[TIMELINE_STATUS_IN_USE]
+            ).label('rank'),
+            Checkout.checkout_time.label('sort_time')
+        ).where(
+            Checkout.user_id == user_id,
+            Checkout.status == Checkout.STATUS_ACTIVE
+        )
+        reservations = select(
+            literal('reservation').label('kind'),
+            Reservation.id.label('id'),
+            literal(STATUS_RANKS[TIMELINE_STATUS_RESERVATION]).label('rank'),
+            Reservation.unlock_time.label('sort_time')
+        ).where(
+            Reservation.user_id == user_id,
+            Reservation.status != Reservation.STATUS_CANCELLED
+        )
+        return union_all(checkouts, reservations).subquery('timeline')
+
+    def get_page(self, user_id, cursor=None, limit=TIMELINE_PAGE_SIZE, now=None):
+        """
+        Get one page of the user's timeline, starting after cursor
+        Items are ranked as of the first page's time (kept in the cursor), so
+        paging never skips or repeats an item that changes status meanwhile
+        Items have board and location loaded, plus is_checkout and display_status
+        (as of now)
+        Returns: (items, next_cursor) - next_cursor is None on the last page
+        """
+        if now is None:
+            now = datetime.utcnow()
+        after = decode_cursor(cursor) if cursor else None
+        ranked_at = after[0] if after else now
+        timeline = self._timeline_query(user_id, ranked_at)
+        query = select(timeline.c.kind, timeline.c.id, timeline.c.rank, timeline.c.sort_time)
+
+        if after:
+            _, rank, sort_time, item_id = after
+            query = query.where(or_(
+                timeline.c.rank > rank,
+                and_(timeline.c.rank == rank, or_(
+                    timeline.c.sort_time > sort_time,
+                    and_(timeline.c.sort_time == sort_time, timeline.c.id > item_id)
+                ))
+            ))
+
+        # Fetch one extra row to know whether there is a next page
+        rows = db.session.execute(
+            query.order_by(timeline.c.rank, timeline.c.sort_time, timeline.c.id).limit(limit + 1)
+        ).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        items = self._load_items(rows, now)
+        next_cursor = None
+        if has_more and rows:
+            last = rows[-1]
+            next_cursor = encode_cursor(ranked_at, last.rank, last.sort_time, last.id)
+        return items, next_cursor
+
+    def _load_items(self, rows, now):
+        """
+        Load the checkouts and reservations for timeline rows (one query per kind)
+        Boards are joined in; their locations are left to the caller, since
+        every row at a location shares the same one
+        """
+        checkout_ids = [row.id for row in rows if row.kind == 'checkout']
+        reservation_ids = [row.id for row in rows if row.kind == 'reservation']
+
+        checkouts = {}
+        if checkout_ids:
+            checkouts = {
+                checkout.id: checkout
+                for checkout in Checkout.query.filter(Checkout.id.in_(checkout_ids))
+                .options(joinedload(Checkout.board))
+            }
+        reservations = {}
+        if reservation_ids:
+            reservations = {
+                reservation.id: reservation
+                for reservation in Reservation.query.filter(Reservation.id.in_(reservation_ids))
+                .options(joinedload(Reservation.board))
+            }
+
+        items = []
+        for row in rows:
+            if row.kind == 'checkout':
+                item = checkouts.get(row.id)
+                if item is None:
+                    continue
+                item.is_checkout = True
+                item.display_status = (
+                    TIMELINE_STATUS_SCHEDULED if item.checkout_time > now else TIMELINE_STATUS_IN_USE
+                )
+            else:
+                item = reservations.get(row.id)
+                if item is None:
+                    continue
+                item.is_checkout = False
+                item.display_status = TIMELINE_STATUS_RESERVATION
+            items.append(item)
+        return items
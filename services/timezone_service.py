@@ -1,7 +1,36 @@
 """Timezone service - Handles timezone-aware calculations"""
 from datetime import datetime, timedelta
+from functools import lru_cache
 import pytz
-from models.location import Location
+from services.location_registry import location_registry
+from utils.constants import CHECKOUT_RETURN_WINDOW_DAYS
+
+# Number of formatted datetime strings kept by the LRU cache
+FORMAT_CACHE_SIZE = 4096
+
+
+def _localize(dt, tz):
+    """Convert a datetime (naive means UTC) to the given timezone"""
+    if dt.tzinfo is None:
+        dt = pytz.UTC.localize(dt)
+    return dt.astimezone(tz)
+
+
+@lru_cache(maxsize=FORMAT_CACHE_SIZE)
+def _format_12hour(dt, tz, location_name):
+    """Format a datetime in 12-hour format (cached - the same times repeat across rows and pages)"""
+    local_dt = _localize(dt, tz)
+    
+    # Format: "Jan 16, 2026 at 5:00 PM EST (Miami Location)"
+    date_str = local_dt.strftime('%b %d, %Y')
+    time_str = local_dt.strftime('%I:%M %p').lstrip('0')  # Remove leading zero from hour
+    tz_str = local_dt.strftime('%Z')
+    
+    result = f"{date_str} at {time_str} {tz_str}"
+    if location_name:
+        result += f" ({location_name})"
+    
+    return result
 
 
 class TimezoneService:
@@ -11,11 +40,8 @@ class TimezoneService:
         pass
     
     def get_location_timezone(self, location_id):
-        """Get timezone for a location"""
-        location = Location.find_by_id(location_id)
-        if location:
-            return pytz.timezone(location.timezone)
-        return pytz.UTC
+        """Get timezone for a location (from the in-memory location_id -> tzinfo map)"""
+        return location_registry.get_timezone(location_id)
     
     def now_in_location(self, location_id):
         """Get current time in location's timezone"""
@@ -24,10 +50,7 @@ class TimezoneService:
     
     def to_location_timezone(self, dt, location_id):
         """Convert datetime to location's timezone"""
-        if dt.tzinfo is None:
-            dt = pytz.UTC.localize(dt)
-        tz = self.get_location_timezone(location_id)
-        return dt.astimezone(tz)
+        return _localize(dt, self.get_location_timezone(location_id))
     
     def calculate_return_window(self, checkout_time, location_id):
         """
@@ -37,13 +60,13 @@ class TimezoneService:
         - Weekend (until Monday) if Fri-Sun
         """
         tz = self.get_location_timezone(location_id)
-        checkout_local = self.to_location_timezone(checkout_time, location_id)
+        checkout_local = _localize(checkout_time, tz)
         
         weekday = checkout_local.weekday()  # 0=Monday, 6=Sunday
         
         if weekday < 4:  # Monday (0) through Thursday (3)
             # 1 day return window
-            expected_return = checkout_local + timedelta(days=1)
+            expected_return = checkout_local + timedelta(days=CHECKOUT_RETURN_WINDOW_DAYS)
             is_weekend = False
         else:  # Friday (4), Saturday (5), or Sunday (6)
             # Weekend return - return by Monday
@@ -66,7 +89,6 @@ class TimezoneService:
     
     def is_weekend_in_location(self, dt, location_id):
         """Check if datetime is weekend in location's timezone"""
-        tz = self.get_location_timezone(location_id)
         local_dt = self.to_location_timezone(dt, location_id)
         weekday = local_dt.weekday()
         return weekday >= 4  # Friday, Saturday, or Sunday
@@ -75,7 +97,6 @@ class TimezoneService:
         """Format datetime in location's timezone"""
         if dt is None:
             return None
-        tz = self.get_location_timezone(location_id)
         local_dt = self.to_location_timezone(dt, location_id)
         return local_dt.strftime(format_str)
     
@@ -83,19 +104,19 @@ class TimezoneService:
         """Format datetime in 12-hour format with AM/PM, timezone, and location"""
         if dt is None:
             return None
+        return _format_12hour(dt, self.get_location_timezone(location_id), location_name)
+    
+    def format_many(self, datetimes, location_id, location_name=None):
+        """
+        Format several datetimes for one location in 12-hour format
+        The timezone is resolved once for the whole batch
+        Returns: List of formatted strings (None for None datetimes)
+        """
         tz = self.get_location_timezone(location_id)
-        local_dt = self.to_location_timezone(dt, location_id)
-        
-        # Format: "Jan 16, 2026 at 5:00 PM EST (Miami Location)"
-        date_str = local_dt.strftime('%b %d, %Y')
-        time_str = local_dt.strftime('%I:%M %p').lstrip('0')  # Remove leading zero from hour
-        tz_str = local_dt.strftime('%Z')
-        
-        result = f"{date_str} at {time_str} {tz_str}"
-        if location_name:
-            result += f" ({location_name})"
-        
-        return result
+        return [
+            _format_12hour(dt, tz, location_name) if dt is not None else None
+            for dt in datetimes
+        ]
     
     def is_unlock_time_passed(self, unlock_time, location_id):
         """Check if unlock time has passed in location's timezone"""
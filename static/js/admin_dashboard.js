@@ -32,6 +32,10 @@ class AdminDashboard {
             this.socketClient.socket.on('checkout_returned', (data) => {
                 this.updateStats();
             });
+            
+            this.socketClient.socket.on('bulk_admin_update', (data) => {
+                this.updateStats();
+            });
         }
     }
     
@@ -20,6 +20,21 @@ class CartHandler {
         });
     }
     
+    getPickerSelection() {
+        // Send the dashboard date/time picker selection (may differ from the last page load)
+        const dateInput = document.getElementById('checkoutDate');
+        const hourSelect = document.getElementById('checkoutHour');
+        const durationSelect = document.getElementById('checkoutDuration');
+        if (!dateInput || !dateInput.value || !hourSelect) {
+            return {};
+        }
+        return {
+            checkout_date: dateInput.value,
+            checkout_hour: hourSelect.value,
+            duration_hours: durationSelect ? durationSelect.value : '1'
+        };
+    }
+    
     async handleAddToCart(boardId, btn) {
         try {
             // Disable button to prevent double-clicks
@@ -32,7 +47,8 @@ class CartHandler {
                     method: 'POST',
                     headers: {
                         'Content-Type': 'application/json'
-                    }
+                    },
+                    body: JSON.stringify(this.getPickerSelection())
                 });
                 
                 const data = await response.json();
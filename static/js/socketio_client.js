@@ -39,6 +39,11 @@ class SocketIOClient {
             this.handleBoardStatusChange(data);
         });
         
+        // Bulk admin changes arrive as one event per location
+        this.socket.on('bulk_admin_update', (data) => {
+            (data.boards || []).forEach((board) => this.handleBoardStatusChange(board));
+        });
+        
         // Listen for notifications
         this.socket.on('notification', (data) => {
             this.handleNotification(data);
@@ -33,6 +33,83 @@ DAMAGE_SEVERITY_MINOR = 'minor'
 DAMAGE_SEVERITY_MODERATE = 'moderate'
 DAMAGE_SEVERITY_SEVERE = 'severe'
 
+# Availability Reasons
+AVAILABILITY_REASON_RESERVED = 'Reserved'
+AVAILABILITY_REASON_IN_CART = 'Booked twice in this cart'
+
+# Days a Mon-Thu checkout keeps its board (Fri-Sun checkouts run to Monday)
+CHECKOUT_RETURN_WINDOW_DAYS = 1
+
+# Hours a pending/available reservation holds its board from the unlock time:
+# the reserver checks the board out then, which books it for at least the
+# shortest return window
+RESERVATION_HOLD_HOURS = CHECKOUT_RETURN_WINDOW_DAYS * 24
+
+# Look-back when the occupancy index catches up on bookings written by other
+# processes (covers transactions that commit after later ones, and clock skew)
+OCCUPANCY_CATCHUP_MARGIN_SECONDS = 300
+
+# Seconds before the in-memory location registry reloads from the database
+LOCATION_CACHE_TTL_SECONDS = 300
+
+# "My items" timeline (dashboard and my reservations)
+TIMELINE_STATUS_SCHEDULED = 'scheduled'
+TIMELINE_STATUS_IN_USE = 'in_use'
+TIMELINE_STATUS_RESERVATION = 'reservation'
+TIMELINE_PAGE_SIZE = 20
+
+# Admin checkout schedule windows
+SCHEDULE_VIEW_WEEK = 'week'
+SCHEDULE_VIEW_MONTH = 'month'
+SCHEDULE_MAX_DAYS = 62
+
+# Seconds the admin dashboard stats are cached per location
+ADMIN_STATS_CACHE_SECONDS = 5
+
+# Server-side cart store ('database' or 'memory') and cart lifetime
+CART_STORE_DATABASE = 'database'
+CART_STORE_MEMORY = 'memory'
+CART_TTL_SECONDS = 7 * 24 * 60 * 60
+
+# Times an operation is retried after a version conflict (optimistic concurrency)
+CONFLICT_RETRY_ATTEMPTS = 3
+
+# Idempotency-Key header for write APIs: stored responses are replayed for retries
+IDEMPOTENCY_KEY_HEADER = 'Idempotency-Key'
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+IDEMPOTENCY_TTL_SECONDS = 24 * 60 * 60
+# Seconds before an unfinished claim counts as abandoned (its worker died) and a
+# retry may take the key over - longer than any request is allowed to run
+IDEMPOTENCY_LOCK_TIMEOUT_SECONDS = 2 * 60
+
+# Background jobs (jobs table)
+JOB_STATUS_QUEUED = 'queued'
+JOB_STATUS_RUNNING = 'running'
+JOB_STATUS_SUCCEEDED = 'succeeded'
+JOB_STATUS_FAILED = 'failed'
+JOB_MAX_ATTEMPTS = 5
+JOB_RETRY_BASE_SECONDS = 30  # doubled after each failed attempt
+JOB_RETRY_MAX_SECONDS = 60 * 60
+JOB_LOCK_TIMEOUT_SECONDS = 10 * 60  # running jobs older than this are requeued
+JOB_RETENTION_DAYS = 7  # finished jobs are purged after this
+JOB_POLL_SECONDS = 2
+JOB_HOUSEKEEPING_SECONDS = 60  # how often a worker requeues stale jobs and purges old ones
+
+# Bulk admin operations
+BULK_ADMIN_MAX_IDS = 500  # ids accepted per bulk request
+# Statuses an admin may set directly (checked_out only comes from a checkout)
+BULK_BOARD_STATUSES = [BOARD_STATUS_AVAILABLE, BOARD_STATUS_DAMAGED, BOARD_STATUS_IN_REPAIR, BOARD_STATUS_REPLACED]
+
+# Bulk import (locations and boards from CSV / JSONL)
+IMPORT_CHUNK_SIZE = 5000  # rows per transaction
+IMPORT_MAX_ERRORS_REPORTED = 20  # row errors kept in the import summary
+BOARD_CONDITIONS = [BOARD_CONDITION_EXCELLENT, BOARD_CONDITION_GOOD, BOARD_CONDITION_FAIR]
+
+# Allowed values for the SQLite profile settings (PRAGMA values can't be bound parameters)
+SQLITE_JOURNAL_MODES = ['DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF']
+SQLITE_SYNCHRONOUS_MODES = ['OFF', 'NORMAL', 'FULL', 'EXTRA']
+SQLITE_TEMP_STORES = ['DEFAULT', 'FILE', 'MEMORY']
+
 # User Roles
 USER_ROLE_USER = 'user'
 USER_ROLE_ADMIN = 'admin'
@@ -80,6 +157,25 @@ ERROR_RESERVATION_EXISTS = 'Reservation already exists for this checkout'
 ERROR_RESERVATION_NOT_AVAILABLE = 'Reservation is not available'
 ERROR_RESERVATION_CANNOT_CANCEL = 'Reservation cannot be cancelled'
 ERROR_RETURN_TIME_PASSED = 'Return time has already passed'
+ERROR_CONCURRENT_UPDATE = 'Someone else changed this at the same time. Please try again.'
+ERROR_IDEMPOTENCY_KEY_INVALID = 'Idempotency-Key must be 1 to 255 characters'
+ERROR_IDEMPOTENCY_KEY_REUSED = 'Idempotency-Key was already used for a different request'
+ERROR_IDEMPOTENCY_KEY_IN_PROGRESS = 'A request with this Idempotency-Key is still being processed'
+ERROR_JOB_UNKNOWN = 'No handler registered for job'
+ERROR_JOB_NOTIFICATION_FAILED = 'Notification email could not be sent'
+ERROR_BULK_NO_IDS = 'No ids given'
+ERROR_BULK_TOO_MANY_IDS = f'At most {BULK_ADMIN_MAX_IDS} ids per request'
+ERROR_INVALID_BOARD_STATUS = 'Invalid board status'
+ERROR_INVALID_DAMAGE_STATUS = 'Invalid damage report status'
+ERROR_BOARD_IS_CHECKED_OUT = 'Board is checked out'
+ERROR_DAMAGE_REPORT_NOT_FOUND = 'Damage report not found'
+ERROR_IMPORT_UNKNOWN_FORMAT = 'Import files must be .csv or .jsonl'
+ERROR_IMPORT_INVALID_RECORD = 'Not a JSON object'
+ERROR_IMPORT_MISSING_NAME = 'Missing name'
+ERROR_IMPORT_UNKNOWN_LOCATION = 'Unknown location'
+ERROR_INVALID_BOARD_CONDITION = 'Invalid board condition'
+ERROR_INVALID_SQLITE_SETTING = 'Invalid SQLite setting'
+ERROR_SQLITE_UPGRADE_NEEDS_DEFAULT = 'New NOT NULL column has no server default'
 ERROR_USER_NOT_FOUND = 'User not found in database'
 ERROR_INVALID_CREDENTIALS = 'Invalid credentials'
 ERROR_SUPABASE_NOT_CONFIGURED = 'Supabase not configured'
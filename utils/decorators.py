@@ -1,8 +1,13 @@
 """Decorators for authentication and authorization"""
 from functools import wraps
-from flask import session, redirect, url_for, request, jsonify
+from flask import session, redirect, url_for, request, jsonify, make_response, Response
 from flask_login import current_user
 from models.user import User
+from models.batch_loader import enable_batch_loading
+from utils.constants import (
+    IDEMPOTENCY_KEY_HEADER, IDEMPOTENCY_KEY_MAX_LENGTH, ERROR_IDEMPOTENCY_KEY_INVALID,
+    ERROR_IDEMPOTENCY_KEY_REUSED, ERROR_IDEMPOTENCY_KEY_IN_PROGRESS
+)
 
 
 def login_required(f):
@@ -51,3 +56,56 @@ def require_location_access(f):
         
         return f(*args, **kwargs)
     return decorated_function
+
+
+def batch_loading(f):
+    """
+    Decorator to batch and cache find_by_id lookups for the rest of the request
+    Use models.batch_loader.prime() to queue IDs that are about to be looked up
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        enable_batch_loading()
+        return f(*args, **kwargs)
+    return decorated_function
+
+
+def idempotent(f):
+    """
+    Decorator to make a write endpoint safe to retry with an Idempotency-Key header
+    The first request with a key runs normally and its response is stored;
+    retries with the same key get the stored response without running again.
+    Requests without the header are not affected. Use after login_required.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_KEY_HEADER)
+        if key is None:
+            return f(*args, **kwargs)
+        if not key or len(key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+            return jsonify({'success': False, 'error': ERROR_IDEMPOTENCY_KEY_INVALID}), 400
+        
+        from services.idempotency_store import idempotency_store
+        record, claimed = idempotency_store.claim(current_user.id, key, request.path)
+        if not claimed:
+            if record.request_path != request.path:
+                return jsonify({'success': False, 'error': ERROR_IDEMPOTENCY_KEY_REUSED}), 422
+            if not record.is_completed():
+                return jsonify({'success': False, 'error': ERROR_IDEMPOTENCY_KEY_IN_PROGRESS}), 409
+            response = Response(record.response_body, status=record.status_code, mimetype=record.mimetype)
+            response.headers['Idempotent-Replayed'] = 'true'
+            return response
+        
+        try:
+            response = make_response(f(*args, **kwargs))
+        except Exception:
+            idempotency_store.release(record)
+            raise
+        if response.status_code >= 500:
+            # Let a retry run the request again
+            idempotency_store.release(record)
+        else:
+            idempotency_store.complete(record, response.status_code,
+                                       response.get_data(as_text=True), response.mimetype)
+        return response
+    return decorated_function